@@ -0,0 +1,248 @@
+"""
+Admission Control
+Concurrency limits with bounded wait queues per workload class, so a burst
+of uploads or generations queues up to a point and is then turned away
+quickly (429/503 with Retry-After) instead of exhausting memory or threads
+"""
+
+import contextlib
+import math
+import threading
+import time
+import weakref
+from typing import Dict, Iterable, Iterator, Optional
+from decouple import config
+from fastapi import HTTPException
+
+
+# Seconds a request may wait in a queue before it gets a 503
+ADMISSION_QUEUE_TIMEOUT_SECONDS = config('ADMISSION_QUEUE_TIMEOUT_SECONDS', default=30.0, cast=float)
+# Seconds accepted work (background jobs, started streams) waits before failing
+ADMISSION_ADMITTED_TIMEOUT_SECONDS = config('ADMISSION_ADMITTED_TIMEOUT_SECONDS', default=600.0, cast=float)
+# Retry-After before any job of a class has finished to estimate from
+ADMISSION_RETRY_AFTER_SECONDS = config('ADMISSION_RETRY_AFTER_SECONDS', default=5, cast=int)
+
+# Class -> (default concurrency limit, default queue length)
+WORKLOAD_DEFAULTS = {
+    # moviepy/ffmpeg decoding: the memory-hungry step
+    "extraction": (2, 8),
+    "transcription": (4, 8),
+    # Summaries, Q&A, course structuring, quizzes, translation, TTS
+    "llm": (8, 16),
+    # Streamed ZIP builds
+    "export": (4, 8)
+}
+
+
+class Saturated(HTTPException):
+    """
+    A workload class has no room: 429 when its queue is full, 503 when
+    the wait for a slot timed out
+
+    An HTTPException, so endpoints that re-raise those pass it through.
+    """
+
+    def __init__(self, workload: str, status_code: int, retry_after: int):
+        detail = (
+            f"Too many {workload} jobs queued, retry later" if status_code == 429
+            else f"Timed out waiting for a {workload} slot, retry later"
+        )
+        super().__init__(status_code=status_code, detail=detail, headers={"Retry-After": str(retry_after)})
+        self.workload = workload
+        self.retry_after = retry_after
+
+
+class Ticket:
+    """
+    A place in a workload's queue, reserved by check() for work that starts
+    later
+
+    Pass it to slot() to wait in that place, or release() it if the work
+    doesn't start. A ticket dropped unused is released when collected.
+    """
+
+    def __init__(self, workload: "Workload"):
+        self._release = weakref.finalize(self, workload._unreserve)
+
+    def release(self):
+        """Gives the place back; no-op once used or released"""
+        self._release()
+
+    def _consume(self) -> bool:
+        """Hands the reservation to slot(); False if it was already released"""
+        return self._release.detach() is not None
+
+
+class Workload:
+    """
+    One workload class: at most `limit` jobs run, at most `max_queue` wait
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limit: int,
+        max_queue: int,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT_SECONDS,
+        admitted_timeout: float = ADMISSION_ADMITTED_TIMEOUT_SECONDS
+    ):
+        """
+        Args:
+            name: Class name, used in errors and stats
+            limit: Jobs allowed to run at once
+            max_queue: Jobs allowed to wait for a slot
+            queue_timeout: Seconds a request waits before giving up
+            admitted_timeout: Seconds accepted work waits before giving up
+        """
+        self.name = name
+        self.limit = max(1, limit)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.admitted_timeout = admitted_timeout
+
+        self._condition = threading.Condition()
+        self._running = 0
+        self._waiting = 0
+        # Moving average of job duration, for Retry-After estimates
+        self._avg_seconds: Optional[float] = None
+        self.stats_counters = {"admitted": 0, "completed": 0, "rejected": 0, "timed_out": 0}
+
+    def _full(self) -> bool:
+        """No room to run or queue (lock held)"""
+        return self._running + self._waiting >= self.limit + self.max_queue
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely free, from the queue and average job time"""
+        with self._condition:
+            if self._avg_seconds is None:
+                return ADMISSION_RETRY_AFTER_SECONDS
+            waves = (self._waiting + 1) / self.limit
+            return max(1, min(300, math.ceil(self._avg_seconds * waves)))
+
+    def check(self) -> Ticket:
+        """
+        Reserves a place in the queue, or raises Saturated (429) if there is none
+
+        For work that is accepted now and started later (background jobs,
+        streamed responses): it then waits for its slot with the ticket.
+
+        Returns:
+            The reservation, for slot() or release()
+        """
+        with self._condition:
+            full = self._full()
+            if full:
+                self.stats_counters["rejected"] += 1
+            else:
+                self._waiting += 1
+        if full:
+            raise Saturated(self.name, 429, self.retry_after())
+        return Ticket(self)
+
+    def _unreserve(self):
+        with self._condition:
+            self._waiting -= 1
+
+    @contextlib.contextmanager
+    def slot(self, admitted: bool = False, ticket: Optional[Ticket] = None) -> Iterator[None]:
+        """
+        Runs the with block in one of the class's slots
+
+        A request without a ticket is turned away with Saturated (429) when
+        the queue is full and Saturated (503) after queue_timeout. Accepted
+        work waits up to admitted_timeout, then gets Saturated (503).
+
+        Args:
+            admitted: Accepted work without its own reservation, such as the
+                later steps of a background job; it may exceed the queue length
+            ticket: Reservation from check(), consumed here
+        """
+
+        with self._condition:
+            reserved = ticket is not None and ticket._consume()
+            accepted = admitted or reserved
+            if not accepted and self._full():
+                self.stats_counters["rejected"] += 1
+                rejected = True
+            else:
+                rejected = False
+                if not reserved:
+                    self._waiting += 1
+                deadline = time.monotonic() + (self.admitted_timeout if accepted else self.queue_timeout)
+                while self._running >= self.limit:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                self._waiting -= 1
+                timed_out = self._running >= self.limit
+                if timed_out:
+                    self.stats_counters["timed_out"] += 1
+                else:
+                    self._running += 1
+                    self.stats_counters["admitted"] += 1
+
+        if rejected:
+            raise Saturated(self.name, 429, self.retry_after())
+        if timed_out:
+            raise Saturated(self.name, 503, self.retry_after())
+
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            with self._condition:
+                self._running -= 1
+                self.stats_counters["completed"] += 1
+                self._avg_seconds = elapsed if self._avg_seconds is None else 0.8 * self._avg_seconds + 0.2 * elapsed
+                self._condition.notify()
+
+    def stats(self) -> Dict:
+        with self._condition:
+            return {
+                "limit": self.limit,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "waiting": self._waiting,
+                "avg_seconds": round(self._avg_seconds, 3) if self._avg_seconds is not None else None,
+                **self.stats_counters
+            }
+
+
+class AdmissionController:
+    """
+    The workload classes of this worker process, configured from
+    ADMISSION_<CLASS>_LIMIT and ADMISSION_<CLASS>_QUEUE
+    """
+
+    def __init__(self):
+        self.workloads: Dict[str, Workload] = {}
+        for name, (limit, max_queue) in WORKLOAD_DEFAULTS.items():
+            prefix = f"ADMISSION_{name.upper()}"
+            self.workloads[name] = Workload(
+                name,
+                limit=config(f"{prefix}_LIMIT", default=limit, cast=int),
+                max_queue=config(f"{prefix}_QUEUE", default=max_queue, cast=int)
+            )
+
+    def check(self, name: str) -> Ticket:
+        """Reserves a place in the class's queue, or raises Saturated (429) (see Workload.check)"""
+        return self.workloads[name].check()
+
+    def slot(self, name: str, admitted: bool = False, ticket: Optional[Ticket] = None):
+        """Context manager running its block in a slot of the class (see Workload.slot)"""
+        return self.workloads[name].slot(admitted=admitted, ticket=ticket)
+
+    def stream(self, name: str, chunks: Iterable, ticket: Ticket) -> Iterator:
+        """
+        Iterates a (sync) response body inside a slot of the class
+
+        Takes the ticket from check(): once the response has started, the
+        stream can only wait for its turn.
+        """
+        with self.slot(name, ticket=ticket):
+            yield from chunks
+
+    def stats(self) -> Dict[str, Dict]:
+        return {name: workload.stats() for name, workload in self.workloads.items()}
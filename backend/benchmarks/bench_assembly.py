@@ -0,0 +1,100 @@
+"""
+Course assembly throughput benchmark
+
+Assembles a batch of synthetic courses (structure, deck, quiz) into a
+scratch directory, as a bulk course build would, and reports courses per
+second and bytes written for different numbers of writer threads.
+
+Usage (from backend/):
+    python benchmarks/bench_assembly.py [--courses 50] [--chapters 20] [--workers 1,2,4,8]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_slide_render import make_course
+from course_assembler import CourseAssembler
+from slide_generator import SlideGenerator
+
+
+def make_quiz(num_questions: int) -> dict:
+    """Builds quiz data shaped like QuizGenerator output"""
+    return {
+        "quiz": {
+            "title": "Benchmark Quiz",
+            "questions": [
+                {
+                    "id": n,
+                    "type": "multiple_choice",
+                    "question": f"Question {n} about a key point of the course?",
+                    "options": [f"Option {n}.{i}" for i in range(4)],
+                    "correct_answer": f"Option {n}.0",
+                    "explanation": "Explanation of the correct answer. " * 3
+                }
+                for n in range(1, num_questions + 1)
+            ]
+        }
+    }
+
+
+def directory_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for filename in files:
+            total += os.path.getsize(os.path.join(root, filename))
+    return total
+
+
+def run(workers: int, num_courses: int, course: dict, slides_html: str, slide_chapters: dict, quiz: dict) -> tuple:
+    """Returns (courses per second, MiB written)"""
+
+    os.environ["ASSEMBLY_WRITE_WORKERS"] = str(workers)
+    output_dir = tempfile.mkdtemp(prefix="bench-assembly-")
+    try:
+        assembler = CourseAssembler(output_dir=output_dir)
+        start = time.perf_counter()
+        for i in range(num_courses):
+            assembler.assemble_course(
+                course_structure=course,
+                slides_html=slides_html,
+                quiz_data=quiz,
+                course_id=f"course_{i}",
+                metadata={"language": "en", "theme": "light"},
+                slide_chapters=slide_chapters
+            )
+        elapsed = time.perf_counter() - start
+        return num_courses / elapsed, directory_size(output_dir) / (1024 * 1024)
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--courses", type=int, default=50, help="Courses assembled per run")
+    parser.add_argument("--chapters", type=int, default=20, help="Chapters per course")
+    parser.add_argument("--workers", default="1,2,4,8", help="Comma-separated writer thread counts")
+    parser.add_argument("--chunked", action="store_true", help="Write decks as per-chapter fragments")
+    args = parser.parse_args()
+
+    course = make_course(args.chapters)
+    slides_html, slide_chapters = SlideGenerator().render_deck(
+        course, language="en", theme="light", chunked=args.chunked
+    )
+    quiz = make_quiz(20)
+
+    print(f"{args.courses} courses x {args.chapters} chapters ({'chunked' if args.chunked else 'single-page'} decks)")
+    print(f"{'workers':>7} | {'courses/s':>9} | {'MiB written':>11}")
+    print("-" * 34)
+    for workers in [int(w) for w in args.workers.split(",") if w.strip()]:
+        rate, size = run(workers, args.courses, course, slides_html, slide_chapters, quiz)
+        print(f"{workers:>7} | {rate:>9.1f} | {size:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Large response benchmark
+
+Builds the payloads of the heaviest JSON endpoints for synthetic inputs
+(a /video/{id} response for a long transcript, /api/course/generate-slides
+with a whole deck inline, /api/course/generate-quiz) and reports, for each:
+serialization time with the standard library encoder and with the API's
+response class (orjson when installed), and the body size raw, gzipped
+and brotli-encoded at the levels CompressionMiddleware uses.
+
+Usage (from backend/):
+    python benchmarks/bench_responses.py [--minutes 90] [--chapters 40] [--questions 100] [--repeat 20]
+"""
+
+import argparse
+import gzip
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from bench_assembly import make_quiz
+from bench_slide_render import make_course
+from compression import FastJSONResponse, brotli, orjson, COMPRESS_GZIP_LEVEL, COMPRESS_BROTLI_QUALITY
+from slide_generator import SlideGenerator
+
+
+# Lectures with English and Japanese speakers
+SENTENCES = [
+    "So the next thing we want to look at is how the model handles longer inputs. ",
+    "この部分はとても重要なので、もう一度説明します。 ",
+    "If you remember from the previous section, we measured latency at the tail. ",
+    "Let's pause here and think about what that means for the deployment. "
+]
+
+WORDS = (
+    "latency throughput model cache request batch token deploy measure error budget "
+    "replica queue shard index query worker memory profile trace window average"
+).split()
+
+
+def make_transcript(minutes: int) -> str:
+    """Speech-like text; shuffled so it doesn't compress unrealistically well"""
+    rng = random.Random(minutes)
+    parts = []
+    # Roughly 150 spoken words a minute, about 12 per iteration
+    for _ in range(minutes * 150 // 12):
+        parts.append(rng.choice(SENTENCES))
+        parts.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 12))) + f" {rng.randint(1, 999)}. ")
+    return "".join(parts)
+
+
+def make_payloads(minutes: int, chapters: int, questions: int) -> dict:
+    """Endpoint name -> response content, shaped like main.py returns it"""
+
+    transcript = make_transcript(minutes)
+    course = make_course(chapters)
+    slides_html = SlideGenerator().create_slide_deck(course, language="en")
+
+    return {
+        "/video/{id}": {
+            "id": 1,
+            "filename": "lecture.mp4",
+            "transcription": transcript,
+            "summary": transcript[:4000],
+            "processing_status": "completed",
+            "error_message": None,
+            "uploaded_at": datetime.utcnow(),
+            "processed_at": datetime.utcnow(),
+            "detected_language": "en",
+            "user_selected_language": None,
+            "ui_language": "en",
+            "transcription_method": "gpt-4o-transcribe",
+            "audio_summary_path": "uploads/audio_summary_1.mp3",
+            "audio_summary_duration": 182.4
+        },
+        "/api/course/generate-slides": {
+            "success": True,
+            "video_id": 1,
+            "slides_html": slides_html,
+            "course_structure": course,
+            "theme": "light"
+        },
+        "/api/course/generate-quiz": {
+            "success": True,
+            "video_id": 1,
+            "quiz": make_quiz(questions)["quiz"],
+            "course_structure": course
+        }
+    }
+
+
+def best_of(repeat: int, render) -> float:
+    """Fastest of repeat calls, in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=int, default=90, help="Length of the transcribed video")
+    parser.add_argument("--chapters", type=int, default=40, help="Chapters in the course deck")
+    parser.add_argument("--questions", type=int, default=100, help="Quiz questions")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed serializations per payload")
+    args = parser.parse_args()
+
+    print(f"JSON response class: {FastJSONResponse.__name__}{'' if orjson else ' (orjson not installed)'}")
+    print(f"brotli: {'installed' if brotli else 'not installed'}\n")
+
+    header = (
+        f"{'endpoint':<28} | {'stdlib ms':>9} | {'fast ms':>7} | {'raw KiB':>8} | "
+        f"{'gzip KiB':>8} | {'gzip ms':>7} | {'br KiB':>7} | {'br ms':>6}"
+    )
+    print(header)
+    print("-" * len(header))
+
+    for endpoint, payload in make_payloads(args.minutes, args.chapters, args.questions).items():
+        # FastAPI encodes the return value, then the response class serializes it
+        content = jsonable_encoder(payload)
+        stdlib_ms = best_of(args.repeat, lambda: JSONResponse(content))
+        fast_ms = best_of(args.repeat, lambda: FastJSONResponse(content))
+
+        body = FastJSONResponse(content).body
+        gzip_ms = best_of(args.repeat, lambda: gzip.compress(body, compresslevel=COMPRESS_GZIP_LEVEL, mtime=0))
+        gzipped = gzip.compress(body, compresslevel=COMPRESS_GZIP_LEVEL, mtime=0)
+
+        if brotli:
+            br_ms = best_of(args.repeat, lambda: brotli.compress(body, quality=COMPRESS_BROTLI_QUALITY))
+            br_size = f"{len(brotli.compress(body, quality=COMPRESS_BROTLI_QUALITY)) / 1024:>7.1f}"
+            br_time = f"{br_ms:>6.2f}"
+        else:
+            br_size, br_time = f"{'-':>7}", f"{'-':>6}"
+
+        print(
+            f"{endpoint:<28} | {stdlib_ms:>9.2f} | {fast_ms:>7.2f} | {len(body) / 1024:>8.1f} | "
+            f"{len(gzipped) / 1024:>8.1f} | {gzip_ms:>7.2f} | {br_size} | {br_time}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Slide rendering micro-benchmark
+
+Renders synthetic decks of 10 to 200 chapters and reports wall time and
+peak allocations, cold (empty fragment cache) and warm (all chapters memoized).
+
+Usage (from backend/):
+    python benchmarks/bench_slide_render.py [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from slide_generator import SlideGenerator, chapter_fragment_cache
+
+
+CHAPTER_COUNTS = [10, 25, 50, 100, 200]
+
+
+def make_course(num_chapters: int) -> dict:
+    """Builds a course structure shaped like CourseStructurer output"""
+    return {
+        "course": {
+            "title": f"Benchmark Course ({num_chapters} chapters)",
+            "description": "Synthetic course used to benchmark slide rendering",
+            "duration": f"{num_chapters * 20} mins",
+            "difficulty": "intermediate",
+            "learning_outcomes": [f"Outcome {i}" for i in range(5)],
+            "chapters": [
+                {
+                    "number": n,
+                    "title": f"Chapter {n}: Topic {n}",
+                    "duration": "20 mins",
+                    "learning_objectives": [f"Objective {n}.{i}" for i in range(3)],
+                    "key_points": [f"Key point {n}.{i} explaining an idea in a sentence or two" for i in range(8)],
+                    "content": "Lorem ipsum dolor sit amet. " * 40
+                }
+                for n in range(1, num_chapters + 1)
+            ]
+        }
+    }
+
+
+def measure(generator: SlideGenerator, course: dict, repeat: int) -> tuple:
+    """Returns (best time in ms, peak traced memory in KiB, output size in KiB)"""
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        html = generator.create_slide_deck(course, language="en")
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    generator.create_slide_deck(course, language="en")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return best * 1000, peak / 1024, len(html.encode("utf-8")) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best time is reported)")
+    args = parser.parse_args()
+
+    generator = SlideGenerator(theme="light")
+
+    print(f"{'chapters':>8} | {'cold ms':>9} | {'cold peak KiB':>13} | {'warm ms':>9} | {'warm peak KiB':>13} | {'deck KiB':>8}")
+    print("-" * 76)
+    for count in CHAPTER_COUNTS:
+        course = make_course(count)
+
+        # Cold: every run starts from an empty fragment cache
+        cold_ms = float("inf")
+        for _ in range(args.repeat):
+            chapter_fragment_cache.clear()
+            start = time.perf_counter()
+            generator.create_slide_deck(course, language="en")
+            cold_ms = min(cold_ms, (time.perf_counter() - start) * 1000)
+
+        chapter_fragment_cache.clear()
+        tracemalloc.start()
+        generator.create_slide_deck(course, language="en")
+        _, cold_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # Warm: chapters are served from the fragment cache
+        warm_ms, warm_peak, size = measure(generator, course, args.repeat)
+
+        print(f"{count:>8} | {cold_ms:>9.2f} | {cold_peak / 1024:>13.1f} | {warm_ms:>9.2f} | {warm_peak:>13.1f} | {size:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+API startup benchmark
+
+Imports main in fresh interpreters (as every worker process does on
+startup) and reports the import wall time, the modules that dominate it
+(from python -X importtime), and whether heavy dependencies that are
+meant to load lazily got imported.
+
+Usage (from backend/):
+    python benchmarks/bench_startup.py [--runs 5] [--top 15] [--budget 1.0]
+
+Exits with status 1 when the median import time exceeds --budget seconds
+or a lazy dependency was imported, so it can gate CI.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only needed once a video is processed or a model is called
+LAZY_MODULES = ["moviepy", "mutagen", "openai", "numpy", "imageio"]
+
+PROBE = f"""
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, {BACKEND_DIR!r})
+import main
+elapsed = time.perf_counter() - start
+loaded = [name for name in {LAZY_MODULES!r} if name in sys.modules]
+print(f"{{elapsed:.6f}} {{','.join(loaded)}}")
+"""
+
+
+def run_once(workdir: str, profile: bool = False):
+    """
+    Returns (import seconds, lazy modules loaded, importtime records)
+
+    Timed runs go without -X importtime, which slows imports down itself.
+    """
+
+    result = subprocess.run(
+        [sys.executable] + (["-X", "importtime"] if profile else []) + ["-c", PROBE],
+        cwd=workdir,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    elapsed, _, loaded = result.stdout.strip().splitlines()[-1].partition(" ")
+
+    records = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        records.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+
+    return float(elapsed), [name for name in loaded.split(",") if name], records
+
+
+def direct_imports(records, module: str):
+    """
+    Records of the modules a top-level module imported itself
+
+    importtime lists a module after everything it imported, so these are
+    the depth-1 records between the previous top-level record and its own.
+    """
+
+    children = []
+    for record in records:
+        if record[1] == 1:
+            children.append(record)
+        elif record[1] == 0:
+            if record[0] == module:
+                return children
+            children = []
+    return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to time")
+    parser.add_argument("--top", type=int, default=15, help="Modules to list")
+    parser.add_argument("--budget", type=float, default=1.0, help="Maximum median import time in seconds")
+    args = parser.parse_args()
+
+    # main creates upload and course directories in the working directory
+    with tempfile.TemporaryDirectory(prefix="bench-startup-") as workdir:
+        runs = [run_once(workdir) for _ in range(args.runs)]
+        _, _, records = run_once(workdir, profile=True)
+
+    times = [elapsed for elapsed, _, _ in runs]
+    loaded = sorted({name for _, names, _ in runs for name in names})
+
+    median = statistics.median(times)
+    print(f"import main: median {median * 1000:.0f} ms, min {min(times) * 1000:.0f} ms over {args.runs} runs")
+    print(f"lazy dependencies imported at startup: {', '.join(loaded) or 'none'}")
+
+    # Direct imports of main: what our own modules cost, frameworks included
+    direct = direct_imports(records, "main")
+    print(f"\n{'direct import of main':<32} | {'cumulative ms':>13}")
+    print("-" * 48)
+    for name, _, _, cumulative in sorted(direct, key=lambda r: -r[3])[:args.top]:
+        print(f"{name:<32} | {cumulative / 1000:>13.1f}")
+
+    print(f"\n{'module (self time)':<48} | {'self ms':>8}")
+    print("-" * 59)
+    for name, _, self_us, _ in sorted(records, key=lambda r: -r[2])[:args.top]:
+        print(f"{name:<48} | {self_us / 1000:>8.1f}")
+
+    if median > args.budget or loaded:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
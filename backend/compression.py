@@ -0,0 +1,239 @@
+"""
+Response Compression
+ASGI middleware that gzip/brotli-encodes API responses above a size
+threshold, negotiated from Accept-Encoding, plus the JSON response class
+the API uses (orjson when installed)
+"""
+
+import gzip
+import zlib
+from typing import Dict, List, Optional, Tuple
+from decouple import config
+from fastapi.responses import JSONResponse
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip is always available
+    brotli = None
+
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as FastJSONResponse
+except ImportError:  # Optional: the standard library encoder is slower but equivalent
+    orjson = None
+    FastJSONResponse = JSONResponse
+
+
+# Bodies smaller than this aren't worth the CPU (and fit in a packet or two)
+COMPRESS_MIN_BYTES = config('COMPRESS_MIN_BYTES', default=1024, cast=int)
+# Dynamic responses are compressed per request: favour speed over ratio
+COMPRESS_GZIP_LEVEL = config('COMPRESS_GZIP_LEVEL', default=6, cast=int)
+COMPRESS_BROTLI_QUALITY = config('COMPRESS_BROTLI_QUALITY', default=4, cast=int)
+
+COMPRESSIBLE_TYPES = (
+    "text/html", "text/plain", "text/css", "text/csv", "text/xml",
+    "application/json", "application/x-ndjson", "application/javascript",
+    "application/xml", "image/svg+xml"
+)
+
+
+def _accepted_encoding(headers: List[Tuple[bytes, bytes]]) -> Optional[str]:
+    """Best encoding the client accepts (q=0 means refused)"""
+
+    accepted = set()
+    for name, value in headers:
+        if name != b"accept-encoding":
+            continue
+        for part in value.decode("latin-1").split(","):
+            coding, _, params = part.partition(";")
+            parameter, _, q = params.strip().partition("=")
+            try:
+                if parameter.strip() == "q" and float(q) == 0:
+                    continue
+            except ValueError:
+                continue
+            accepted.add(coding.strip().lower())
+
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+class _Encoder:
+    """Incremental gzip or brotli stream"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=COMPRESS_BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(COMPRESS_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        """Encodes a chunk; flush makes everything so far decodable right away"""
+        if self.encoding == "br":
+            out = self._compressor.process(data)
+            return out + self._compressor.flush() if flush else out
+        out = self._compressor.compress(data)
+        return out + self._compressor.flush(zlib.Z_SYNC_FLUSH) if flush else out
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    """One-shot encoding of a complete body"""
+    if encoding == "br":
+        return brotli.compress(body, quality=COMPRESS_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=COMPRESS_GZIP_LEVEL, mtime=0)
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses the client can decode
+
+    Left alone: responses that already carry a Content-Encoding or serve
+    byte ranges (file routes negotiate their precompressed variants
+    themselves), media and archives, server-sent events, HEAD requests and
+    bodies under the size threshold (which still get Vary: Accept-Encoding). Streamed responses are compressed
+    chunk by chunk with a flush after each, so NDJSON progress still arrives
+    as it is produced.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESS_MIN_BYTES):
+        """
+        Args:
+            app: ASGI application to wrap
+            minimum_size: Smallest body (in bytes) to compress
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = _accepted_encoding(scope["headers"])
+        if encoding is None:
+            # Still vary: a shared cache must not hand this identity body
+            # to clients that accept an encoding
+            async def send_identity(message):
+                if message["type"] == "http.response.start" and self._compressible(message):
+                    message = self._with_vary(message)
+                await send(message)
+
+            await self.app(scope, receive, send_identity)
+            return
+
+        start_message: Optional[Dict] = None
+        encoder: Optional[_Encoder] = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, encoder, passthrough
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                passthrough = not self._compressible(message)
+                if passthrough:
+                    await send(message)
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if encoder is None:
+                if not more_body:
+                    # Whole body in one message: compress it if it's big enough
+                    if len(body) < self.minimum_size:
+                        passthrough = True
+                        await send(self._with_vary(start_message))
+                        await send(message)
+                        return
+                    compressed = compress_body(body, encoding)
+                    await send(self._encoded_start(start_message, encoding, len(compressed)))
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+
+                encoder = _Encoder(encoding)
+                await send(self._encoded_start(start_message, encoding, None))
+
+            if more_body:
+                if not body:
+                    return
+                chunk = encoder.compress(body, flush=True)
+                if chunk:
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            else:
+                await send({"type": "http.response.body", "body": encoder.compress(body) + encoder.finish()})
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    def _compressible(start_message: Dict) -> bool:
+        status = start_message["status"]
+        if status < 200 or status in (204, 206, 304):
+            return False
+
+        headers = {name.lower(): value for name, value in start_message.get("headers", [])}
+        if b"content-encoding" in headers or b"accept-ranges" in headers or b"content-range" in headers:
+            return False
+
+        content_type = headers.get(b"content-type", b"").decode("latin-1").split(";")[0].strip().lower()
+        # Not listed: media, archives, and text/event-stream (which must reach
+        # the client event by event; proxies expect it unencoded)
+        return content_type in COMPRESSIBLE_TYPES
+
+    @staticmethod
+    def _with_vary(start_message: Dict) -> Dict:
+        """
+        The response head with Accept-Encoding in Vary
+
+        Added to every compressible response, encoded or not, since whether
+        the body is encoded depends on that request header.
+        """
+
+        headers = []
+        vary = None
+        for name, value in start_message.get("headers", []):
+            if name.lower() == b"vary":
+                vary = value
+                continue
+            headers.append((name, value))
+
+        if vary is None:
+            vary = b"Accept-Encoding"
+        elif b"accept-encoding" not in vary.lower() and vary.strip() != b"*":
+            vary = vary + b", Accept-Encoding"
+        headers.append((b"vary", vary))
+
+        return {**start_message, "headers": headers}
+
+    @classmethod
+    def _encoded_start(cls, start_message: Dict, encoding: str, length: Optional[int]) -> Dict:
+        """The response head rewritten for an encoded body"""
+
+        headers = []
+        for name, value in cls._with_vary(start_message)["headers"]:
+            lowered = name.lower()
+            if lowered == b"content-length":
+                continue
+            if lowered == b"etag" and not value.startswith(b"W/"):
+                # The encoded body is a different byte sequence: weak validator
+                value = b"W/" + value
+            headers.append((name, value))
+
+        headers.append((b"content-encoding", encoding.encode("latin-1")))
+        if length is not None:
+            headers.append((b"content-length", str(length).encode("latin-1")))
+
+        return {**start_message, "headers": headers}
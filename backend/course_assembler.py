@@ -3,11 +3,57 @@ Course Assembler
 Combines course structure, slides, and quiz into a complete course package
 """
 
+import logging
 import os
 import json
-import zipfile
-from typing import Dict, Optional
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 from datetime import datetime
+from decouple import config
+
+from course_assets import CourseAssets, ASSETS_DIRNAME
+from file_serving import precompress, is_precompressed_sibling
+from html_optimizer import optimize_html
+from zip_stream import write_zip
+from metrics import timed_stage
+
+logger = logging.getLogger(__name__)
+
+
+# Courses are built in "<output_dir>/.staging-<course_id>-*" and renamed into place
+STAGING_PREFIX = ".staging-"
+# Staging directories older than this were left by a crashed build
+STALE_STAGING_SECONDS = 3600
+# A course being replaced is parked as "<staging dir>.old" between the two renames
+RETIRED_SUFFIX = ".old"
+
+
+def _json_text(data) -> str:
+    """Compact JSON: course files are read by code, not people"""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def _link_or_copy(src: str, dst: str):
+    """Hard-links a file that is carried over unchanged (files are only ever replaced, never rewritten in place)"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _fsync_dir(path: str):
+    """Persists a directory entry change (rename); no-op where directories can't be opened"""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
 
 
 class CourseAssembler:
@@ -15,17 +61,107 @@ class CourseAssembler:
     Assembles complete course from individual components
     """
 
-    def __init__(self):
-        self.output_dir = "generated_courses"
+    def __init__(self, output_dir: str = "generated_courses"):
+        """
+        Args:
+            output_dir: Directory holding the course directories
+        """
+        self.output_dir = output_dir
         os.makedirs(self.output_dir, exist_ok=True)
+        # Shared, content-hashed CSS/JS referenced by every course
+        self.assets = CourseAssets(self.output_dir)
+
+        # Artifacts of a course are rendered and written concurrently
+        self.write_workers = config('ASSEMBLY_WRITE_WORKERS', default=4, cast=int)
+        self._writer = ThreadPoolExecutor(
+            max_workers=max(1, self.write_workers),
+            thread_name_prefix="course-writer"
+        )
 
+        # Hoist repeated inline styles and minify pages before writing
+        self.optimize_html = config('HTML_OPTIMIZE_ENABLED', default=True, cast=bool)
+
+        # Recovery first: a parked course may be the only copy left
+        self._recover_retired()
+        self._remove_stale_staging()
+
+    def _get_labels(self, language: str) -> Dict:
+        """Returns UI labels for the quiz and course viewer pages"""
+        labels = {
+            "en": {
+                "questions": "Questions",
+                "minutes": "Minutes",
+                "passing_score": "Passing Score",
+                "reset": "Reset",
+                "submit": "Submit Quiz",
+                "question": "Question",
+                "answer_placeholder": "Type your answer here...",
+                "passed": "Passed!",
+                "not_passed": "Not Passed",
+                "points": "points",
+                "detailed_results": "Detailed Results",
+                "your_answer": "Your answer",
+                "correct_answer": "Correct answer",
+                "not_answered": "Not answered",
+                "explanation": "Explanation",
+                "take_again": "Take Quiz Again",
+                "close": "Close",
+                "reset_confirm": "Are you sure you want to reset the quiz?",
+                "course_overview": "Course Overview",
+                "duration": "Duration",
+                "difficulty": "Difficulty",
+                "chapters": "Chapters",
+                "quiz_questions": "Quiz Questions",
+                "course_content": "Course Content",
+                "chapter": "Chapter",
+                "start_course": "Start Course (View Slides)",
+                "take_quiz": "Take Quiz",
+                "generated_with": "Generated with AI Course Creation Platform",
+                "created": "Created"
+            },
+            "ja": {
+                "questions": "問",
+                "minutes": "分",
+                "passing_score": "合格点",
+                "reset": "リセット",
+                "submit": "クイズを提出",
+                "question": "問題",
+                "answer_placeholder": "ここに回答を入力してください...",
+                "passed": "合格！",
+                "not_passed": "不合格",
+                "points": "点",
+                "detailed_results": "詳細な結果",
+                "your_answer": "あなたの回答",
+                "correct_answer": "正解",
+                "not_answered": "未回答",
+                "explanation": "解説",
+                "take_again": "もう一度受ける",
+                "close": "閉じる",
+                "reset_confirm": "クイズをリセットしてもよろしいですか？",
+                "course_overview": "コース概要",
+                "duration": "期間",
+                "difficulty": "難易度",
+                "chapters": "章",
+                "quiz_questions": "クイズの問題数",
+                "course_content": "コース内容",
+                "chapter": "章",
+                "start_course": "コースを開始（スライドを見る）",
+                "take_quiz": "クイズを受ける",
+                "generated_with": "AIコース作成プラットフォームで生成",
+                "created": "作成日"
+            }
+        }
+        return labels.get(language, labels["en"])
+
+    @timed_stage("assemble")
     def assemble_course(
         self,
         course_structure: Dict,
         slides_html: str,
         quiz_data: Dict,
         course_id: str,
-        metadata: Optional[Dict] = None
+        metadata: Optional[Dict] = None,
+        slide_chapters: Optional[Dict[str, str]] = None
     ) -> Dict:
         """
         Assembles complete course package
@@ -36,6 +172,7 @@ class CourseAssembler:
             quiz_data: Quiz from QuizGenerator
             course_id: Unique course identifier
             metadata: Additional metadata (video_id, language, etc.)
+            slide_chapters: Chapter fragments of a chunked deck (from SlideGenerator.render_deck)
 
         Returns:
             Dict with course package info and file paths
@@ -43,45 +180,10 @@ class CourseAssembler:
 
         course = course_structure.get("course", {})
         course_title = course.get("title", "Course")
+        language = (metadata or {}).get("language", "en")
 
-        # Create course directory
         course_dir = os.path.join(self.output_dir, course_id)
-        os.makedirs(course_dir, exist_ok=True)
-
-        # Save course structure as JSON
-        structure_path = os.path.join(course_dir, "course_structure.json")
-        with open(structure_path, 'w', encoding='utf-8') as f:
-            json.dump(course_structure, f, indent=2, ensure_ascii=False)
-
-        # Save slides HTML
-        slides_path = os.path.join(course_dir, "slides.html")
-        with open(slides_path, 'w', encoding='utf-8') as f:
-            f.write(slides_html)
-
-        # Save quiz data as JSON
-        quiz_path = os.path.join(course_dir, "quiz_data.json")
-        with open(quiz_path, 'w', encoding='utf-8') as f:
-            json.dump(quiz_data, f, indent=2, ensure_ascii=False)
-
-        # Generate quiz HTML
-        quiz_html = self._generate_quiz_html(quiz_data, course_title)
-        quiz_html_path = os.path.join(course_dir, "quiz.html")
-        with open(quiz_html_path, 'w', encoding='utf-8') as f:
-            f.write(quiz_html)
-
-        # Generate course viewer (combines slides + quiz)
-        viewer_html = self._generate_course_viewer(
-            course_title=course_title,
-            slides_file="slides.html",
-            quiz_file="quiz.html",
-            course_structure=course_structure,
-            quiz_data=quiz_data
-        )
-        viewer_path = os.path.join(course_dir, "index.html")
-        with open(viewer_path, 'w', encoding='utf-8') as f:
-            f.write(viewer_html)
 
-        # Save metadata
         full_metadata = {
             "course_id": course_id,
             "title": course_title,
@@ -89,308 +191,384 @@ class CourseAssembler:
             "structure_file": "course_structure.json",
             "slides_file": "slides.html",
             "quiz_file": "quiz.html",
-            "viewer_file": "index.html"
+            "viewer_file": "index.html",
+            "chunked_slides": bool(slide_chapters)
         }
         if metadata:
             full_metadata.update(metadata)
 
+        artifacts = {
+            "course_structure.json": lambda: _json_text(course_structure),
+            "slides.html": lambda: slides_html,
+            "quiz_data.json": lambda: _json_text(quiz_data),
+            "quiz.html": lambda: self._generate_quiz_html(quiz_data, course_title, language),
+            # Course viewer (combines slides + quiz)
+            "index.html": lambda: self._generate_course_viewer(
+                course_title=course_title,
+                slides_file="slides.html",
+                quiz_file="quiz.html",
+                course_structure=course_structure,
+                quiz_data=quiz_data,
+                language=language
+            )
+        }
+        artifacts.update(self._chapter_artifacts(slide_chapters))
+
+        # Build the whole course next to its final location, then publish it in
+        # one rename: a crash never leaves a half-written course to be served
+        staging_dir = tempfile.mkdtemp(dir=self.output_dir, prefix=f"{STAGING_PREFIX}{course_id}-")
+        try:
+            optimization = self._write_artifacts(staging_dir, artifacts)
+            # Metadata goes last: it reports what the optimizer saved
+            full_metadata["html_optimization"] = self._optimization_report(optimization)
+            self._write_artifacts(staging_dir, {"metadata.json": lambda: _json_text(full_metadata)})
+            self._publish(staging_dir, course_dir)
+        except Exception:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
+
+        return {
+            "course_id": course_id,
+            "course_dir": course_dir,
+            "files": {
+                "structure": os.path.join(course_dir, "course_structure.json"),
+                "slides": os.path.join(course_dir, "slides.html"),
+                "quiz_data": os.path.join(course_dir, "quiz_data.json"),
+                "quiz_html": os.path.join(course_dir, "quiz.html"),
+                "viewer": os.path.join(course_dir, "index.html"),
+                "metadata": os.path.join(course_dir, "metadata.json")
+            },
+            "metadata": full_metadata
+        }
+
+    def rerender_course(
+        self,
+        course_id: str,
+        course_structure: Dict,
+        slides_html: str,
+        quiz_data: Dict,
+        language: str = "en",
+        metadata: Optional[Dict] = None,
+        slide_chapters: Optional[Dict[str, str]] = None
+    ) -> Optional[Dict]:
+        """
+        Rebuilds the HTML of an existing course from its stored artifacts
+
+        Only slides.html, quiz.html and index.html are rewritten; the course
+        structure and quiz data stay as they are. The new version is built in
+        a staging directory and published like a new course, so readers never
+        see a half-rendered deck.
+
+        Args:
+            course_id: Course identifier
+            course_structure: Stored course structure
+            slides_html: Re-rendered slides from SlideGenerator
+            quiz_data: Stored quiz data
+            language: Language code for quiz and viewer labels
+            metadata: Metadata fields to update (theme, etc.)
+            slide_chapters: Chapter fragments of a chunked deck
+
+        Returns:
+            Dict with updated file paths and metadata, or None if the course doesn't exist
+        """
+
+        course_dir = os.path.join(self.output_dir, course_id)
+        if not os.path.exists(course_dir):
+            logger.warning("Course directory not found", extra={"course_id": course_id})
+            return None
+
+        course_title = course_structure.get("course", {}).get("title", "Course")
+
+        # Update metadata
         metadata_path = os.path.join(course_dir, "metadata.json")
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(full_metadata, f, indent=2)
+        full_metadata = {}
+        if os.path.exists(metadata_path):
+            with open(metadata_path, 'r', encoding='utf-8') as f:
+                full_metadata = json.load(f)
+        full_metadata.update(metadata or {})
+        full_metadata["chunked_slides"] = bool(slide_chapters)
+        full_metadata["rendered_at"] = datetime.now().isoformat()
+
+        artifacts = {
+            "slides.html": lambda: slides_html,
+            "quiz.html": lambda: self._generate_quiz_html(quiz_data, course_title, language),
+            "index.html": lambda: self._generate_course_viewer(
+                course_title=course_title,
+                slides_file="slides.html",
+                quiz_file="quiz.html",
+                course_structure=course_structure,
+                quiz_data=quiz_data,
+                language=language
+            )
+        }
+        artifacts.update(self._chapter_artifacts(slide_chapters))
+
+        # Files that are kept are linked into the staging directory; chapter
+        # fragments of the previous deck may not exist in this one
+        replaced = set(artifacts) | {"metadata.json", "chapters"}
+
+        def not_kept(directory: str, names: List[str]) -> List[str]:
+            if directory != course_dir:
+                return []
+            return [
+                name for name in names
+                if name in replaced
+                or (os.path.splitext(name)[0] in replaced and is_precompressed_sibling(os.path.join(directory, name)))
+            ]
+
+        staging_dir = tempfile.mkdtemp(dir=self.output_dir, prefix=f"{STAGING_PREFIX}{course_id}-")
+        try:
+            shutil.copytree(course_dir, staging_dir, ignore=not_kept, copy_function=_link_or_copy, dirs_exist_ok=True)
+            optimization = self._write_artifacts(staging_dir, artifacts)
+            full_metadata["html_optimization"] = self._optimization_report(optimization)
+            self._write_artifacts(staging_dir, {"metadata.json": lambda: _json_text(full_metadata)})
+            self._publish(staging_dir, course_dir)
+        except Exception:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
 
         return {
             "course_id": course_id,
             "course_dir": course_dir,
             "files": {
-                "structure": structure_path,
-                "slides": slides_path,
-                "quiz_data": quiz_path,
-                "quiz_html": quiz_html_path,
-                "viewer": viewer_path,
+                "slides": os.path.join(course_dir, "slides.html"),
+                "quiz_html": os.path.join(course_dir, "quiz.html"),
+                "viewer": os.path.join(course_dir, "index.html"),
                 "metadata": metadata_path
             },
             "metadata": full_metadata
         }
 
-    def _generate_quiz_html(self, quiz_data: Dict, course_title: str) -> str:
+    def _chapter_artifacts(self, slide_chapters: Optional[Dict[str, str]]) -> Dict[str, Callable[[], str]]:
+        """Chapter fragments of a chunked deck as artifacts"""
+        return {rel_path: (lambda html=html: html) for rel_path, html in (slide_chapters or {}).items()}
+
+    def _write_artifacts(self, directory: str, artifacts: Dict[str, Callable[[], str]]) -> Dict[str, Dict]:
+        """
+        Renders and writes artifacts concurrently
+
+        Args:
+            directory: Directory the artifact paths are relative to
+            artifacts: Relative path -> callable returning the file content
+
+        Returns:
+            Relative path -> optimize_html stats, for the HTML artifacts
+        """
+
+        for rel_path in artifacts:
+            os.makedirs(os.path.dirname(os.path.join(directory, rel_path)), exist_ok=True)
+
+        futures = [
+            self._writer.submit(self._write_artifact, os.path.join(directory, rel_path), render)
+            for rel_path, render in artifacts.items()
+        ]
+        # Wait for every write, then surface the first failure
+        errors = [future.exception() for future in futures]
+        for error in errors:
+            if error is not None:
+                raise error
+
+        return {
+            rel_path: future.result()
+            for rel_path, future in zip(artifacts, futures)
+            if future.result() is not None
+        }
+
+    def _write_artifact(self, path: str, render: Callable[[], str]) -> Optional[Dict]:
+        """
+        Writes one file durably and atomically, then its precompressed copies
+
+        Returns:
+            optimize_html stats for an optimized HTML file, otherwise None
+        """
+
+        content = render()
+        stats = None
+        if self.optimize_html and path.endswith(".html"):
+            content, stats = optimize_html(content)
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        # .gz/.br siblings, served to clients that accept them
+        precompress(path)
+        return stats
+
+    def _optimization_report(self, optimization: Dict[str, Dict]) -> Dict:
+        """
+        Bytes saved by the HTML optimizer: per page, chapter fragments combined
+
+        Args:
+            optimization: Relative path -> optimize_html stats
+
+        Returns:
+            Dict with "files", "chapters" (if any) and "saved_bytes"
+        """
+
+        report = {"files": {}, "saved_bytes": 0}
+        chapters = None
+        for rel_path, stats in sorted(optimization.items()):
+            report["saved_bytes"] += stats["saved_bytes"]
+            if not rel_path.startswith("chapters/"):
+                report["files"][rel_path] = stats
+                continue
+
+            if chapters is None:
+                chapters = {"count": 0, "original_bytes": 0, "optimized_bytes": 0, "saved_bytes": 0, "verified": True}
+            chapters["count"] += 1
+            for key in ("original_bytes", "optimized_bytes", "saved_bytes"):
+                chapters[key] += stats[key]
+            chapters["verified"] = chapters["verified"] and stats["verified"]
+
+        if chapters:
+            report["chapters"] = chapters
+        return report
+
+    def _publish(self, staging_dir: str, course_dir: str):
+        """
+        Moves a fully written staging directory to its final location
+
+        An existing course is parked next to it first; if the process dies
+        before the second rename, _recover_retired puts it back on the next
+        start.
+        """
+
+        for root, dirs, _ in os.walk(staging_dir):
+            for name in dirs:
+                _fsync_dir(os.path.join(root, name))
+        _fsync_dir(staging_dir)
+
+        retired = None
+        if os.path.exists(course_dir):
+            # Rebuilding an existing course: swap, then drop the old tree
+            retired = f"{staging_dir}{RETIRED_SUFFIX}"
+            os.rename(course_dir, retired)
+        os.rename(staging_dir, course_dir)
+        _fsync_dir(self.output_dir)
+
+        if retired:
+            shutil.rmtree(retired, ignore_errors=True)
+
+    def _recover_retired(self):
+        """
+        Finishes course swaps interrupted by a crash
+
+        A crash between the two renames of _publish leaves the previous
+        version parked under the staging name and no course directory: it is
+        renamed back. If the new version was published, the parked copy is
+        just deleted.
+        """
+
+        for name in os.listdir(self.output_dir):
+            path = os.path.join(self.output_dir, name)
+            if not (name.startswith(STAGING_PREFIX) and name.endswith(RETIRED_SUFFIX)) or not os.path.isdir(path):
+                continue
+
+            # ".staging-<course_id>-<random>.old"; the random part has no "-"
+            course_id = name[len(STAGING_PREFIX):-len(RETIRED_SUFFIX)].rsplit("-", 1)[0]
+            course_dir = os.path.join(self.output_dir, course_id)
+            try:
+                if os.path.exists(course_dir):
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    os.rename(path, course_dir)
+                    _fsync_dir(self.output_dir)
+                    logger.warning("Restored course after an interrupted rebuild", extra={"course_id": course_id})
+            except OSError as e:
+                logger.error("Could not restore course", extra={"course_id": course_id, "path": path, "error": str(e)})
+
+    def _remove_stale_staging(self):
+        """Deletes staging directories left behind by builds that crashed"""
+
+        cutoff = time.time() - STALE_STAGING_SECONDS
+        for name in os.listdir(self.output_dir):
+            path = os.path.join(self.output_dir, name)
+            if not name.startswith(STAGING_PREFIX) or not os.path.isdir(path):
+                continue
+            # Parked courses are left to _recover_retired, even if it failed
+            if name.endswith(RETIRED_SUFFIX):
+                continue
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    shutil.rmtree(path, ignore_errors=True)
+            except OSError:
+                continue
+
+    def update_quiz(
+        self,
+        course_id: str,
+        quiz_data: Dict,
+        course_title: str,
+        language: str = "en"
+    ) -> Optional[Dict]:
+        """
+        Rewrites the quiz files of an existing course
+
+        Args:
+            course_id: Course identifier
+            quiz_data: Updated quiz data
+            course_title: Course title for the quiz page
+            language: Language code for quiz labels
+
+        Returns:
+            Dict with the updated file paths or None if the course doesn't exist
+        """
+
+        course_dir = os.path.join(self.output_dir, course_id)
+        if not os.path.exists(course_dir):
+            logger.warning("Course directory not found", extra={"course_id": course_id})
+            return None
+
+        self._write_artifacts(course_dir, {
+            "quiz_data.json": lambda: _json_text(quiz_data),
+            "quiz.html": lambda: self._generate_quiz_html(quiz_data, course_title, language)
+        })
+
+        return {
+            "quiz_data": os.path.join(course_dir, "quiz_data.json"),
+            "quiz_html": os.path.join(course_dir, "quiz.html")
+        }
+
+    def _generate_quiz_html(self, quiz_data: Dict, course_title: str, language: str = "en") -> str:
         """Generates standalone quiz HTML"""
 
         quiz = quiz_data.get("quiz", {})
         questions = quiz.get("questions", [])
+        labels = self._get_labels(language)
+        quiz_assets = self.assets.quiz_assets()
 
         # Generate questions HTML
         questions_html = []
         for q in questions:
-            q_html = self._generate_question_html(q)
+            q_html = self._generate_question_html(q, labels)
             questions_html.append(q_html)
 
         questions_content = "\n".join(questions_html)
 
         html = f"""
 <!DOCTYPE html>
-<html lang="en">
+<html lang="{language}">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{quiz.get('title', 'Quiz')}</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            padding: 20px;
-        }}
-
-        .quiz-container {{
-            max-width: 800px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 15px;
-            box-shadow: 0 10px 40px rgba(0,0,0,0.2);
-            overflow: hidden;
-        }}
-
-        .quiz-header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 30px;
-            text-align: center;
-        }}
-
-        .quiz-header h1 {{
-            font-size: 2em;
-            margin-bottom: 10px;
-        }}
-
-        .quiz-info {{
-            display: flex;
-            justify-content: center;
-            gap: 30px;
-            margin-top: 15px;
-            font-size: 0.9em;
-        }}
-
-        .quiz-content {{
-            padding: 30px;
-        }}
-
-        .question {{
-            margin-bottom: 40px;
-            padding: 25px;
-            background: #f8f9fa;
-            border-radius: 10px;
-            border-left: 4px solid #667eea;
-        }}
-
-        .question-header {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 15px;
-        }}
-
-        .question-number {{
-            font-weight: bold;
-            color: #667eea;
-            font-size: 0.9em;
-        }}
-
-        .question-difficulty {{
-            padding: 4px 12px;
-            border-radius: 12px;
-            font-size: 0.8em;
-            text-transform: uppercase;
-        }}
-
-        .difficulty-easy {{
-            background: #d4edda;
-            color: #155724;
-        }}
-
-        .difficulty-medium {{
-            background: #fff3cd;
-            color: #856404;
-        }}
-
-        .difficulty-hard {{
-            background: #f8d7da;
-            color: #721c24;
-        }}
-
-        .question-text {{
-            font-size: 1.1em;
-            margin-bottom: 20px;
-            color: #333;
-            line-height: 1.6;
-        }}
-
-        .options {{
-            list-style: none;
-        }}
-
-        .option {{
-            margin: 10px 0;
-        }}
-
-        .option label {{
-            display: block;
-            padding: 15px 20px;
-            background: white;
-            border: 2px solid #e0e0e0;
-            border-radius: 8px;
-            cursor: pointer;
-            transition: all 0.3s;
-        }}
-
-        .option label:hover {{
-            border-color: #667eea;
-            background: #f0f4ff;
-        }}
-
-        .option input[type="radio"] {{
-            margin-right: 10px;
-        }}
-
-        .fill-blank-input {{
-            width: 100%;
-            padding: 12px;
-            border: 2px solid #e0e0e0;
-            border-radius: 8px;
-            font-size: 1em;
-            transition: border-color 0.3s;
-        }}
-
-        .fill-blank-input:focus {{
-            outline: none;
-            border-color: #667eea;
-        }}
-
-        .quiz-actions {{
-            display: flex;
-            justify-content: center;
-            gap: 20px;
-            margin-top: 30px;
-            padding: 30px;
-            background: #f8f9fa;
-        }}
-
-        .btn {{
-            padding: 15px 40px;
-            border: none;
-            border-radius: 8px;
-            font-size: 1em;
-            font-weight: 600;
-            cursor: pointer;
-            transition: all 0.3s;
-        }}
-
-        .btn-primary {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-        }}
-
-        .btn-primary:hover {{
-            transform: translateY(-2px);
-            box-shadow: 0 5px 20px rgba(102, 126, 234, 0.4);
-        }}
-
-        .btn-secondary {{
-            background: white;
-            color: #667eea;
-            border: 2px solid #667eea;
-        }}
-
-        .btn-secondary:hover {{
-            background: #667eea;
-            color: white;
-        }}
-
-        .results {{
-            display: none;
-            padding: 30px;
-        }}
-
-        .results.show {{
-            display: block;
-        }}
-
-        .score-display {{
-            text-align: center;
-            padding: 40px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            border-radius: 10px;
-            margin-bottom: 30px;
-        }}
-
-        .score-display h2 {{
-            font-size: 3em;
-            margin-bottom: 10px;
-        }}
-
-        .passed {{
-            background: linear-gradient(135deg, #56ab2f 0%, #a8e063 100%);
-        }}
-
-        .failed {{
-            background: linear-gradient(135deg, #eb3349 0%, #f45c43 100%);
-        }}
-
-        .result-item {{
-            margin: 20px 0;
-            padding: 20px;
-            border-radius: 8px;
-            border-left: 4px solid;
-        }}
-
-        .result-correct {{
-            background: #d4edda;
-            border-color: #28a745;
-        }}
-
-        .result-incorrect {{
-            background: #f8d7da;
-            border-color: #dc3545;
-        }}
-
-        .explanation {{
-            margin-top: 10px;
-            padding: 15px;
-            background: rgba(255,255,255,0.5);
-            border-radius: 5px;
-            font-size: 0.9em;
-        }}
-
-        @media (max-width: 768px) {{
-            .quiz-container {{
-                margin: 10px;
-            }}
-
-            .quiz-header h1 {{
-                font-size: 1.5em;
-            }}
-
-            .quiz-info {{
-                flex-direction: column;
-                gap: 10px;
-            }}
-        }}
-    </style>
+    <link rel="stylesheet" href="{quiz_assets['quiz.css']}">
 </head>
 <body>
     <div class="quiz-container">
         <div class="quiz-header">
             <h1>{quiz.get('title', 'Quiz')}</h1>
             <div class="quiz-info">
-                <div>📝 {len(questions)} Questions</div>
-                <div>⏱️ {quiz.get('time_limit', 20)} Minutes</div>
-                <div>✅ Passing Score: {quiz.get('passing_score', 70)}%</div>
+                <div>📝 {len(questions)} {labels['questions']}</div>
+                <div>⏱️ {quiz.get('time_limit', 20)} {labels['minutes']}</div>
+                <div>✅ {labels['passing_score']}: {quiz.get('passing_score', 70)}%</div>
             </div>
         </div>
 
@@ -401,8 +579,8 @@ class CourseAssembler:
         </div>
 
         <div class="quiz-actions">
-            <button type="button" class="btn btn-secondary" onclick="resetQuiz()">Reset</button>
-            <button type="button" class="btn btn-primary" onclick="submitQuiz()">Submit Quiz</button>
+            <button type="button" class="btn btn-secondary" onclick="resetQuiz()">{labels['reset']}</button>
+            <button type="button" class="btn btn-primary" onclick="submitQuiz()">{labels['submit']}</button>
         </div>
 
         <div class="results" id="results">
@@ -412,167 +590,20 @@ class CourseAssembler:
 
     <script>
         const quizData = {json.dumps(quiz_data)};
-
-        function submitQuiz() {{
-            const form = document.getElementById('quizForm');
-            const formData = new FormData(form);
-            const userAnswers = {{}};
-
-            // Collect answers
-            quizData.quiz.questions.forEach(q => {{
-                const qId = q.id;
-
-                if (q.type === 'fill_blank') {{
-                    userAnswers[qId] = formData.get(`q${{qId}}`);
-                }} else {{
-                    const selectedOption = formData.get(`q${{qId}}`);
-                    userAnswers[qId] = selectedOption ? parseInt(selectedOption) : null;
-                }}
-            }});
-
-            // Calculate score
-            const result = calculateScore(userAnswers);
-            displayResults(result);
-        }}
-
-        function calculateScore(userAnswers) {{
-            const questions = quizData.quiz.questions;
-            let totalPoints = 0;
-            let earnedPoints = 0;
-            const results = [];
-
-            questions.forEach(q => {{
-                const points = q.points || 1;
-                totalPoints += points;
-
-                const userAnswer = userAnswers[q.id];
-                let isCorrect = false;
-
-                if (q.type === 'fill_blank') {{
-                    const acceptable = q.acceptable_answers || [q.correct_answer];
-                    if (userAnswer) {{
-                        isCorrect = acceptable.some(ans =>
-                            ans.toLowerCase().trim() === userAnswer.toLowerCase().trim()
-                        );
-                    }}
-                }} else {{
-                    isCorrect = userAnswer === q.correct_answer;
-                }}
-
-                if (isCorrect) {{
-                    earnedPoints += points;
-                }}
-
-                results.push({{
-                    questionId: q.id,
-                    question: q.question,
-                    correct: isCorrect,
-                    userAnswer: userAnswer,
-                    correctAnswer: q.correct_answer,
-                    explanation: q.explanation || '',
-                    options: q.options || []
-                }});
-            }});
-
-            const percentage = (earnedPoints / totalPoints * 100).toFixed(2);
-            const passed = percentage >= quizData.quiz.passing_score;
-
-            return {{
-                totalQuestions: questions.length,
-                totalPoints,
-                earnedPoints,
-                percentage,
-                passed,
-                results
-            }};
-        }}
-
-        function displayResults(result) {{
-            const resultsDiv = document.getElementById('results');
-            const quizContent = document.getElementById('quizContent');
-
-            quizContent.style.display = 'none';
-            document.querySelector('.quiz-actions').style.display = 'none';
-
-            const statusClass = result.passed ? 'passed' : 'failed';
-            const statusIcon = result.passed ? '🎉' : '😔';
-            const statusText = result.passed ? 'Passed!' : 'Not Passed';
-
-            let resultsHTML = `
-                <div class="score-display ${{statusClass}}">
-                    <div style="font-size: 4em; margin-bottom: 10px;">${{statusIcon}}</div>
-                    <h2>${{result.percentage}}%</h2>
-                    <p style="font-size: 1.2em;">${{statusText}}</p>
-                    <p style="margin-top: 15px; opacity: 0.9;">
-                        ${{result.earnedPoints}} / ${{result.totalPoints}} points
-                    </p>
-                </div>
-
-                <h3 style="margin-bottom: 20px;">Detailed Results</h3>
-            `;
-
-            result.results.forEach((r, index) => {{
-                const resultClass = r.correct ? 'result-correct' : 'result-incorrect';
-                const resultIcon = r.correct ? '✅' : '❌';
-
-                let answerDisplay = '';
-                if (r.options && r.options.length > 0) {{
-                    answerDisplay = `
-                        <p><strong>Your answer:</strong> ${{r.options[r.userAnswer] || 'Not answered'}}</p>
-                        <p><strong>Correct answer:</strong> ${{r.options[r.correctAnswer]}}</p>
-                    `;
-                }} else {{
-                    answerDisplay = `
-                        <p><strong>Your answer:</strong> ${{r.userAnswer || 'Not answered'}}</p>
-                        <p><strong>Correct answer:</strong> ${{r.correctAnswer}}</p>
-                    `;
-                }}
-
-                resultsHTML += `
-                    <div class="result-item ${{resultClass}}">
-                        <div style="display: flex; align-items: start; gap: 10px;">
-                            <span style="font-size: 1.5em;">${{resultIcon}}</span>
-                            <div style="flex: 1;">
-                                <p style="font-weight: bold; margin-bottom: 10px;">
-                                    Question ${{index + 1}}: ${{r.question}}
-                                </p>
-                                ${{answerDisplay}}
-                                ${{r.explanation ? `
-                                    <div class="explanation">
-                                        <strong>💡 Explanation:</strong> ${{r.explanation}}
-                                    </div>
-                                ` : ''}}
-                            </div>
-                        </div>
-                    </div>
-                `;
-            }});
-
-            resultsHTML += `
-                <div style="text-align: center; margin-top: 30px;">
-                    <button class="btn btn-primary" onclick="location.reload()">Take Quiz Again</button>
-                    <button class="btn btn-secondary" onclick="window.close()">Close</button>
-                </div>
-            `;
-
-            resultsDiv.innerHTML = resultsHTML;
-            resultsDiv.classList.add('show');
-        }}
-
-        function resetQuiz() {{
-            if (confirm('Are you sure you want to reset the quiz?')) {{
-                document.getElementById('quizForm').reset();
-            }}
-        }}
+        const labels = {json.dumps(labels, ensure_ascii=False)};
     </script>
+    <script src="{quiz_assets['quiz.js']}"></script>
 </body>
 </html>
 """
         return html
 
-    def _generate_question_html(self, question: Dict) -> str:
+    def _generate_question_html(self, question: Dict, labels: Optional[Dict] = None) -> str:
         """Generates HTML for a single question"""
 
+        if labels is None:
+            labels = self._get_labels("en")
+
         q_id = question.get("id", 1)
         q_type = question.get("type", "mcq")
         q_text = question.get("question", "")
@@ -583,7 +614,7 @@ class CourseAssembler:
         html = f"""
         <div class="question">
             <div class="question-header">
-                <span class="question-number">Question {q_id}</span>
+                <span class="question-number">{labels['question']} {q_id}</span>
                 <span class="question-difficulty {difficulty_class}">{difficulty}</span>
             </div>
             <div class="question-text">{q_text}</div>
@@ -604,7 +635,7 @@ class CourseAssembler:
             html += '</ul>'
 
         elif q_type == "fill_blank":
-            html += f'<input type="text" name="q{q_id}" class="fill-blank-input" placeholder="Type your answer here...">'
+            html += f'<input type="text" name="q{q_id}" class="fill-blank-input" placeholder="{labels["answer_placeholder"]}">'
 
         html += '</div>'
         return html
@@ -615,178 +646,24 @@ class CourseAssembler:
         slides_file: str,
         quiz_file: str,
         course_structure: Dict,
-        quiz_data: Dict
+        quiz_data: Dict,
+        language: str = "en"
     ) -> str:
         """Generates course viewer that combines slides and quiz"""
 
         course = course_structure.get("course", {})
         chapters = course.get("chapters", [])
+        labels = self._get_labels(language)
+        viewer_assets = self.assets.viewer_assets()
 
         html = f"""
 <!DOCTYPE html>
-<html lang="en">
+<html lang="{language}">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{course_title}</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: #f5f5f5;
-        }}
-
-        .header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 20px;
-            text-align: center;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-
-        .header h1 {{
-            font-size: 2em;
-            margin-bottom: 5px;
-        }}
-
-        .header p {{
-            opacity: 0.9;
-        }}
-
-        .container {{
-            max-width: 1200px;
-            margin: 40px auto;
-            padding: 0 20px;
-        }}
-
-        .course-info {{
-            background: white;
-            border-radius: 10px;
-            padding: 30px;
-            margin-bottom: 30px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-
-        .course-info h2 {{
-            color: #667eea;
-            margin-bottom: 15px;
-        }}
-
-        .info-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 20px;
-            margin-top: 20px;
-        }}
-
-        .info-item {{
-            padding: 15px;
-            background: #f8f9fa;
-            border-radius: 8px;
-            text-align: center;
-        }}
-
-        .info-item strong {{
-            display: block;
-            color: #667eea;
-            margin-bottom: 5px;
-        }}
-
-        .chapters-list {{
-            background: white;
-            border-radius: 10px;
-            padding: 30px;
-            margin-bottom: 30px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-
-        .chapters-list h2 {{
-            color: #667eea;
-            margin-bottom: 20px;
-        }}
-
-        .chapter-item {{
-            padding: 15px;
-            margin: 10px 0;
-            background: #f8f9fa;
-            border-left: 4px solid #667eea;
-            border-radius: 5px;
-        }}
-
-        .chapter-item strong {{
-            color: #333;
-        }}
-
-        .actions {{
-            display: flex;
-            gap: 20px;
-            justify-content: center;
-            flex-wrap: wrap;
-        }}
-
-        .btn {{
-            padding: 15px 40px;
-            border: none;
-            border-radius: 8px;
-            font-size: 1.1em;
-            font-weight: 600;
-            cursor: pointer;
-            text-decoration: none;
-            display: inline-block;
-            transition: all 0.3s;
-        }}
-
-        .btn-primary {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-        }}
-
-        .btn-primary:hover {{
-            transform: translateY(-2px);
-            box-shadow: 0 5px 20px rgba(102, 126, 234, 0.4);
-        }}
-
-        .btn-secondary {{
-            background: white;
-            color: #667eea;
-            border: 2px solid #667eea;
-        }}
-
-        .btn-secondary:hover {{
-            background: #667eea;
-            color: white;
-        }}
-
-        .footer {{
-            text-align: center;
-            padding: 20px;
-            color: #666;
-            font-size: 0.9em;
-        }}
-
-        @media (max-width: 768px) {{
-            .header h1 {{
-                font-size: 1.5em;
-            }}
-
-            .info-grid {{
-                grid-template-columns: 1fr;
-            }}
-
-            .actions {{
-                flex-direction: column;
-            }}
-
-            .btn {{
-                width: 100%;
-            }}
-        }}
-    </style>
+    <link rel="stylesheet" href="{viewer_assets['viewer.css']}">
 </head>
 <body>
     <div class="header">
@@ -796,44 +673,44 @@ class CourseAssembler:
 
     <div class="container">
         <div class="course-info">
-            <h2>📚 Course Overview</h2>
+            <h2>📚 {labels['course_overview']}</h2>
             <div class="info-grid">
                 <div class="info-item">
-                    <strong>Duration</strong>
+                    <strong>{labels['duration']}</strong>
                     {course.get('duration', 'N/A')}
                 </div>
                 <div class="info-item">
-                    <strong>Difficulty</strong>
+                    <strong>{labels['difficulty']}</strong>
                     {course.get('difficulty', 'N/A').capitalize()}
                 </div>
                 <div class="info-item">
-                    <strong>Chapters</strong>
+                    <strong>{labels['chapters']}</strong>
                     {len(chapters)}
                 </div>
                 <div class="info-item">
-                    <strong>Quiz Questions</strong>
+                    <strong>{labels['quiz_questions']}</strong>
                     {len(quiz_data.get('quiz', {}).get('questions', []))}
                 </div>
             </div>
         </div>
 
         <div class="chapters-list">
-            <h2>📖 Course Content</h2>
-            {"".join([f'<div class="chapter-item"><strong>Chapter {ch.get("number")}:</strong> {ch.get("title")} <span style="color: #667eea;">({ch.get("duration", "N/A")})</span></div>' for ch in chapters])}
+            <h2>📖 {labels['course_content']}</h2>
+            {"".join([f'<div class="chapter-item"><strong>{labels["chapter"]} {ch.get("number")}:</strong> {ch.get("title")} <span style="color: #667eea;">({ch.get("duration", "N/A")})</span></div>' for ch in chapters])}
         </div>
 
         <div class="actions">
             <a href="{slides_file}" class="btn btn-primary" target="_blank">
-                📊 Start Course (View Slides)
+                📊 {labels['start_course']}
             </a>
             <a href="{quiz_file}" class="btn btn-secondary" target="_blank">
-                ✏️ Take Quiz
+                ✏️ {labels['take_quiz']}
             </a>
         </div>
 
         <div class="footer">
-            <p>🤖 Generated with AI Course Creation Platform</p>
-            <p>Created: {datetime.now().strftime("%B %d, %Y")}</p>
+            <p>🤖 {labels['generated_with']}</p>
+            <p>{labels['created']}: {datetime.now().strftime("%B %d, %Y")}</p>
         </div>
     </div>
 </body>
@@ -841,38 +718,118 @@ class CourseAssembler:
 """
         return html
 
-    def export_to_zip(self, course_id: str) -> Optional[str]:
+    def export_entries(self, course_id: str) -> Optional[List[Tuple[str, str]]]:
         """
-        Exports course to ZIP file
+        Lists the files of a course export
 
         Args:
             course_id: Course identifier
 
         Returns:
-            Path to ZIP file or None
+            (file path, name in archive) pairs, or None if the course doesn't exist
         """
 
         course_dir = os.path.join(self.output_dir, course_id)
 
         if not os.path.exists(course_dir):
-            print(f"Course directory not found: {course_dir}")
+            logger.warning("Course directory not found", extra={"course_id": course_id})
+            return None
+
+        entries = []
+        for root, dirs, files in os.walk(course_dir):
+            dirs.sort()
+            for file in sorted(files):
+                file_path = os.path.join(root, file)
+                # Precompressed copies are a serving detail, not course content
+                if is_precompressed_sibling(file_path):
+                    continue
+                entries.append((file_path, os.path.relpath(file_path, self.output_dir)))
+
+        # Shared assets the pages link to, so the export works offline
+        for rel in self.assets.referenced_files(course_dir):
+            entries.append((os.path.join(self.assets.assets_dir, rel), f"{ASSETS_DIRNAME}/{rel}"))
+
+        return entries
+
+    def bulk_export_entries(
+        self,
+        courses: List[Dict],
+        export_filter: Optional[Dict] = None
+    ) -> Iterator[Tuple[Union[str, bytes], str]]:
+        """
+        Lists the files of a multi-course export, then its manifest
+
+        Courses are listed one at a time as the archive is written, and
+        shared assets are included once however many courses link them.
+
+        Args:
+            courses: Dicts with course_id and any fields to copy into the manifest
+            export_filter: Filter the courses were selected with, recorded in the manifest
+
+        Returns:
+            Iterator of (file path, name in archive) pairs, ending with
+            (manifest JSON bytes, "manifest.json")
+        """
+
+        exported = []
+        missing = []
+        shared_assets = set()
+
+        for course in courses:
+            entries = self.export_entries(course["course_id"])
+            if entries is None:
+                missing.append(course["course_id"])
+                continue
+
+            files = 0
+            size = 0
+            for file_path, arcname in entries:
+                if arcname.startswith(f"{ASSETS_DIRNAME}/"):
+                    if arcname in shared_assets:
+                        continue
+                    shared_assets.add(arcname)
+                else:
+                    files += 1
+                    size += os.path.getsize(file_path)
+                yield file_path, arcname
+
+            exported.append({**course, "directory": f"{course['course_id']}/", "files": files, "bytes": size})
+
+        manifest = {
+            "exported_at": datetime.now().isoformat(),
+            "filter": export_filter or {},
+            "total_courses": len(exported),
+            "courses": exported,
+            "missing": missing,
+            "shared_assets": len(shared_assets)
+        }
+        yield json.dumps(manifest, indent=2, ensure_ascii=False).encode("utf-8"), "manifest.json"
+
+    def export_to_zip(self, course_id: str) -> Optional[str]:
+        """
+        Exports course to ZIP file
+
+        Args:
+            course_id: Course identifier
+
+        Returns:
+            Path to ZIP file or None
+        """
+
+        entries = self.export_entries(course_id)
+        if entries is None:
             return None
 
-        zip_path = f"{course_dir}.zip"
+        zip_path = os.path.join(self.output_dir, f"{course_id}.zip")
 
         try:
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for root, dirs, files in os.walk(course_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        arcname = os.path.relpath(file_path, self.output_dir)
-                        zipf.write(file_path, arcname)
-
-            print(f"Course exported to: {zip_path}")
+            write_zip(entries, zip_path)
+
+            logger.info("Course exported", extra={"course_id": course_id, "zip_path": zip_path})
             return zip_path
 
         except Exception as e:
-            print(f"Error creating ZIP: {str(e)}")
+            logger.error("Error creating ZIP", extra={"course_id": course_id, "error": str(e)})
             return None
 
 
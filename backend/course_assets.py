@@ -0,0 +1,303 @@
+"""
+Course Assets
+Publishes the CSS and JavaScript shared by every course (slide themes,
+reveal.js, fonts, quiz and viewer) once, under content-hashed file names, so
+course HTML references them instead of inlining or pulling them from public
+CDNs. reveal.js and the fonts are vendored by fetch_vendor.py.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+from typing import Dict, List, Optional
+from decouple import config
+
+from file_serving import precompress, precompress_tree, is_precompressed_sibling
+from html_optimizer import minify_asset
+from slide_generator import (
+    THEMES, ASSETS_CDN_FALLBACK, REVEAL_CDN, GOOGLE_FONTS_CSS, REVEAL_STYLESHEETS, REVEAL_SCRIPTS,
+    render_theme_css, resolve_theme
+)
+
+logger = logging.getLogger(__name__)
+
+
+ASSETS_DIRNAME = "_assets"
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "course_static")
+VENDOR_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "vendor")
+
+# Served with this header: hashed names never change content
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_ASSET_REF = re.compile(r"\.\./" + ASSETS_DIRNAME + r"/([A-Za-z0-9._/-]+)")
+
+
+class MissingAssetsError(RuntimeError):
+    """reveal.js isn't vendored and the CDN fallback is off"""
+
+
+class CourseAssets:
+    """
+    Content-hashed asset bundle shared by all courses in an output directory
+    """
+
+    def __init__(self, output_dir: str = "generated_courses"):
+        """
+        Args:
+            output_dir: Directory holding the course directories
+        """
+        self.output_dir = output_dir
+        self.assets_dir = os.path.join(output_dir, ASSETS_DIRNAME)
+        # Course pages live one level below output_dir
+        self.url_prefix = f"../{ASSETS_DIRNAME}/"
+        self.reveal_dir = config('REVEAL_VENDOR_DIR', default=os.path.join(VENDOR_DIR, "reveal.js"))
+        self.fonts_dir = config('FONTS_VENDOR_DIR', default=os.path.join(VENDOR_DIR, "fonts"))
+        self.cdn_fallback = ASSETS_CDN_FALLBACK
+        self._fonts_warned = False
+
+        self.minify = config('HTML_OPTIMIZE_ENABLED', default=True, cast=bool)
+
+        self._urls: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, name: str, content: str) -> str:
+        """
+        Writes an asset under a content-hashed name, once
+
+        CSS and JavaScript are minified first (unless HTML_OPTIMIZE_ENABLED
+        is off), so the hash covers what is actually served.
+
+        Args:
+            name: Logical file name, e.g. "quiz.css"
+            content: File content
+
+        Returns:
+            URL of the asset relative to a course page
+        """
+
+        if self.minify:
+            content = minify_asset(name, content)
+        data = content.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        stem, ext = os.path.splitext(name)
+        filename = f"{stem}.{digest}{ext}"
+
+        path = os.path.join(self.assets_dir, filename)
+        if not os.path.exists(path):
+            os.makedirs(self.assets_dir, exist_ok=True)
+            # Write then rename, so a concurrent reader never sees a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.assets_dir, prefix=".tmp-")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            precompress(path)
+
+        return self.url_prefix + filename
+
+    def _static(self, name: str) -> str:
+        """Publishes a file from course_static/ and memoizes its URL"""
+        with self._lock:
+            url = self._urls.get(name)
+            if url is None:
+                with open(os.path.join(STATIC_DIR, name), "r", encoding="utf-8") as f:
+                    url = self.publish(name, f.read())
+                self._urls[name] = url
+            return url
+
+    def quiz_assets(self) -> Dict[str, str]:
+        """URLs of the quiz page assets"""
+        return {"quiz.css": self._static("quiz.css"), "quiz.js": self._static("quiz.js")}
+
+    def viewer_assets(self) -> Dict[str, str]:
+        """URLs of the course viewer assets"""
+        return {"viewer.css": self._static("viewer.css")}
+
+    def deck_assets(self, theme: str) -> Dict[str, List[str]]:
+        """
+        Stylesheets and scripts for a slide deck in the given theme
+
+        reveal.js and the fonts are served from the bundle. If they haven't
+        been vendored, the public CDNs are only used when ASSETS_CDN_FALLBACK
+        is on; otherwise a missing reveal.js raises MissingAssetsError and
+        missing fonts fall back to system fonts.
+
+        Returns:
+            Dict with "stylesheets" and "scripts" URL lists, in load order
+        """
+
+        theme = resolve_theme(theme)
+        reveal_base = self._reveal_base()
+        fonts_url = self._fonts_url()
+
+        with self._lock:
+            key = f"slides-{theme}.css"
+            theme_url = self._urls.get(key)
+            if theme_url is None:
+                theme_url = self.publish(key, render_theme_css(theme))
+                self._urls[key] = theme_url
+
+        return {
+            "stylesheets": (
+                [f"{reveal_base}/{path}" for path in REVEAL_STYLESHEETS]
+                + ([fonts_url] if fonts_url else [])
+                + [theme_url]
+            ),
+            "scripts": [f"{reveal_base}/{path}" for path in REVEAL_SCRIPTS]
+        }
+
+    def check(self):
+        """
+        Makes sure slide decks can be rendered, publishing the vendored trees
+
+        Runs at startup and before the model calls of the endpoints that
+        render decks, so a missing reveal.js fails fast instead of after the
+        LLM work is done. Cheap once the trees are published.
+
+        Raises:
+            MissingAssetsError: reveal.js isn't vendored and ASSETS_CDN_FALLBACK is off
+        """
+        self._reveal_base()
+        self._fonts_url()
+
+    def _reveal_base(self) -> str:
+        """Base URL of reveal.js: a hashed copy of the vendored tree, or the CDN if allowed"""
+
+        base = self._vendored_tree("reveal", self.reveal_dir, REVEAL_STYLESHEETS + REVEAL_SCRIPTS)
+        if base:
+            return base
+        if self.cdn_fallback:
+            return REVEAL_CDN
+        raise MissingAssetsError(
+            f"reveal.js is not vendored under {self.reveal_dir}: run fetch_vendor.py, "
+            "or set ASSETS_CDN_FALLBACK=true to load it from a public CDN"
+        )
+
+    def _fonts_url(self) -> Optional[str]:
+        """URL of the slide fonts stylesheet, or None to use system fonts"""
+
+        base = self._vendored_tree("fonts", self.fonts_dir, ["fonts.css"])
+        if base:
+            return f"{base}/fonts.css"
+        if self.cdn_fallback:
+            return GOOGLE_FONTS_CSS
+
+        if not self._fonts_warned:
+            self._fonts_warned = True
+            logger.warning("Slide fonts are not vendored, decks use system fonts", extra={"fonts_dir": self.fonts_dir})
+        return None
+
+    def _vendored_tree(self, name: str, source_dir: str, required: List[str]) -> Optional[str]:
+        """
+        Publishes a vendored directory as a hashed copy of the whole tree, so
+        relative references inside it (fonts, plugin chunks) keep working
+
+        Args:
+            name: Directory name prefix under the bundle ("reveal", "fonts")
+            source_dir: Vendored directory
+            required: Files that must exist for the tree to be usable
+
+        Returns:
+            Base URL of the published tree, or None if it isn't vendored
+        """
+
+        with self._lock:
+            base = self._urls.get(name)
+            if base is not None:
+                return base
+
+            if not all(os.path.isfile(os.path.join(source_dir, path)) for path in required):
+                return None
+
+            digest = hashlib.sha256()
+            tree = []
+            for root, dirs, names in os.walk(source_dir):
+                dirs.sort()
+                for filename in sorted(names):
+                    path = os.path.join(root, filename)
+                    rel = os.path.relpath(path, source_dir).replace(os.sep, "/")
+                    tree.append((path, rel))
+                    digest.update(rel.encode("utf-8"))
+                    with open(path, "rb") as f:
+                        digest.update(f.read())
+
+            dirname = f"{name}.{digest.hexdigest()[:12]}"
+            target = os.path.join(self.assets_dir, dirname)
+            if not os.path.exists(target):
+                os.makedirs(self.assets_dir, exist_ok=True)
+                staging = tempfile.mkdtemp(dir=self.assets_dir, prefix=".tmp-")
+                for path, rel in tree:
+                    os.makedirs(os.path.dirname(os.path.join(staging, rel)), exist_ok=True)
+                    shutil.copy2(path, os.path.join(staging, rel))
+                precompress_tree(staging)
+                try:
+                    os.rename(staging, target)
+                except OSError:
+                    # Another process published the same tree first
+                    shutil.rmtree(staging, ignore_errors=True)
+
+            base = self.url_prefix + dirname
+            self._urls[name] = base
+            return base
+
+    def referenced_files(self, course_dir: str) -> List[str]:
+        """
+        Lists the bundle files a course's HTML pages reference
+
+        Args:
+            course_dir: Course directory
+
+        Returns:
+            Paths relative to the assets directory
+        """
+
+        referenced = set()
+        for filename in os.listdir(course_dir):
+            if not filename.endswith(".html"):
+                continue
+            with open(os.path.join(course_dir, filename), "r", encoding="utf-8") as f:
+                referenced.update(_ASSET_REF.findall(f.read()))
+
+        # A vendored tree (reveal.js, fonts) is referenced by a few entry
+        # files but needs all of its files (fonts, plugin chunks)
+        expanded = set()
+        for rel in referenced:
+            top = rel.split("/", 1)[0]
+            top_path = os.path.join(self.assets_dir, top)
+            if "/" in rel and os.path.isdir(top_path):
+                for root, _, names in os.walk(top_path):
+                    for filename in names:
+                        path = os.path.join(root, filename)
+                        if is_precompressed_sibling(path):
+                            continue
+                        expanded.add(os.path.relpath(path, self.assets_dir).replace(os.sep, "/"))
+            elif os.path.isfile(os.path.join(self.assets_dir, rel)):
+                expanded.add(rel)
+
+        return sorted(expanded)
+
+    def resolve(self, path: str) -> Optional[str]:
+        """
+        Maps a request path under the assets directory to a file, refusing
+        anything that escapes it
+
+        Returns:
+            Absolute file path or None
+        """
+
+        root = os.path.realpath(self.assets_dir)
+        full_path = os.path.realpath(os.path.join(root, path))
+        if not full_path.startswith(root + os.sep) or not os.path.isfile(full_path):
+            return None
+        return full_path
+
+
+if __name__ == "__main__":
+    assets = CourseAssets()
+    print("Quiz:", assets.quiz_assets())
+    print("Viewer:", assets.viewer_assets())
+    for theme in THEMES:
+        print(f"Deck ({theme}):", assets.deck_assets(theme))
@@ -3,7 +3,7 @@ Course Database Models
 Separate models for Q2 Course Generation feature
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from datetime import datetime
 from models import Base, engine
 
@@ -44,6 +44,58 @@ class Course(Base):
         return f"<Course(id={self.id}, title='{self.title}', course_id='{self.course_id}')>"
 
 
+class BankQuestion(Base):
+    """
+    Model for the question bank: generated quiz questions kept for reuse,
+    so new quizzes and variants can be sampled instead of regenerated
+    """
+    __tablename__ = "question_bank"
+
+    id = Column(Integer, primary_key=True, index=True)
+    video_id = Column(Integer, ForeignKey('videos.id'), index=True)  # Source video the course is built from
+    course_id = Column(String, nullable=True)  # Course generation that produced the question
+    language = Column(String(10), default='en')
+
+    # Bank keys
+    chapter_number = Column(Integer, nullable=True)
+    question_type = Column(String(20))  # mcq, true_false, fill_blank
+    difficulty = Column(String(10))  # easy, medium, hard
+
+    # Question data (stored as JSON string, without the quiz-specific id)
+    question_data = Column(Text)
+    times_used = Column(Integer, default=0)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_question_bank_lookup", "video_id", "language", "difficulty", "question_type"),
+    )
+
+    def __repr__(self):
+        return f"<BankQuestion(id={self.id}, video_id={self.video_id}, type='{self.question_type}', difficulty='{self.difficulty}')>"
+
+
+class StructureCache(Base):
+    """
+    Model for cached course structures, keyed by transcript content and language,
+    so interactive generation can reuse a structure created earlier
+    """
+    __tablename__ = "course_structure_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cache_key = Column(String(64), unique=True, index=True)  # SHA-256 of language, duration and content
+    video_id = Column(Integer, ForeignKey('videos.id'), nullable=True, index=True)
+    language = Column(String(10), default='en')
+    source = Column(String(20), default='interactive')  # interactive, precompute
+    course_structure = Column(Text)  # JSON string of the course structure
+    hits = Column(Integer, default=0)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<StructureCache(id={self.id}, video_id={self.video_id}, language='{self.language}', source='{self.source}')>"
+
+
 def create_course_tables():
     """
     Create course-related tables
@@ -0,0 +1,151 @@
+function submitQuiz() {
+    const form = document.getElementById('quizForm');
+    const formData = new FormData(form);
+    const userAnswers = {};
+
+    // Collect answers
+    quizData.quiz.questions.forEach(q => {
+        const qId = q.id;
+
+        if (q.type === 'fill_blank') {
+            userAnswers[qId] = formData.get(`q${qId}`);
+        } else {
+            const selectedOption = formData.get(`q${qId}`);
+            userAnswers[qId] = selectedOption ? parseInt(selectedOption) : null;
+        }
+    });
+
+    // Calculate score
+    const result = calculateScore(userAnswers);
+    displayResults(result);
+}
+
+function calculateScore(userAnswers) {
+    const questions = quizData.quiz.questions;
+    let totalPoints = 0;
+    let earnedPoints = 0;
+    const results = [];
+
+    questions.forEach(q => {
+        const points = q.points || 1;
+        totalPoints += points;
+
+        const userAnswer = userAnswers[q.id];
+        let isCorrect = false;
+
+        if (q.type === 'fill_blank') {
+            const acceptable = q.acceptable_answers || [q.correct_answer];
+            if (userAnswer) {
+                isCorrect = acceptable.some(ans =>
+                    ans.toLowerCase().trim() === userAnswer.toLowerCase().trim()
+                );
+            }
+        } else {
+            isCorrect = userAnswer === q.correct_answer;
+        }
+
+        if (isCorrect) {
+            earnedPoints += points;
+        }
+
+        results.push({
+            questionId: q.id,
+            question: q.question,
+            correct: isCorrect,
+            userAnswer: userAnswer,
+            correctAnswer: q.correct_answer,
+            explanation: q.explanation || '',
+            options: q.options || []
+        });
+    });
+
+    const percentage = (earnedPoints / totalPoints * 100).toFixed(2);
+    const passed = percentage >= quizData.quiz.passing_score;
+
+    return {
+        totalQuestions: questions.length,
+        totalPoints,
+        earnedPoints,
+        percentage,
+        passed,
+        results
+    };
+}
+
+function displayResults(result) {
+    const resultsDiv = document.getElementById('results');
+    const quizContent = document.getElementById('quizContent');
+
+    quizContent.style.display = 'none';
+    document.querySelector('.quiz-actions').style.display = 'none';
+
+    const statusClass = result.passed ? 'passed' : 'failed';
+    const statusIcon = result.passed ? '🎉' : '😔';
+    const statusText = result.passed ? labels.passed : labels.not_passed;
+
+    let resultsHTML = `
+        <div class="score-display ${statusClass}">
+            <div style="font-size: 4em; margin-bottom: 10px;">${statusIcon}</div>
+            <h2>${result.percentage}%</h2>
+            <p style="font-size: 1.2em;">${statusText}</p>
+            <p style="margin-top: 15px; opacity: 0.9;">
+                ${result.earnedPoints} / ${result.totalPoints} ${labels.points}
+            </p>
+        </div>
+
+        <h3 style="margin-bottom: 20px;">${labels.detailed_results}</h3>
+    `;
+
+    result.results.forEach((r, index) => {
+        const resultClass = r.correct ? 'result-correct' : 'result-incorrect';
+        const resultIcon = r.correct ? '✅' : '❌';
+
+        let answerDisplay = '';
+        if (r.options && r.options.length > 0) {
+            answerDisplay = `
+                <p><strong>${labels.your_answer}:</strong> ${r.options[r.userAnswer] || labels.not_answered}</p>
+                <p><strong>${labels.correct_answer}:</strong> ${r.options[r.correctAnswer]}</p>
+            `;
+        } else {
+            answerDisplay = `
+                <p><strong>${labels.your_answer}:</strong> ${r.userAnswer || labels.not_answered}</p>
+                <p><strong>${labels.correct_answer}:</strong> ${r.correctAnswer}</p>
+            `;
+        }
+
+        resultsHTML += `
+            <div class="result-item ${resultClass}">
+                <div style="display: flex; align-items: start; gap: 10px;">
+                    <span style="font-size: 1.5em;">${resultIcon}</span>
+                    <div style="flex: 1;">
+                        <p style="font-weight: bold; margin-bottom: 10px;">
+                            ${labels.question} ${index + 1}: ${r.question}
+                        </p>
+                        ${answerDisplay}
+                        ${r.explanation ? `
+                            <div class="explanation">
+                                <strong>💡 ${labels.explanation}:</strong> ${r.explanation}
+                            </div>
+                        ` : ''}
+                    </div>
+                </div>
+            </div>
+        `;
+    });
+
+    resultsHTML += `
+        <div style="text-align: center; margin-top: 30px;">
+            <button class="btn btn-primary" onclick="location.reload()">${labels.take_again}</button>
+            <button class="btn btn-secondary" onclick="window.close()">${labels.close}</button>
+        </div>
+    `;
+
+    resultsDiv.innerHTML = resultsHTML;
+    resultsDiv.classList.add('show');
+}
+
+function resetQuiz() {
+    if (confirm(labels.reset_confirm)) {
+        document.getElementById('quizForm').reset();
+    }
+}
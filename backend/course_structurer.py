@@ -3,11 +3,22 @@ Course Structure Generator
 Analyzes video transcripts or documents and generates structured course outlines
 """
 
-from openai import OpenAI
+import hashlib
 import json
+import logging
+import threading
+from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from decouple import config
 
+from models import SessionLocal
+from course_models import StructureCache
+from openai_client import get_openai_client
+from metrics import timed_stage
+
+logger = logging.getLogger(__name__)
+
+
 class CourseStructurer:
     """
     Generates structured course outlines from unstructured content
@@ -15,31 +26,108 @@ class CourseStructurer:
 
     def __init__(self):
         self.model = "gpt-4o"
-        self.client = OpenAI(api_key=config('OPENAI_API_KEY'))
-
+        self.cache_enabled = config('STRUCTURE_CACHE_ENABLED', default=True, cast=bool)
+        # Cached structures older than this are generated again
+        self.cache_ttl_hours = config('STRUCTURE_CACHE_TTL_HOURS', default=168, cast=float)
+        # Oldest structures are evicted beyond this many
+        self.cache_max_entries = config('STRUCTURE_CACHE_MAX_ENTRIES', default=1000, cast=int)
+
+        # Structure requests in flight, so identical requests share one LLM call
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self._interactive_calls = 0
+
+    @property
+    def client(self):
+        """OpenAI client, created on first use (importing the SDK is slow)"""
+        return get_openai_client(caller="course_structurer")
+
+    @property
+    def interactive_calls(self) -> int:
+        """Number of interactive (non-precompute) structuring calls in flight"""
+        return self._interactive_calls
+
+    @timed_stage("structure")
     def analyze_content(
         self,
         content: str,
         source_type: str = "transcript",
         language: str = "en",
-        duration_minutes: Optional[int] = None
+        duration_minutes: Optional[int] = None,
+        video_id: Optional[int] = None,
+        use_cache: bool = True,
+        cache_source: str = "interactive"
     ) -> Dict:
         """
         Analyzes content and generates a structured course outline
 
+        Structures are cached by content, language and duration, and concurrent
+        requests for the same structure are coalesced onto a single LLM call.
+        With use_cache=False (an explicit regenerate) a new structure is
+        generated and replaces the cached one.
+
         Args:
             content: Video transcript or document text
             source_type: "transcript", "document", or "text"
             language: Language code (en, ja, etc.)
             duration_minutes: Optional duration for time estimates
+            video_id: Source video, recorded with the cached structure
+            use_cache: Reuse a cached structure if there is one (it is stored either way)
+            cache_source: "interactive" or "precompute"
 
         Returns:
             Dict with course structure including chapters, objectives, etc.
         """
 
+        cache_key = self.structure_cache_key(content, language, duration_minutes)
+        if not use_cache:
+            return self._generate_structure(content, language, duration_minutes, cache_key, video_id, cache_source)
+
+        cached = self.get_cached_structure(cache_key)
+        if cached:
+            return cached
+
+        with self._inflight_lock:
+            done = self._inflight.get(cache_key)
+            leader = done is None
+            if leader:
+                done = threading.Event()
+                self._inflight[cache_key] = done
+
+        if not leader:
+            # Someone else is already structuring this content; use their result
+            done.wait()
+            cached = self.get_cached_structure(cache_key)
+            if cached:
+                return cached
+            return self._generate_structure(content, language, duration_minutes, cache_key, video_id, cache_source)
+
+        try:
+            return self._generate_structure(content, language, duration_minutes, cache_key, video_id, cache_source)
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(cache_key, None)
+            done.set()
+
+    def _generate_structure(
+        self,
+        content: str,
+        language: str,
+        duration_minutes: Optional[int],
+        cache_key: str,
+        video_id: Optional[int],
+        cache_source: str
+    ) -> Dict:
+        """Calls the LLM for a course outline and caches the result"""
+
         # Generate course outline
         outline_prompt = self._create_outline_prompt(content, language, duration_minutes)
 
+        interactive = cache_source != "precompute"
+        if interactive:
+            with self._inflight_lock:
+                self._interactive_calls += 1
+
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
@@ -62,11 +150,103 @@ class CourseStructurer:
             # Enhance with additional processing
             course_data = self._enhance_course_structure(course_data, content)
 
+            self.store_structure(cache_key, course_data, language, video_id, cache_source)
+
             return course_data
 
         except Exception as e:
-            print(f"Error analyzing content: {str(e)}")
+            logger.error("Error analyzing content", extra={"error": str(e)})
             raise
+        finally:
+            if interactive:
+                with self._inflight_lock:
+                    self._interactive_calls -= 1
+
+    def structure_cache_key(self, content: str, language: str, duration_minutes: Optional[float]) -> str:
+        """Cache key for a structure: everything that goes into the outline prompt"""
+        key_source = f"{self.model}|{language}|{duration_minutes}|{content}"
+        return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+    def get_cached_structure(self, cache_key: str, count_hit: bool = True) -> Optional[Dict]:
+        """Returns a cached course structure or None"""
+
+        if not self.cache_enabled:
+            return None
+
+        db = SessionLocal()
+        try:
+            entry = db.query(StructureCache).filter(
+                StructureCache.cache_key == cache_key,
+                StructureCache.created_at >= self._cache_cutoff()
+            ).first()
+            if not entry:
+                return None
+
+            if count_hit:
+                entry.hits = (entry.hits or 0) + 1
+                db.commit()
+            return json.loads(entry.course_structure)
+
+        except Exception as e:
+            logger.error("Error reading structure cache", extra={"error": str(e)})
+            return None
+        finally:
+            db.close()
+
+    def _cache_cutoff(self) -> datetime:
+        """Creation time before which cached structures have expired"""
+        return datetime.utcnow() - timedelta(hours=self.cache_ttl_hours)
+
+    def store_structure(
+        self,
+        cache_key: str,
+        course_data: Dict,
+        language: str,
+        video_id: Optional[int] = None,
+        source: str = "interactive"
+    ):
+        """Saves a course structure to the cache, replacing any older entry and evicting expired ones"""
+
+        if not self.cache_enabled:
+            return
+
+        db = SessionLocal()
+        try:
+            entry = db.query(StructureCache).filter(StructureCache.cache_key == cache_key).first()
+            if not entry:
+                entry = StructureCache(cache_key=cache_key, hits=0)
+                db.add(entry)
+
+            entry.video_id = video_id
+            entry.language = language
+            entry.source = source
+            entry.course_structure = json.dumps(course_data, ensure_ascii=False)
+            entry.created_at = datetime.utcnow()
+            db.commit()
+
+            self._evict(db)
+
+        except Exception as e:
+            db.rollback()
+            logger.error("Error writing structure cache", extra={"error": str(e)})
+        finally:
+            db.close()
+
+    def _evict(self, db):
+        """Deletes expired structures and the oldest ones beyond cache_max_entries"""
+
+        db.query(StructureCache).filter(
+            StructureCache.created_at < self._cache_cutoff()
+        ).delete(synchronize_session=False)
+
+        excess = db.query(StructureCache.id).order_by(
+            StructureCache.created_at.desc()
+        ).offset(max(0, self.cache_max_entries)).all()
+        if excess:
+            db.query(StructureCache).filter(
+                StructureCache.id.in_([row.id for row in excess])
+            ).delete(synchronize_session=False)
+        db.commit()
 
     def _create_outline_prompt(
         self,
@@ -227,7 +407,7 @@ Return as JSON:
             return result.get("chapters", [])
 
         except Exception as e:
-            print(f"Error generating chapter outline: {str(e)}")
+            logger.error("Error generating chapter outline", extra={"error": str(e)})
             return []
 
     def create_learning_objectives(self, chapter_content: str, difficulty: str = "medium") -> List[str]:
@@ -284,7 +464,7 @@ Return as JSON:
             return result.get("objectives", [])
 
         except Exception as e:
-            print(f"Error creating learning objectives: {str(e)}")
+            logger.error("Error creating learning objectives", extra={"error": str(e)})
             return []
 
     def extract_key_points(self, content: str, max_points: int = 5) -> List[str]:
@@ -331,7 +511,7 @@ Return as JSON:
             return result.get("key_points", [])
 
         except Exception as e:
-            print(f"Error extracting key points: {str(e)}")
+            logger.error("Error extracting key points", extra={"error": str(e)})
             return []
 
     def map_to_bloom_taxonomy(self, objective: str) -> str:
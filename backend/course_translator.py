@@ -0,0 +1,256 @@
+"""
+Course Translator
+Translates an existing course structure and quiz into other languages,
+so every language variant shares the same chapters and questions
+"""
+
+import copy
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+from decouple import config
+
+from openai_client import get_openai_client
+from metrics import timed_stage
+
+logger = logging.getLogger(__name__)
+
+
+# Text fields that get translated; everything else (numbers, difficulty keys,
+# answer indexes, slide estimates) is copied as-is to keep variants aligned
+COURSE_TEXT_FIELDS = ["title", "description", "duration", "prerequisites", "learning_outcomes"]
+CHAPTER_TEXT_FIELDS = ["title", "duration", "learning_objectives", "key_points", "content", "activities"]
+QUESTION_TEXT_FIELDS = ["question", "options", "explanation", "acceptable_answers"]
+
+
+class TranslationError(Exception):
+    """A translation call failed or left texts untranslated"""
+
+
+class CourseTranslator:
+    """
+    Translates course structures and quizzes while preserving their alignment
+    """
+
+    def __init__(self):
+        self.model = "gpt-4o"
+        self.max_workers = config('TRANSLATION_MAX_WORKERS', default=4, cast=int)
+        self.batch_chars = config('TRANSLATION_BATCH_CHARS', default=12000, cast=int)
+
+    @property
+    def client(self):
+        """OpenAI client, created on first use (importing the SDK is slow)"""
+        return get_openai_client(caller="course_translator")
+
+    @timed_stage("translate")
+    def translate_course(
+        self,
+        course_data: Dict,
+        quiz_data: Dict,
+        target_languages: List[str],
+        source_language: str = "en"
+    ) -> Tuple[Dict[str, tuple], Dict[str, str]]:
+        """
+        Translates a course and its quiz into several languages concurrently
+
+        A language is only returned if every text was translated; otherwise
+        it is reported as failed rather than mixing in source-language text.
+
+        Args:
+            course_data: Course structure from CourseStructurer
+            quiz_data: Quiz from QuizGenerator
+            target_languages: Language codes to translate into
+            source_language: Language of course_data and quiz_data
+
+        Returns:
+            (variants, failed): language code to (course_data, quiz_data), and
+            language code to the error for languages that couldn't be translated
+        """
+
+        variants, failed = {}, {}
+        with ThreadPoolExecutor(max_workers=max(1, len(target_languages) * 2)) as executor:
+            futures = {}
+            for language in target_languages:
+                if language == source_language:
+                    continue
+                futures[language] = (
+                    executor.submit(self.translate_structure, course_data, language, source_language),
+                    executor.submit(self.translate_quiz, quiz_data, language, source_language)
+                )
+
+            for language, (structure_future, quiz_future) in futures.items():
+                try:
+                    variants[language] = (structure_future.result(), quiz_future.result())
+                except TranslationError as e:
+                    logger.error("Translation failed", extra={"target_language": language, "error": str(e)})
+                    failed[language] = str(e)
+
+        return variants, failed
+
+    def translate_structure(self, course_data: Dict, target_language: str, source_language: str = "en") -> Dict:
+        """Translates the text fields of a course structure (raises TranslationError)"""
+
+        translated = copy.deepcopy(course_data)
+        course = translated.get("course", {})
+
+        slots = self._collect(course, COURSE_TEXT_FIELDS)
+        for chapter in course.get("chapters", []):
+            slots.extend(self._collect(chapter, CHAPTER_TEXT_FIELDS))
+
+        self._translate_slots(slots, target_language, source_language)
+        return translated
+
+    def translate_quiz(self, quiz_data: Dict, target_language: str, source_language: str = "en") -> Dict:
+        """Translates the text fields of a quiz (raises TranslationError)"""
+
+        translated = copy.deepcopy(quiz_data)
+        quiz = translated.get("quiz", {})
+
+        slots = self._collect(quiz, ["title"])
+        for question in quiz.get("questions", []):
+            slots.extend(self._collect(question, QUESTION_TEXT_FIELDS))
+            # Fill-in-the-blank answers are text; other answers are indexes
+            if question.get("type") == "fill_blank":
+                slots.extend(self._collect(question, ["correct_answer"]))
+
+        self._translate_slots(slots, target_language, source_language)
+        return translated
+
+    def _collect(self, container: Dict, fields: List[str]) -> List[tuple]:
+        """
+        Collects (container, key, text) slots for the given fields,
+        where container is the dict or list the text lives in
+        """
+
+        slots = []
+        for field in fields:
+            value = container.get(field)
+            if isinstance(value, str) and value.strip():
+                slots.append((container, field, value))
+            elif isinstance(value, list):
+                for i, item in enumerate(value):
+                    if isinstance(item, str) and item.strip():
+                        slots.append((value, i, item))
+        return slots
+
+    def _translate_slots(self, slots: List[tuple], target_language: str, source_language: str):
+        """Translates slots in size-bounded batches and writes the results back in place"""
+
+        batches = []
+        current, size = [], 0
+        for slot in slots:
+            if current and size + len(slot[2]) > self.batch_chars:
+                batches.append(current)
+                current, size = [], 0
+            current.append(slot)
+            size += len(slot[2])
+        if current:
+            batches.append(current)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = executor.map(
+                lambda batch: self._translate_texts([text for _, _, text in batch], target_language, source_language),
+                batches
+            )
+            for batch, translations in zip(batches, results):
+                for (container, key, _), text in zip(batch, translations):
+                    container[key] = text
+
+    def _translate_texts(self, texts: List[str], target_language: str, source_language: str) -> List[str]:
+        """
+        Translates a list of texts in one call
+
+        Texts are sent with their index and matched back by index; texts
+        missing from the response are sent again once.
+
+        Raises:
+            TranslationError: The call failed or texts are still missing
+        """
+
+        translated = self._request_translations(texts, target_language, source_language)
+
+        missing = [i for i in range(len(texts)) if i not in translated]
+        if missing:
+            logger.warning("Translation missed items, retrying", extra={
+                "target_language": target_language, "missing": len(missing), "items": len(texts)
+            })
+            retried = self._request_translations([texts[i] for i in missing], target_language, source_language)
+            for position, i in enumerate(missing):
+                if position in retried:
+                    translated[i] = retried[position]
+
+            still_missing = sum(1 for i in range(len(texts)) if i not in translated)
+            if still_missing:
+                raise TranslationError(f"{still_missing} of {len(texts)} texts were not translated to {target_language}")
+
+        return [translated[i] for i in range(len(texts))]
+
+    def _request_translations(self, texts: List[str], target_language: str, source_language: str) -> Dict[int, str]:
+        """One translation call: returns the translated texts by index"""
+
+        lang_names = {
+            "en": "English",
+            "ja": "Japanese"
+        }
+        target_name = lang_names.get(target_language, target_language)
+        source_name = lang_names.get(source_language, source_language)
+
+        items = [{"i": i, "text": text} for i, text in enumerate(texts)]
+        prompt = f"""
+Translate the "text" of every item from {source_name} to {target_name}.
+This is educational course material: keep the meaning, tone and formatting,
+keep technical terms accurate, and keep any _____ blanks as they are.
+
+Items:
+{json.dumps({"items": items}, ensure_ascii=False)}
+
+Return as JSON with the same "i" values:
+{{
+  "items": [{{"i": 0, "text": "translated text"}}]
+}}
+"""
+
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": "You are a professional translator of educational content."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.2,
+                response_format={"type": "json_object"}
+            )
+
+            result = json.loads(response.choices[0].message.content)
+            return {
+                item.get("i"): item.get("text")
+                for item in result.get("items", [])
+                if isinstance(item, dict) and isinstance(item.get("text"), str)
+            }
+
+        except Exception as e:
+            raise TranslationError(f"Translation to {target_name} failed: {e}") from e
+
+
+# Helper function
+def translate_course(
+    course_data: Dict,
+    quiz_data: Dict,
+    target_languages: List[str],
+    source_language: str = "en"
+) -> Tuple[Dict[str, tuple], Dict[str, str]]:
+    """
+    Convenience function to translate a course into several languages
+
+    Args:
+        course_data: Course structure
+        quiz_data: Quiz data
+        target_languages: Language codes to translate into
+        source_language: Language of the inputs
+
+    Returns:
+        (variants, failed), see CourseTranslator.translate_course
+    """
+    translator = CourseTranslator()
+    return translator.translate_course(course_data, quiz_data, target_languages, source_language)
@@ -0,0 +1,208 @@
+"""
+Export Cache
+Keeps one ZIP archive per course version, so exports are only rebuilt
+when course files change, and concurrent exports share a single build
+"""
+
+import glob
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from zip_stream import stream_zip, CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class _Build:
+    """An archive being written to the cache, which readers tail as it grows"""
+
+    def __init__(self, tmp_path: str, path: str):
+        self.tmp_path = tmp_path
+        self.path = path
+        self.written = 0
+        self.done = False
+        self.error: Optional[str] = None
+        self.condition = threading.Condition()
+
+
+class ExportCache:
+    """
+    Versioned cache of course export archives
+    """
+
+    def __init__(self, course_assembler):
+        """
+        Args:
+            course_assembler: CourseAssembler that lists the export files
+        """
+        self.assembler = course_assembler
+        self.exports_dir = os.path.join(course_assembler.output_dir, "_exports")
+
+        # Archive path -> build in progress
+        self._builds: Dict[str, _Build] = {}
+        self._builds_lock = threading.Lock()
+
+    def version(self, entries: List[Tuple[str, str]]) -> str:
+        """
+        Content version of an export: a hash of its manifest
+
+        The manifest is every archive name with its file size and
+        modification time, so any added, removed or rewritten file
+        (including shared assets) produces a new version.
+        """
+
+        digest = hashlib.sha256()
+        for file_path, arcname in entries:
+            stat = os.stat(file_path)
+            digest.update(f"{arcname}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def archive_path(self, course_id: str, version: str) -> str:
+        return os.path.join(self.exports_dir, f"{course_id}.{version}.zip")
+
+    def open(
+        self,
+        course_id: str,
+        on_built: Optional[Callable[[str], None]] = None
+    ) -> Optional[Tuple[str, object]]:
+        """
+        Opens the export of a course
+
+        Returns the cached archive when it matches the current course files.
+        Otherwise the archive is built once, in a background thread that
+        writes it to the cache, and every concurrent caller gets a stream
+        that tails that file as it grows. No caller's download speed holds
+        back the build or the other callers.
+
+        Args:
+            course_id: Course identifier
+            on_built: Called with the archive path once a new version is cached
+
+        Returns:
+            ("file", archive path) or ("stream", iterator of ZIP bytes),
+            or None if the course doesn't exist
+        """
+
+        entries = self.assembler.export_entries(course_id)
+        if entries is None:
+            return None
+
+        path = self.archive_path(course_id, self.version(entries))
+        if os.path.exists(path):
+            return "file", path
+
+        with self._builds_lock:
+            build = self._builds.get(path)
+            if build is None:
+                # A build may have finished since the check above
+                if os.path.exists(path):
+                    return "file", path
+                os.makedirs(self.exports_dir, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=self.exports_dir, prefix=".tmp-")
+                os.close(fd)
+                build = self._builds[path] = _Build(tmp_path, path)
+                threading.Thread(
+                    target=self._run_build,
+                    args=(course_id, entries, build, on_built),
+                    name=f"export-{course_id}",
+                    daemon=True
+                ).start()
+
+        return "stream", self._tail(build)
+
+    def remove(self, course_id: str) -> int:
+        """
+        Deletes every cached archive of a course
+
+        Returns:
+            Bytes freed
+        """
+
+        freed = 0
+        for path in self._archives(course_id):
+            freed += os.path.getsize(path)
+            os.remove(path)
+        return freed
+
+    def _archives(self, course_id: str) -> List[str]:
+        return glob.glob(os.path.join(glob.escape(self.exports_dir), f"{glob.escape(course_id)}.*.zip"))
+
+    def _run_build(
+        self,
+        course_id: str,
+        entries: List[Tuple[str, str]],
+        build: _Build,
+        on_built: Optional[Callable[[str], None]]
+    ):
+        """Writes the archive to the build's temporary file, then publishes it"""
+
+        try:
+            with open(build.tmp_path, "wb") as f:
+                for chunk in stream_zip(entries):
+                    f.write(chunk)
+                    f.flush()
+                    with build.condition:
+                        build.written += len(chunk)
+                        build.condition.notify_all()
+                os.fsync(f.fileno())
+
+            # Readers hold the file open, so renaming under them is safe
+            with build.condition:
+                os.replace(build.tmp_path, build.path)
+                build.done = True
+                build.condition.notify_all()
+
+            # Older versions are never served again
+            for stale in self._archives(course_id):
+                if stale != build.path:
+                    os.remove(stale)
+
+            if on_built:
+                on_built(build.path)
+
+        except Exception as e:
+            logger.error("Export build failed", extra={"course_id": course_id, "error": str(e)})
+            with build.condition:
+                build.error = str(e)
+                build.condition.notify_all()
+            if os.path.exists(build.tmp_path):
+                os.remove(build.tmp_path)
+
+        finally:
+            with self._builds_lock:
+                self._builds.pop(build.path, None)
+
+    def _tail(self, build: _Build) -> Iterator[bytes]:
+        """Yields an archive as its build writes it, until the build is done"""
+
+        with build.condition:
+            if build.error is not None:
+                raise RuntimeError(f"Export build failed: {build.error}")
+            f = open(build.path if build.done else build.tmp_path, "rb")
+
+        with f:
+            offset = 0
+            while True:
+                with build.condition:
+                    while offset >= build.written and not build.done and build.error is None:
+                        build.condition.wait()
+                    if build.error is not None:
+                        # The archive is incomplete: abort the response
+                        raise RuntimeError(f"Export build failed: {build.error}")
+                    available = build.written - offset
+                    finished = build.done
+
+                while available > 0:
+                    chunk = f.read(min(available, CHUNK_SIZE))
+                    if not chunk:
+                        break
+                    offset += len(chunk)
+                    available -= len(chunk)
+                    yield chunk
+
+                if finished and offset >= build.written:
+                    return
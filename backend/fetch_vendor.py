@@ -0,0 +1,188 @@
+"""
+Vendor Fetcher
+Downloads the pinned reveal.js release and the slide fonts into vendor/, so
+course decks are served from the course asset bundle instead of public CDNs.
+Run it once per deployment with access to the npm registry (or a mirror set
+with NPM_REGISTRY); start.sh does. Tarballs are checked against the
+registry's integrity hashes before anything is installed.
+
+Usage (from backend/):
+    python fetch_vendor.py [--force]
+"""
+
+import argparse
+import base64
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import urllib.request
+from typing import Dict, List
+from decouple import config
+
+
+NPM_REGISTRY = config('NPM_REGISTRY', default='https://registry.npmjs.org').rstrip('/')
+VENDOR_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "vendor")
+
+REVEAL_PACKAGE = ("reveal.js", "4.5.0")
+# Directories of the reveal.js package that decks load from (see slide_generator.REVEAL_SCRIPTS)
+REVEAL_DIRS = ["dist/", "plugin/"]
+
+# Font package -> (version, family, weights), latin subset only
+FONT_PACKAGES = {
+    "@fontsource/inter": ("4.5.15", "Inter", [400, 600, 700]),
+    "@fontsource/poppins": ("4.5.10", "Poppins", [600, 700])
+}
+
+
+def _fetch(url: str) -> bytes:
+    with urllib.request.urlopen(url, timeout=60) as response:
+        return response.read()
+
+
+def download_package(name: str, version: str) -> tarfile.TarFile:
+    """
+    Downloads an npm package tarball and verifies its integrity hash
+
+    Args:
+        name: Package name, optionally scoped (@scope/name)
+        version: Exact version
+
+    Returns:
+        The opened tarball
+    """
+
+    metadata = json.loads(_fetch(f"{NPM_REGISTRY}/{name}/{version}"))
+    dist = metadata["dist"]
+    data = _fetch(dist["tarball"])
+
+    algorithm, _, expected = dist.get("integrity", "").partition("-")
+    if algorithm not in ("sha512", "sha384", "sha256"):
+        raise RuntimeError(f"{name}@{version}: registry returned no usable integrity hash")
+    actual = base64.b64encode(hashlib.new(algorithm, data).digest()).decode("ascii")
+    if actual != expected:
+        raise RuntimeError(f"{name}@{version}: tarball does not match its integrity hash")
+
+    return tarfile.open(fileobj=io.BytesIO(data), mode="r:gz")
+
+
+def _extract(tarball: tarfile.TarFile, members: Dict[str, str], target: str):
+    """Writes package files (path inside package/ -> path under target)"""
+
+    for member in tarball.getmembers():
+        rel = member.name.split("/", 1)[1] if "/" in member.name else ""
+        if rel not in members or not member.isfile():
+            continue
+        dest = os.path.normpath(os.path.join(target, members[rel]))
+        if not dest.startswith(target + os.sep):
+            continue
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        with tarball.extractfile(member) as src, open(dest, "wb") as f:
+            shutil.copyfileobj(src, f)
+
+
+def _install(name: str, version: str, build) -> bool:
+    """
+    Builds vendor/<name> in a temporary directory and swaps it in
+
+    Skipped when the installed copy already has this version.
+
+    Returns:
+        True if something was installed
+    """
+
+    target = os.path.join(VENDOR_DIR, name)
+    version_file = os.path.join(target, "VERSION")
+    if os.path.exists(version_file):
+        with open(version_file, "r", encoding="utf-8") as f:
+            if f.read().strip() == version:
+                return False
+
+    os.makedirs(VENDOR_DIR, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=VENDOR_DIR, prefix=".tmp-")
+    try:
+        build(staging)
+        with open(os.path.join(staging, "VERSION"), "w", encoding="utf-8") as f:
+            f.write(version + "\n")
+        if os.path.exists(target):
+            shutil.rmtree(target)
+        os.rename(staging, target)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return True
+
+
+def fetch_reveal() -> bool:
+    """Installs reveal.js (dist/ and plugin/) into vendor/reveal.js"""
+
+    name, version = REVEAL_PACKAGE
+
+    def build(staging: str):
+        tarball = download_package(name, version)
+        members = {}
+        for member in tarball.getmembers():
+            rel = member.name.split("/", 1)[1] if "/" in member.name else ""
+            if any(rel.startswith(prefix) for prefix in REVEAL_DIRS):
+                members[rel] = rel
+        _extract(tarball, members, staging)
+
+    return _install("reveal.js", version, build)
+
+
+def fetch_fonts() -> bool:
+    """Installs the slide fonts and a fonts.css declaring them into vendor/fonts"""
+
+    version = "+".join(f"{name}@{spec[0]}" for name, spec in sorted(FONT_PACKAGES.items()))
+
+    def build(staging: str):
+        rules: List[str] = []
+        for name, (package_version, family, weights) in FONT_PACKAGES.items():
+            slug = name.split("/")[-1]
+            files = {f"files/{slug}-latin-{weight}-normal.woff2": f"files/{slug}-latin-{weight}-normal.woff2" for weight in weights}
+            _extract(download_package(name, package_version), files, staging)
+
+            for weight in weights:
+                rules.append(
+                    "@font-face{"
+                    f"font-family:'{family}';font-style:normal;font-weight:{weight};font-display:swap;"
+                    f"src:url(files/{slug}-latin-{weight}-normal.woff2) format('woff2')"
+                    "}"
+                )
+
+        missing = [rel for rel in _font_files() if not os.path.isfile(os.path.join(staging, rel))]
+        if missing:
+            raise RuntimeError(f"Font packages are missing {', '.join(missing)}")
+        with open(os.path.join(staging, "fonts.css"), "w", encoding="utf-8") as f:
+            f.write("\n".join(rules) + "\n")
+
+    return _install("fonts", version, build)
+
+
+def _font_files() -> List[str]:
+    return [
+        f"files/{name.split('/')[-1]}-latin-{weight}-normal.woff2"
+        for name, (_, _, weights) in FONT_PACKAGES.items()
+        for weight in weights
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Download reveal.js and the slide fonts into vendor/")
+    parser.add_argument("--force", action="store_true", help="Download again even if the pinned versions are installed")
+    args = parser.parse_args()
+
+    if args.force:
+        for name in ("reveal.js", "fonts"):
+            shutil.rmtree(os.path.join(VENDOR_DIR, name), ignore_errors=True)
+
+    try:
+        for label, fetch in (("reveal.js", fetch_reveal), ("fonts", fetch_fonts)):
+            print(f"{label}: {'installed' if fetch() else 'up to date'}")
+    except Exception as e:
+        print(f"Failed to fetch vendored assets: {e}", file=sys.stderr)
+        sys.exit(1)
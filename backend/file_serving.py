@@ -0,0 +1,231 @@
+"""
+File Serving
+Precompressed, conditional and range-aware responses for generated files
+(course pages, shared assets, audio summaries)
+"""
+
+import gzip
+import os
+from typing import Dict, Iterator, Optional, Tuple
+from decouple import config
+from fastapi import Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip siblings are still written and served
+    brotli = None
+
+
+# Text formats worth precompressing; media is already compressed
+COMPRESSIBLE_EXTENSIONS = {".html", ".css", ".js", ".json", ".svg", ".txt", ".xml"}
+PRECOMPRESSED_SUFFIXES = (".br", ".gz")
+
+PRECOMPRESS_MIN_BYTES = config('PRECOMPRESS_MIN_BYTES', default=1024, cast=int)
+
+# Course pages keep their URLs across rerenders: cache, but revalidate (cheap 304)
+COURSE_FILE_CACHE_CONTROL = config('COURSE_FILE_CACHE_CONTROL', default='public, no-cache')
+AUDIO_CACHE_CONTROL = config('AUDIO_CACHE_CONTROL', default='public, max-age=86400')
+
+CHUNK_SIZE = 64 * 1024
+
+
+def is_precompressed_sibling(path: str) -> bool:
+    """True for a .br/.gz file written next to the file it encodes"""
+    base, ext = os.path.splitext(path)
+    return ext in PRECOMPRESSED_SUFFIXES and os.path.exists(base)
+
+
+def precompress(path: str):
+    """
+    Writes .gz (and .br when brotli is installed) siblings of a text file
+
+    Small and non-text files are skipped. Stale siblings of a file that is
+    too small now are removed, so they can't be served for the new content.
+    """
+
+    if os.path.splitext(path)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+        return
+
+    with open(path, "rb") as f:
+        data = f.read()
+
+    encoders = [(".gz", lambda raw: gzip.compress(raw, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        encoders.append((".br", lambda raw: brotli.compress(raw, quality=11)))
+
+    for suffix, encode in encoders:
+        sibling = path + suffix
+        if len(data) < PRECOMPRESS_MIN_BYTES:
+            if os.path.exists(sibling):
+                os.remove(sibling)
+            continue
+
+        tmp_path = f"{sibling}.tmp-{os.getpid()}"
+        with open(tmp_path, "wb") as f:
+            f.write(encode(data))
+        os.replace(tmp_path, sibling)
+
+
+def precompress_tree(directory: str):
+    """Precompresses every text file under a directory"""
+    for root, _, files in os.walk(directory):
+        for filename in files:
+            path = os.path.join(root, filename)
+            if not is_precompressed_sibling(path):
+                precompress(path)
+
+
+def _etag(stat: os.stat_result, encoding: Optional[str] = None) -> str:
+    """Strong validator from size and mtime; each encoding is its own representation"""
+    tag = f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+    if encoding:
+        tag += f"-{encoding}"
+    return f'"{tag}"'
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match comparison (weak, per RFC 9110)"""
+    if header.strip() == "*":
+        return True
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def _choose_encoding(request: Request, path: str, stat: os.stat_result) -> Tuple[str, Optional[str]]:
+    """Picks the best precompressed variant the client accepts that is up to date"""
+
+    accepted = {
+        part.split(";")[0].strip().lower()
+        for part in request.headers.get("accept-encoding", "").split(",")
+    }
+
+    for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+        if encoding not in accepted:
+            continue
+        sibling = path + suffix
+        try:
+            sibling_stat = os.stat(sibling)
+        except OSError:
+            continue
+        # A sibling older than the file was left behind by a rewrite; ignore it
+        if sibling_stat.st_mtime_ns >= stat.st_mtime_ns:
+            return sibling, encoding
+
+    return path, None
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parses a single "bytes=" range
+
+    Returns:
+        (start, end) inclusive, None to ignore the header (multiple or
+        malformed ranges), or (-1, -1) when unsatisfiable
+    """
+
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    start_text, sep, end_text = spec.strip().partition("-")
+    if not sep:
+        return None
+
+    try:
+        if not start_text:
+            # Suffix range: the last N bytes
+            length = int(end_text)
+            if length <= 0:
+                return -1, -1
+            return max(0, size - length), size - 1
+
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    except ValueError:
+        return None
+
+    if start >= size or end < start:
+        return -1, -1
+    return start, min(end, size - 1)
+
+
+def _read_range(path: str, start: int, end: int) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def serve_file(
+    request: Request,
+    path: str,
+    media_type: str,
+    cache_control: str,
+    filename: Optional[str] = None
+) -> Response:
+    """
+    Serves a file with ETag, 304, Range and precompressed variant support
+
+    Args:
+        request: Incoming request (for conditional, range and encoding headers)
+        path: File to serve
+        media_type: Content type of the file
+        cache_control: Cache-Control header value
+        filename: Download name (sets Content-Disposition)
+
+    Returns:
+        200, 206, 304 or 416 response
+    """
+
+    stat = os.stat(path)
+    range_header = request.headers.get("range")
+
+    # Ranges address the identity representation only
+    send_path, encoding = (path, None) if range_header else _choose_encoding(request, path, stat)
+    etag = _etag(stat, encoding)
+
+    headers: Dict[str, str] = {
+        "ETag": etag,
+        "Cache-Control": cache_control,
+        "Accept-Ranges": "bytes"
+    }
+    if os.path.splitext(path)[1].lower() in COMPRESSIBLE_EXTENSIONS:
+        headers["Vary"] = "Accept-Encoding"
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    if range_header:
+        if_range = request.headers.get("if-range")
+        byte_range = None if (if_range and if_range.strip() != etag) else _parse_range(range_header, stat.st_size)
+
+        if byte_range == (-1, -1):
+            return Response(
+                status_code=416,
+                headers={**headers, "Content-Range": f"bytes */{stat.st_size}"}
+            )
+
+        if byte_range:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+            headers["Content-Length"] = str(end - start + 1)
+            if filename:
+                headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+            return StreamingResponse(
+                _read_range(path, start, end),
+                status_code=206,
+                media_type=media_type,
+                headers=headers
+            )
+
+    if encoding:
+        headers["Content-Encoding"] = encoding
+
+    return FileResponse(send_path, media_type=media_type, headers=headers, filename=filename)
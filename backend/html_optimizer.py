@@ -0,0 +1,473 @@
+"""
+HTML Optimizer
+Post-render stage for generated course pages: hoists repeated inline styles
+into generated CSS classes and minifies HTML, CSS and JavaScript, then checks
+the result is structurally identical to the input before using it
+"""
+
+import hashlib
+import logging
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+HOISTED_CLASS_PREFIX = "hs-"
+# Marks the <style> element holding the hoisted classes
+HOISTED_STYLE_ATTR = "data-hoisted-styles"
+
+PREFORMATTED_TAGS = {"pre", "textarea"}
+RAW_TEXT_TAGS = {"script", "style"}
+
+# Whitespace next to these tags falls at the edge of a line box, so browsers drop it
+BLOCK_TAGS = {
+    "html", "head", "body", "meta", "link", "title", "template",
+    "address", "article", "aside", "blockquote", "details", "dialog", "dd", "div",
+    "dl", "dt", "fieldset", "figcaption", "figure", "footer", "form",
+    "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav",
+    "ol", "p", "pre", "section", "summary", "table", "tbody", "td", "tfoot",
+    "th", "thead", "tr", "ul"
+}
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING = re.compile(r"(\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*')")
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_CSS_PUNCTUATION = re.compile(r"\s*([{};,>])\s*")
+_CSS_COLON = re.compile(r":\s+")
+
+
+class _Tokenizer(HTMLParser):
+    """Flattens a document into (kind, ...) tokens"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tokens: List[Tuple] = []
+
+    def handle_starttag(self, tag, attrs):
+        self.tokens.append(("start", tag, attrs))
+
+    def handle_startendtag(self, tag, attrs):
+        self.tokens.append(("startend", tag, attrs))
+
+    def handle_endtag(self, tag):
+        self.tokens.append(("end", tag))
+
+    def handle_data(self, data):
+        self.tokens.append(("data", data))
+
+    def handle_comment(self, data):
+        self.tokens.append(("comment", data))
+
+    def handle_decl(self, decl):
+        self.tokens.append(("raw", f"<!{decl}>"))
+
+    def handle_pi(self, data):
+        self.tokens.append(("raw", f"<?{data}>"))
+
+    def unknown_decl(self, data):
+        self.tokens.append(("raw", f"<![{data}]>"))
+
+
+def _tokenize(html: str) -> List[Tuple]:
+    tokenizer = _Tokenizer()
+    tokenizer.feed(html)
+    tokenizer.close()
+    return tokenizer.tokens
+
+
+def minify_css(css: str) -> str:
+    """Drops comments and insignificant whitespace, leaving strings untouched"""
+
+    pieces = _STRING.split(_CSS_COMMENT.sub("", css))
+    for i in range(0, len(pieces), 2):
+        piece = _WHITESPACE.sub(" ", pieces[i])
+        piece = _CSS_PUNCTUATION.sub(r"\1", piece)
+        pieces[i] = _CSS_COLON.sub(":", piece)
+    return "".join(pieces).replace(";}", "}").strip()
+
+
+def minify_js(js: str) -> str:
+    """
+    Strips indentation, blank lines and whole-line comments
+
+    Line breaks are kept, so automatic semicolon insertion is unaffected.
+    Scripts with template literals, block comments or line continuations
+    are returned as they are.
+    """
+
+    lines = js.split("\n")
+    if "`" in js or "/*" in js or any(line.rstrip().endswith("\\") for line in lines):
+        return js.strip()
+
+    kept = []
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("//"):
+            kept.append(line)
+    return "\n".join(kept)
+
+
+def _css_signature(css: str) -> str:
+    """CSS with comments and every whitespace outside strings removed"""
+    pieces = _STRING.split(_CSS_COMMENT.sub("", css))
+    for i in range(0, len(pieces), 2):
+        pieces[i] = _WHITESPACE.sub("", pieces[i])
+    return "".join(pieces).replace(";}", "}")
+
+
+def _js_signature(js: str) -> Tuple[str, ...]:
+    return tuple(line.strip() for line in js.split("\n") if line.strip() and not line.strip().startswith("//"))
+
+
+def minify_asset(name: str, content: str) -> str:
+    """
+    Minifies a .css or .js file, keeping the original if minification
+    changed anything beyond whitespace and comments
+    """
+
+    if name.endswith(".css"):
+        minified = minify_css(content)
+        return minified if _css_signature(minified) == _css_signature(content) else content
+    if name.endswith(".js"):
+        minified = minify_js(content)
+        return minified if _js_signature(minified) == _js_signature(content) else content
+    return content
+
+
+def _splittable(style: str) -> bool:
+    """Whether a style attribute can be split on ";" and ":" safely"""
+    if "url(" in style.lower():
+        return False
+    return not any(";" in s or ":" in s for s in _STRING.findall(style))
+
+
+def _style_declarations(style: str) -> List[str]:
+    """Normalized "property:value" declarations of a style attribute"""
+
+    if not _splittable(style):
+        collapsed = " ".join(style.split())
+        return [collapsed] if collapsed else []
+
+    declarations = []
+    for part in style.split(";"):
+        prop, sep, value = part.partition(":")
+        prop = prop.strip().lower()
+        value = " ".join(value.split())
+        if sep and prop and value:
+            declarations.append(f"{prop}:{value}")
+    return declarations
+
+
+def _hoisted_class(normalized_style: str) -> str:
+    """Deterministic class name, so a deck and its chapter fragments agree"""
+    return HOISTED_CLASS_PREFIX + hashlib.sha1(normalized_style.encode("utf-8")).hexdigest()[:8]
+
+
+def _escape_text(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _escape_attr(value: str) -> str:
+    return value.replace("&", "&amp;").replace('"', "&quot;")
+
+
+def _find_hoistable(tokens: List[Tuple], min_repeats: int) -> Dict[str, str]:
+    """Normalized style -> class name for styles repeated at least min_repeats times"""
+
+    counts: Dict[str, int] = {}
+    for token in tokens:
+        if token[0] not in ("start", "startend"):
+            continue
+        for name, value in token[2]:
+            if name == "style" and value and _splittable(value):
+                normalized = ";".join(_style_declarations(value))
+                if normalized:
+                    counts[normalized] = counts.get(normalized, 0) + 1
+
+    return {
+        style: _hoisted_class(style)
+        for style, count in counts.items()
+        if count >= min_repeats
+    }
+
+
+def _hoisted_css(hoisted: Dict[str, str]) -> str:
+    """
+    Rules for the hoisted classes
+
+    Inline styles beat any stylesheet rule, a plain class does not (reveal.js
+    themes style ".reveal ul li" and friends). The selector ".hs-x:not(#hs-x)"
+    adds ID-level specificity instead of !important, so scripts that set
+    element.style (quiz.js hides sections that way) still override it, as
+    they would the inline style.
+    """
+
+    return "".join(
+        f".{class_name}:not(#{class_name}){{{style}}}"
+        for style, class_name in sorted(hoisted.items(), key=lambda item: item[1])
+    )
+
+
+def _start_tag(tag: str, attrs: List[Tuple[str, Optional[str]]], hoisted: Dict[str, str], self_closing: bool) -> str:
+    out_attrs = []
+    hoisted_class = None
+
+    for name, value in attrs:
+        if name == "style" and value is not None:
+            declarations = _style_declarations(value)
+            normalized = ";".join(declarations)
+            if normalized in hoisted:
+                hoisted_class = hoisted[normalized]
+                continue
+            if not normalized:
+                continue
+            value = normalized
+        out_attrs.append([name, value])
+
+    if hoisted_class:
+        for attr in out_attrs:
+            if attr[0] == "class":
+                attr[1] = f"{attr[1] or ''} {hoisted_class}".strip()
+                break
+        else:
+            out_attrs.append(["class", hoisted_class])
+
+    parts = [tag]
+    for name, value in out_attrs:
+        parts.append(name if value is None else f'{name}="{_escape_attr(value)}"')
+    return f"<{' '.join(parts)}{' /' if self_closing else ''}>"
+
+
+def _serialize(tokens: List[Tuple], hoisted: Dict[str, str]) -> str:
+    """Writes tokens back out minified, with hoisted styles replaced by classes"""
+
+    out: List[str] = []
+    raw_text_tag = None
+    preformatted = 0
+    after_block = True
+    last_is_text = False
+    style_injected = not hoisted
+    style_element = f"<style {HOISTED_STYLE_ATTR}>{_hoisted_css(hoisted)}</style>" if hoisted else ""
+
+    for token in tokens:
+        kind = token[0]
+
+        if kind in ("start", "startend", "end"):
+            tag = token[1]
+            if tag in BLOCK_TAGS and last_is_text:
+                # Trailing whitespace before a block boundary
+                out[-1] = out[-1].rstrip(" ")
+                if not out[-1]:
+                    out.pop()
+
+            if kind == "end":
+                if tag == "head" and not style_injected:
+                    out.append(style_element)
+                    style_injected = True
+                if tag == raw_text_tag:
+                    raw_text_tag = None
+                if tag in PREFORMATTED_TAGS and preformatted:
+                    preformatted -= 1
+                out.append(f"</{tag}>")
+            else:
+                out.append(_start_tag(tag, token[2], hoisted, kind == "startend"))
+                if kind == "start":
+                    if tag in RAW_TEXT_TAGS:
+                        raw_text_tag = tag
+                    if tag in PREFORMATTED_TAGS:
+                        preformatted += 1
+
+            after_block = tag in BLOCK_TAGS
+            last_is_text = False
+
+        elif kind == "data":
+            text = token[1]
+            if raw_text_tag == "style":
+                out.append(minify_css(text))
+            elif raw_text_tag == "script":
+                out.append(minify_js(text))
+            elif preformatted:
+                out.append(_escape_text(text))
+            else:
+                text = _WHITESPACE.sub(" ", text)
+                if after_block or (last_is_text and out[-1].endswith(" ")):
+                    text = text.lstrip(" ")
+                if text:
+                    out.append(_escape_text(text))
+                    after_block = False
+                    last_is_text = True
+
+        elif kind == "comment":
+            # Conditional comments are markup; everything else is dropped
+            if token[1].startswith("[if") or token[1].startswith("<![endif"):
+                out.append(f"<!--{token[1]}-->")
+
+        else:
+            out.append(token[1])
+
+    html = "".join(out)
+    if not style_injected:
+        # Fragment without a <head>: the rules travel with the markup
+        html = style_element + html
+    return html
+
+
+def _signature(tokens: List[Tuple], hoisted_classes: Dict[str, str]) -> List[Tuple]:
+    """
+    Rendering-relevant structure of a document: elements, attributes (styles
+    as declaration sets, hoisted classes expanded back into declarations),
+    text with whitespace collapsed, and script/style content
+    """
+
+    signature: List[Tuple] = []
+    text: List[str] = []
+    raw_text_tag = None
+    skipping = False
+
+    def flush_text():
+        collapsed = " ".join("".join(text).split())
+        if collapsed:
+            signature.append(("text", collapsed))
+        text.clear()
+
+    for token in tokens:
+        kind = token[0]
+
+        if skipping:
+            if kind == "end" and token[1] == "style":
+                skipping = False
+            continue
+
+        if kind in ("start", "startend"):
+            tag, attrs = token[1], token[2]
+            if tag == "style" and any(name == HOISTED_STYLE_ATTR for name, _ in attrs):
+                skipping = kind == "start"
+                continue
+
+            flush_text()
+            declarations = set()
+            normalized_attrs = []
+            for name, value in attrs:
+                if name == "style" and value is not None:
+                    declarations.update(_style_declarations(value))
+                elif name == "class" and value is not None:
+                    classes = []
+                    for class_name in value.split():
+                        if class_name in hoisted_classes:
+                            declarations.update(hoisted_classes[class_name].split(";"))
+                        else:
+                            classes.append(class_name)
+                    if classes:
+                        normalized_attrs.append(("class", " ".join(sorted(classes))))
+                else:
+                    normalized_attrs.append((name, value))
+            if declarations:
+                normalized_attrs.append(("style", ";".join(sorted(declarations))))
+
+            signature.append((kind, tag, tuple(sorted(normalized_attrs, key=lambda a: (a[0], a[1] or "")))))
+            if kind == "start" and tag in RAW_TEXT_TAGS:
+                raw_text_tag = tag
+
+        elif kind == "end":
+            flush_text()
+            if token[1] == raw_text_tag:
+                raw_text_tag = None
+            signature.append(("end", token[1]))
+
+        elif kind == "data":
+            if raw_text_tag == "style":
+                signature.append(("css", _css_signature(token[1])))
+            elif raw_text_tag == "script":
+                signature.append(("js", _js_signature(token[1])))
+            else:
+                text.append(token[1])
+
+        elif kind == "raw":
+            flush_text()
+            signature.append(("raw", token[1]))
+
+    flush_text()
+    return signature
+
+
+def optimize_html(html: str, min_repeats: int = 2) -> Tuple[str, Dict]:
+    """
+    Hoists repeated inline styles into classes and minifies a page
+
+    The optimized page is parsed again and compared with the original
+    structurally (elements, attributes, effective inline declarations,
+    text, script and style content); on any difference the original is
+    returned unchanged.
+
+    Args:
+        html: Rendered page or fragment
+        min_repeats: Occurrences of an inline style before it becomes a class
+
+    Returns:
+        Tuple of (HTML to write, stats dict with original_bytes,
+        optimized_bytes, saved_bytes, hoisted_styles and verified)
+    """
+
+    original_bytes = len(html.encode("utf-8"))
+    stats = {
+        "original_bytes": original_bytes,
+        "optimized_bytes": original_bytes,
+        "saved_bytes": 0,
+        "hoisted_styles": 0,
+        "verified": False
+    }
+
+    try:
+        tokens = _tokenize(html)
+        hoisted = _find_hoistable(tokens, min_repeats)
+        optimized = _serialize(tokens, hoisted)
+
+        classes = {class_name: style for style, class_name in hoisted.items()}
+        if _signature(_tokenize(optimized), classes) != _signature(tokens, {}):
+            logger.warning("HTML optimization changed the document structure; keeping the original")
+            return html, stats
+
+    except Exception as e:
+        logger.error("Error optimizing HTML", extra={"error": str(e)})
+        return html, stats
+
+    optimized_bytes = len(optimized.encode("utf-8"))
+    if optimized_bytes >= original_bytes:
+        stats["verified"] = True
+        return html, stats
+
+    stats.update({
+        "optimized_bytes": optimized_bytes,
+        "saved_bytes": original_bytes - optimized_bytes,
+        "hoisted_styles": len(hoisted),
+        "verified": True
+    })
+    return optimized, stats
+
+
+if __name__ == "__main__":
+    from slide_generator import SlideGenerator
+
+    course = {
+        "course": {
+            "title": "Optimizer Demo",
+            "description": "A short course",
+            "learning_outcomes": ["Outcome A", "Outcome B"],
+            "chapters": [
+                {
+                    "number": n,
+                    "title": f"Chapter {n}",
+                    "learning_objectives": ["Objective 1", "Objective 2"],
+                    "key_points": [f"Point {i} & more <detail>" for i in range(8)]
+                }
+                for n in range(1, 6)
+            ]
+        }
+    }
+
+    deck = SlideGenerator().create_slide_deck(course, language="en")
+    optimized, stats = optimize_html(deck)
+    print(stats)
+    print(f"{stats['saved_bytes'] / stats['original_bytes']:.0%} smaller")
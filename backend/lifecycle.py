@@ -0,0 +1,151 @@
+"""
+Service Lifecycle
+Startup and shutdown for each API worker process: database setup that is
+safe to run in every worker at once, tracking of in-flight background jobs
+for graceful draining, and the checks behind the health endpoints
+"""
+
+import contextlib
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterator
+from decouple import config
+from sqlalchemy import inspect, text
+
+from models import engine, create_tables
+from course_models import create_course_tables
+
+logger = logging.getLogger(__name__)
+
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+# Serializes startup work across the worker processes of one deployment
+STARTUP_LOCK_FILE = config('STARTUP_LOCK_FILE', default='.startup.lock')
+# How long shutdown waits for background jobs (also uvicorn's graceful timeout)
+GRACEFUL_SHUTDOWN_SECONDS = config('GRACEFUL_SHUTDOWN_SECONDS', default=30, cast=int)
+# Readiness fails while more background jobs than this are running or queued
+READY_MAX_QUEUE_DEPTH = config('READY_MAX_QUEUE_DEPTH', default=20, cast=int)
+
+
+# Columns added to existing tables since they were first created: table -> column -> SQL type
+ADDED_COLUMNS = {
+    "videos": {"processing_stage": "VARCHAR(20)", "stage_seq": "INTEGER DEFAULT 0"}
+}
+
+
+@contextlib.contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """Exclusive lock shared by all processes on this host, held for the with block"""
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    with open(path, "a+b") as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def init_database():
+    """
+    Creates missing tables and adds missing columns (ADDED_COLUMNS)
+
+    Every worker runs this on startup; the lock makes them take turns, so
+    concurrent CREATE TABLE and ALTER TABLE statements can't collide.
+    """
+    with file_lock(STARTUP_LOCK_FILE):
+        create_tables()
+        create_course_tables()
+        _add_missing_columns()
+
+
+def _add_missing_columns():
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table, columns in ADDED_COLUMNS.items():
+            existing = {column["name"] for column in inspector.get_columns(table)}
+            for name, sql_type in columns.items():
+                if name not in existing:
+                    connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {sql_type}"))
+                    logger.info("Added database column", extra={"table": table, "column": name})
+
+
+def database_ok() -> bool:
+    """Whether the database answers a trivial query"""
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except Exception as e:
+        logger.error("Database health check failed", extra={"error": str(e)})
+        return False
+
+
+class JobTracker:
+    """
+    Background jobs in flight in this worker process
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.draining = False
+        self._active: Dict[str, int] = {}
+        self._condition = threading.Condition()
+
+    @contextlib.contextmanager
+    def track(self, kind: str) -> Iterator[None]:
+        """Counts a job of the given kind as in flight for the with block"""
+        with self._condition:
+            self._active[kind] = self._active.get(kind, 0) + 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._active[kind] -= 1
+                if not self._active[kind]:
+                    del self._active[kind]
+                self._condition.notify_all()
+
+    def active(self) -> Dict[str, int]:
+        """In-flight jobs by kind"""
+        with self._condition:
+            return dict(self._active)
+
+    def drain(self, timeout: float) -> bool:
+        """
+        Stops admitting new jobs and waits for the running ones
+
+        Args:
+            timeout: Seconds to wait
+
+        Returns:
+            True if every job finished in time
+        """
+
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            self.draining = True
+            while self._active:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return True
@@ -0,0 +1,199 @@
+"""
+Structured Logging
+JSON log records written by a background thread: callers only enqueue, so
+a slow log sink never stalls a request or a processing job. Records carry
+the video, course and job IDs of the work they belong to, and high-volume
+events can be sampled.
+"""
+
+import atexit
+import contextlib
+import copy
+import contextvars
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterator, Optional
+from decouple import config
+
+
+LOG_LEVEL = config('LOG_LEVEL', default='INFO').upper()
+# "json" for log collectors, "text" for reading in a terminal
+LOG_FORMAT = config('LOG_FORMAT', default='json')
+# Share of records logged with sampled=True that are kept
+LOG_SAMPLE_RATE = config('LOG_SAMPLE_RATE', default=0.1, cast=float)
+# Records waiting for the writer thread; beyond this they are dropped, not waited for
+LOG_QUEUE_SIZE = config('LOG_QUEUE_SIZE', default=10000, cast=int)
+# Longer messages and fields (API error bodies, model output) are cut
+LOG_MAX_FIELD_CHARS = config('LOG_MAX_FIELD_CHARS', default=2000, cast=int)
+
+_context: contextvars.ContextVar[Dict] = contextvars.ContextVar("log_context", default={})
+
+# Attributes every LogRecord has; anything else was passed in extra=
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "sampled"}
+
+_traceback_formatter = logging.Formatter()
+_listener: Optional[logging.handlers.QueueListener] = None
+_setup_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def log_context(**fields) -> Iterator[None]:
+    """
+    Adds fields (video_id, course_id, job_id...) to every record logged in
+    the with block, by this thread or task
+
+    Worker threads started inside the block don't inherit it; pass the IDs
+    with extra= there.
+    """
+    token = _context.set({**_context.get(), **{k: v for k, v in fields.items() if v is not None}})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def _truncate(value):
+    if isinstance(value, str) and len(value) > LOG_MAX_FIELD_CHARS:
+        return value[:LOG_MAX_FIELD_CHARS] + f"... [{len(value) - LOG_MAX_FIELD_CHARS} more chars]"
+    return value
+
+
+class ContextFilter(logging.Filter):
+    """
+    Attaches the current log_context() fields and drops most sampled records
+
+    Runs in the thread that logs, before the record is queued, so dropped
+    records cost almost nothing.
+    """
+
+    def __init__(self, sample_rate: float = LOG_SAMPLE_RATE):
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "sampled", False):
+            if random.random() >= self.sample_rate:
+                return False
+            record.sample_rate = self.sample_rate
+        for name, value in _context.get().items():
+            if not hasattr(record, name):
+                setattr(record, name, value)
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, then the fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": _truncate(record.getMessage())
+        }
+        for name, value in vars(record).items():
+            if name not in _RECORD_ATTRIBUTES and not name.startswith("_"):
+                entry[name] = _truncate(value)
+        if record.exc_text:
+            entry["exc"] = _truncate(record.exc_text)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines with the context fields appended"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = {
+            name: value for name, value in vars(record).items()
+            if name not in _RECORD_ATTRIBUTES and not name.startswith("_")
+        }
+        if fields:
+            line += " " + " ".join(f"{name}={_truncate(value)}" for name, value in fields.items())
+        return line
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records when the writer falls behind instead of blocking"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render the message and traceback now: the writer thread sees the
+        # record later, when the arguments may have changed
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _traceback_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging(level: str = LOG_LEVEL, log_format: str = LOG_FORMAT):
+    """
+    Routes the root logger through a bounded queue to a writer thread
+
+    Safe to call more than once (only the first call configures).
+
+    Args:
+        level: Minimum level (DEBUG, INFO, WARNING, ERROR)
+        log_format: "json" or "text"
+    """
+
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return
+
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(TextFormatter() if log_format == "text" else JsonFormatter())
+
+        queue_handler = DroppingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+        queue_handler.addFilter(ContextFilter())
+
+        root = logging.getLogger()
+        root.setLevel(level)
+        root.addHandler(queue_handler)
+        # The SDK's HTTP client logs every request at INFO; "LLM call" covers those
+        if logging.getLevelName(level) != logging.DEBUG:
+            for name in ("httpx", "httpcore", "openai"):
+                logging.getLogger(name).setLevel(logging.WARNING)
+
+        _listener = logging.handlers.QueueListener(queue_handler.queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Writes the records still queued and stops the writer thread"""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def dropped_records() -> int:
+    """Records dropped because the queue was full"""
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, DroppingQueueHandler):
+            return handler.dropped
+    return 0
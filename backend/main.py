@@ -1,24 +1,85 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, BackgroundTasks, Query
+from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, BackgroundTasks, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
+from typing import List, Optional
+from contextlib import asynccontextmanager
+import asyncio
+import hashlib
+import json
+import logging
+import mimetypes
 import os
+import time
+import uuid
 from decouple import config
 from datetime import datetime
 
-from models import Video, ChatHistory, get_db, create_tables, SessionLocal
+from models import Video, ChatHistory, get_db, SessionLocal
 from video_processor import VideoProcessor
 from language_config import get_enabled_languages
 
 # Q2: Course Generation imports
 from course_structurer import CourseStructurer
-from slide_generator import SlideGenerator
+from slide_generator import SlideGenerator, render_decks_parallel
 from quiz_generator import QuizGenerator
 from course_assembler import CourseAssembler
-from course_models import Course, create_course_tables
+from course_assets import IMMUTABLE_CACHE_CONTROL, MissingAssetsError
+from export_cache import ExportCache
+from zip_stream import stream_zip
+from file_serving import serve_file, COURSE_FILE_CACHE_CONTROL, AUDIO_CACHE_CONTROL
+from compression import CompressionMiddleware, FastJSONResponse
+from course_models import Course
+from course_translator import CourseTranslator
+from question_bank import QuestionBank
+from precompute import StructurePrecomputer
+from admission import AdmissionController
+import metrics
+from metrics import MetricsMiddleware
+from progress import ProgressHub, format_sse, TERMINAL_STAGES, PROGRESS_HEARTBEAT_SECONDS, PROGRESS_POLL_SECONDS
+from lifecycle import (
+    JobTracker, init_database, database_ok,
+    GRACEFUL_SHUTDOWN_SECONDS, READY_MAX_QUEUE_DEPTH
+)
+from logging_setup import setup_logging, log_context, dropped_records
+
+# JSON records through a queue to a writer thread; LOG_LEVEL sets the level
+setup_logging()
+logger = logging.getLogger(__name__)
+
 
-app = FastAPI(title="Video Analyzer API", description="AI-powered video analysis and Q&A system with multi-language support")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Per-worker startup and graceful shutdown"""
+    # Safe in every worker: table creation is serialized by a file lock
+    await run_in_threadpool(init_database)
+    # Refuse to start rather than fail every deck render later
+    try:
+        await run_in_threadpool(course_assembler.assets.check)
+    except MissingAssetsError as e:
+        logger.error("Slide deck assets are missing", extra={"error": str(e)})
+        raise
+    # With several workers, share this one's metrics with the others' scrapes
+    metrics.start_flusher()
+    yield
+    # The server has stopped taking requests; let background jobs finish
+    structure_precomputer.stop()
+    drained = await run_in_threadpool(job_tracker.drain, GRACEFUL_SHUTDOWN_SECONDS)
+    if not drained:
+        logger.warning("Shutdown timed out with jobs still running", extra={"jobs": job_tracker.active()})
+
+
+app = FastAPI(
+    title="Video Analyzer API",
+    description="AI-powered video analysis and Q&A system with multi-language support",
+    lifespan=lifespan,
+    # orjson when installed: several times faster on transcripts and decks
+    default_response_class=FastJSONResponse
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -27,18 +88,54 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# gzip/brotli for JSON and HTML above COMPRESS_MIN_BYTES (file routes serve precompressed copies)
+app.add_middleware(CompressionMiddleware)
+# Outermost, so request latency includes compression
+app.add_middleware(MetricsMiddleware)
 
 UPLOAD_DIR = config('UPLOAD_DIR', default='./uploads')
-processor = VideoProcessor()
+# Concurrency limits and wait queues per workload class
+admission = AdmissionController()
+processor = VideoProcessor(admission=admission)
 
 # Q2: Initialize course generation components
 course_structurer = CourseStructurer()
-slide_generator = SlideGenerator()
-quiz_generator = QuizGenerator()
 course_assembler = CourseAssembler()
-
-create_tables()
-create_course_tables()  # Create course-related tables
+export_cache = ExportCache(course_assembler)
+slide_generator = SlideGenerator(asset_bundle=course_assembler.assets)
+quiz_generator = QuizGenerator()
+question_bank = QuestionBank()
+course_translator = CourseTranslator()
+job_tracker = JobTracker()
+structure_precomputer = StructurePrecomputer(course_structurer, job_tracker, admission)
+progress_hub = ProgressHub()
+
+
+def _by_workload(field: str):
+    return lambda: {(("workload", name),): stats[field] for name, stats in admission.stats().items()}
+
+
+# Read at scrape time from the components that own them
+metrics.register_gauge("admission_limit", "Concurrency limit per workload class", _by_workload("limit"))
+metrics.register_gauge("admission_running", "Jobs running per workload class", _by_workload("running"))
+metrics.register_gauge("admission_waiting", "Jobs waiting for a slot per workload class", _by_workload("waiting"))
+metrics.register_gauge("admission_rejected_total", "Requests turned away with 429 per workload class", _by_workload("rejected"), "counter")
+metrics.register_gauge("admission_timed_out_total", "Requests that gave up waiting (503) per workload class", _by_workload("timed_out"), "counter")
+metrics.register_gauge(
+    "jobs_in_flight", "Background jobs running in this worker, by kind",
+    lambda: {(("kind", kind),): count for kind, count in job_tracker.active().items()}
+)
+metrics.register_gauge("precompute_queue_depth", "Speculative structuring jobs queued", lambda: {(): structure_precomputer.queue_depth()})
+metrics.register_gauge("progress_subscribers", "Open processing-status event streams", lambda: {(): progress_hub.subscriber_count()})
+metrics.register_gauge(
+    "log_records_dropped_total", "Log records dropped because the log queue was full",
+    lambda: {(): dropped_records()}, "counter"
+)
+# Labelled with the worker's PID in every mode: one series per worker process
+metrics.register_gauge(
+    "process_start_time_seconds", "Start time of each worker process (Unix time), by worker PID",
+    lambda: {(("worker", str(os.getpid())),): job_tracker.started_at}
+)
 
 
 class QuestionRequest(BaseModel):
@@ -64,6 +161,7 @@ class CourseAnalyzeRequest(BaseModel):
     language: str = "en"
     theme: str = "light"  # light, dark, corporate
     num_questions: int = 10
+    regenerate: bool = False  # Structure the transcript again instead of reusing a cached outline
 
 
 class CourseGenerateRequest(BaseModel):
@@ -71,44 +169,221 @@ class CourseGenerateRequest(BaseModel):
     language: str = "en"
     theme: str = "light"
     num_questions: int = 10
+    regenerate: bool = False  # Structure the transcript again instead of reusing a cached outline
+
+
+class CourseMultiLanguageRequest(BaseModel):
+    video_id: int
+    languages: List[str] = ["en", "ja"]  # First language is structured, the rest are translated
+    theme: str = "light"
+    num_questions: int = 10
+    regenerate: bool = False  # Structure the transcript again instead of reusing a cached outline
+
+
+class CourseRerenderRequest(BaseModel):
+    theme: Optional[str] = None  # light, dark, corporate (defaults to the course theme)
+    language: Optional[str] = None  # Label language (defaults to the course language)
+
+
+class CatalogRerenderRequest(BaseModel):
+    course_ids: Optional[List[str]] = None  # All courses if None
+    theme: Optional[str] = None  # Defaults to each course's theme
+
+
+class BulkExportRequest(BaseModel):
+    course_ids: Optional[List[str]] = None  # Any course if None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    language: Optional[str] = None
+
+
+def load_course_structure(video: Video, language: str, db: Session) -> dict:
+    """Latest stored course structure for a video, structuring the transcript only if there is none"""
+    import json
+    course = db.query(Course).filter(
+        Course.video_id == video.id,
+        Course.language == language,
+        Course.course_structure.isnot(None)
+    ).order_by(Course.created_at.desc()).first()
+
+    if course:
+        return json.loads(course.course_structure)
+
+    return course_structurer.analyze_content(
+        content=video.transcription,
+        source_type="transcript",
+        language=language,
+        duration_minutes=video.audio_summary_duration,
+        video_id=video.id
+    )
+
+
+def assemble_and_save_course(
+    db: Session,
+    video: Video,
+    course_id: str,
+    course_structure: dict,
+    slides_html: str,
+    quiz_data: dict,
+    language: str,
+    theme: str,
+    num_questions: int,
+    extra_metadata: Optional[dict] = None,
+    slide_chapters: Optional[dict] = None
+) -> dict:
+    """Assemble a generated course, save it to the database and bank its questions"""
+    import json
+    metadata = {
+        "video_id": video.id,
+        "video_filename": video.filename,
+        "language": language,
+        "theme": theme,
+        "num_questions": num_questions
+    }
+    metadata.update(extra_metadata or {})
+
+    course_package = course_assembler.assemble_course(
+        course_structure=course_structure,
+        slides_html=slides_html,
+        quiz_data=quiz_data,
+        course_id=course_id,
+        metadata=metadata,
+        slide_chapters=slide_chapters
+    )
+
+    # Save course to database
+    db_course = Course(
+        video_id=video.id,
+        course_id=course_id,
+        title=course_structure.get("course", {}).get("title", ""),
+        description=course_structure.get("course", {}).get("description", ""),
+        course_dir=course_package["course_dir"],
+        slides_path=course_package["files"]["slides"],
+        quiz_path=course_package["files"]["quiz_html"],
+        viewer_path=course_package["files"]["viewer"],
+        language=language,
+        theme=theme,
+        total_slides=course_structure.get("course", {}).get("total_slides", 0),
+        total_questions=len(quiz_data.get("quiz", {}).get("questions", [])),
+        course_structure=json.dumps(course_structure, ensure_ascii=False)
+    )
+    db.add(db_course)
+    db.commit()
+    db.refresh(db_course)
+
+    # Keep the questions for future quizzes and variants
+    question_bank.add_questions(
+        db, video.id, language,
+        quiz_data.get("quiz", {}).get("questions", []), course_id
+    )
+
+    logger.info("Course assembled", extra={
+        "video_id": video.id,
+        "course_id": course_id,
+        "language": language,
+        "total_questions": db_course.total_questions
+    })
+    return course_package
+
+
+def publish_stage(video_id: int, stage: str, **data):
+    """
+    Records a processing stage on the video, then wakes this worker's
+    subscribers; streams on other workers pick it up from the database
+    """
+    db = SessionLocal()
+    try:
+        db.query(Video).filter(Video.id == video_id).update(
+            {
+                Video.processing_stage: stage,
+                Video.stage_seq: func.coalesce(Video.stage_seq, 0) + 1
+            },
+            synchronize_session=False
+        )
+        db.commit()
+        seq = db.query(Video.stage_seq).filter(Video.id == video_id).scalar()
+    finally:
+        db.close()
+    progress_hub.publish(video_id, stage, seq, **data)
 
 
-async def process_video_background(
+def process_video_background(
     video_id: int,
     file_path: str,
     language: str = None,
-    ui_language: str = 'en'
+    ui_language: str = 'en',
+    extraction_ticket=None
 ):
-    """Background task to process video with multi-language support"""
-    db = SessionLocal()
-    try:
-        # Update status to processing
-        video = db.query(Video).filter(Video.id == video_id).first()
-        video.processing_status = "processing"
-        db.commit()
+    """
+    Background task to process video with multi-language support
+    Runs in a worker thread; stage transitions are published with publish_stage
+    """
+    # Counted until done, so shutdown waits for it
+    job_id = f"video-{video_id}-{uuid.uuid4().hex[:8]}"
+    with job_tracker.track("video_processing"), log_context(video_id=video_id, job_id=job_id):
+        db = SessionLocal()
+        try:
+            # Update status to processing
+            video = db.query(Video).filter(Video.id == video_id).first()
+            video.processing_status = "processing"
+            db.commit()
+
+            # Process video with language parameters and video_id for audio summary
+            result = processor.process_video(
+                file_path, language, ui_language, video_id,
+                on_stage=lambda stage: publish_stage(video_id, stage),
+                extraction_ticket=extraction_ticket
+            )
+
+            # Update video with results including language info and audio summary
+            video.transcription = result["transcription"]
+            video.summary = result["summary"]
+            video.detected_language = result["detected_language"]
+            video.transcription_method = result["transcription_method"]
+            video.audio_summary_path = result.get("audio_summary_path")
+            video.audio_summary_duration = result.get("audio_summary_duration")
+            video.processing_status = "completed"
+            video.processed_at = datetime.utcnow()
+            db.commit()
+            # Only once committed, so a client fetching the status sees the results
+            publish_stage(video_id, "done")
+
+            # Most processed videos become courses; structure them ahead of time
+            structure_precomputer.enqueue(video.id, video.transcription, video.audio_summary_duration)
+
+        except Exception as e:
+            # Update status to failed
+            video = db.query(Video).filter(Video.id == video_id).first()
+            video.processing_status = "failed"
+            video.error_message = str(e)
+            db.commit()
+            logger.error("Video processing failed", extra={"error": str(e)})
+            publish_stage(video_id, "failed", error=str(e))
+        finally:
+            if extraction_ticket is not None:
+                extraction_ticket.release()
+            db.close()
+
+
+def llm_slot():
+    """
+    Dependency: runs the endpoint in an LLM generation slot
+    A sync generator, so the wait for a slot happens in the threadpool; the
+    endpoints using it are sync for the same reason (their model calls block)
+    """
+    with admission.slot("llm"):
+        yield
 
-        # Process video with language parameters and video_id for audio summary
-        result = processor.process_video(file_path, language, ui_language, video_id)
-
-        # Update video with results including language info and audio summary
-        video.transcription = result["transcription"]
-        video.summary = result["summary"]
-        video.detected_language = result["detected_language"]
-        video.transcription_method = result["transcription_method"]
-        video.audio_summary_path = result.get("audio_summary_path")
-        video.audio_summary_duration = result.get("audio_summary_duration")
-        video.processing_status = "completed"
-        video.processed_at = datetime.utcnow()
-        db.commit()
 
-    except Exception as e:
-        # Update status to failed
-        video = db.query(Video).filter(Video.id == video_id).first()
-        video.processing_status = "failed"
-        video.error_message = str(e)
-        db.commit()
-    finally:
-        db.close()
+def deck_assets_ready():
+    """
+    Dependency: fails with 503 when slide decks can't be rendered, before
+    the endpoint spends anything on model calls
+    """
+    try:
+        course_assembler.assets.check()
+    except MissingAssetsError as e:
+        raise HTTPException(status_code=503, detail=str(e))
 
 
 @app.get("/supported-languages/")
@@ -129,9 +404,16 @@ async def upload_video(
     db: Session = Depends(get_db)
 ):
     """Upload video file with language specification and process in background"""
+    if job_tracker.draining:
+        raise HTTPException(status_code=503, detail="Server is shutting down", headers={"Retry-After": "30"})
+
     if not file.content_type.startswith('video/'):
         raise HTTPException(status_code=400, detail="File must be a video")
 
+    # Turn the upload away before storing it if extraction is backed up;
+    # accepted videos keep their queue place until the background task uses it
+    extraction_ticket = admission.check("extraction")
+
     try:
         # Save uploaded file in chunks for better performance
         file_path = os.path.join(UPLOAD_DIR, file.filename)
@@ -147,12 +429,15 @@ async def upload_video(
             filename=file.filename,
             file_path=file_path,
             processing_status="pending",
+            processing_stage="pending",
+            stage_seq=1,
             user_selected_language=language if language and language != 'auto' else None,
             ui_language=ui_language
         )
         db.add(db_video)
         db.commit()
         db.refresh(db_video)
+        progress_hub.publish(db_video.id, "pending", 1)
 
         # Add background processing task with language parameters
         background_tasks.add_task(
@@ -160,7 +445,8 @@ async def upload_video(
             db_video.id,
             file_path,
             language,
-            ui_language
+            ui_language,
+            extraction_ticket
         )
 
         return {
@@ -173,11 +459,12 @@ async def upload_video(
         }
 
     except Exception as e:
+        extraction_ticket.release()
         raise HTTPException(status_code=500, detail=f"Failed to upload video: {str(e)}")
 
 
-@app.post("/ask-question/")
-async def ask_question(
+@app.post("/ask-question/", dependencies=[Depends(llm_slot)])
+def ask_question(
     request: QuestionRequest,
     ui_language: str = Query(None, description="Response language (ISO 639-1 code: 'en' or 'ja')"),
     db: Session = Depends(get_db)
@@ -263,15 +550,35 @@ async def get_video(video_id: int, db: Session = Depends(get_db)):
     }
 
 
+def _status_etag(video_id: int, status: str, processed_at, error_message: Optional[str], stage_seq: Optional[int]) -> str:
+    """ETag of a video's status response: changes with the stored status and stage"""
+    version = f"{video_id}:{status}:{processed_at}:{error_message}:{stage_seq}"
+    return f'"{hashlib.sha1(version.encode("utf-8")).hexdigest()[:16]}"'
+
+
 @app.get("/video-status/{video_id}")
-async def get_video_status(video_id: int, db: Session = Depends(get_db)):
-    """Check processing status of a video with language information"""
-    video = db.query(Video).filter(Video.id == video_id).first()
-    if not video:
+async def get_video_status(video_id: int, request: Request, db: Session = Depends(get_db)):
+    """
+    Check processing status of a video with language information
+    Conditional: pollers sending If-None-Match get a 304 until something
+    changes, without the transcription and summary being loaded or sent
+    """
+    state = db.query(
+        Video.processing_status, Video.processed_at, Video.error_message, Video.stage_seq
+    ).filter(Video.id == video_id).first()
+    if not state:
         raise HTTPException(status_code=404, detail="Video not found")
 
-    return {
+    etag = _status_etag(video_id, *state)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    video = db.query(Video).filter(Video.id == video_id).first()
+    return FastJSONResponse(jsonable_encoder({
         "video_id": video.id,
+        "stage": video.processing_stage,
         "filename": video.filename,
         "processing_status": video.processing_status,
         "error_message": video.error_message,
@@ -282,7 +589,76 @@ async def get_video_status(video_id: int, db: Session = Depends(get_db)):
         "summary": video.summary if video.processing_status == "completed" else None,
         "audio_summary_path": video.audio_summary_path if video.processing_status == "completed" else None,
         "audio_summary_duration": video.audio_summary_duration if video.processing_status == "completed" else None
-    }
+    }), headers=headers)
+
+
+def _stage_event(video_id: int) -> Optional[dict]:
+    """Latest stage of a video as stored by whichever worker processes it"""
+    db = SessionLocal()
+    try:
+        state = db.query(
+            Video.processing_stage, Video.stage_seq, Video.processing_status, Video.error_message
+        ).filter(Video.id == video_id).first()
+    finally:
+        db.close()
+    if state is None:
+        return None
+
+    # Videos processed before stages were stored only have a status
+    stage = state.processing_stage or {"completed": "done", "failed": "failed"}.get(state.processing_status)
+    if stage is None:
+        return None
+    event = {"video_id": video_id, "stage": stage, "seq": state.stage_seq or 0, "timestamp": time.time()}
+    if stage == "failed":
+        event["error"] = state.error_message
+    return event
+
+
+@app.get("/video-status/{video_id}/events")
+async def video_status_events(video_id: int, request: Request, db: Session = Depends(get_db)):
+    """
+    Server-sent events with the video's processing stages as they happen:
+    pending, extracting, transcribing, summarizing, tts, then done or failed.
+    The stream ends after the terminal event; fetch /video-status then.
+    Any worker can serve it: stages of jobs running elsewhere are read from
+    the database every PROGRESS_POLL_SECONDS.
+    """
+    if not db.query(Video.id).filter(Video.id == video_id).first():
+        raise HTTPException(status_code=404, detail="Video not found")
+
+    async def event_stream():
+        queue = progress_hub.subscribe(video_id)
+        try:
+            yield "retry: 3000\n\n"
+            # Subscribed before reading the stored stage, so none is missed
+            event = await run_in_threadpool(_stage_event, video_id)
+            sent_seq = -1
+            last_write = time.monotonic()
+            while True:
+                # Local events and database reads may both carry a stage
+                if event is not None and event["seq"] > sent_seq:
+                    sent_seq = event["seq"]
+                    last_write = time.monotonic()
+                    yield format_sse(event)
+                    if event["stage"] in TERMINAL_STAGES:
+                        return
+                try:
+                    event = await asyncio.wait_for(queue.get(), PROGRESS_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    event = await run_in_threadpool(_stage_event, video_id)
+                    if time.monotonic() - last_write >= PROGRESS_HEARTBEAT_SECONDS:
+                        last_write = time.monotonic()
+                        yield ": keep-alive\n\n"
+        finally:
+            progress_hub.unsubscribe(video_id, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @app.get("/chat-history/{video_id}")
@@ -301,7 +677,7 @@ async def get_chat_history(video_id: int, db: Session = Depends(get_db)):
 
 
 @app.get("/audio-summary/{video_id}")
-async def get_audio_summary(video_id: int, db: Session = Depends(get_db)):
+async def get_audio_summary(video_id: int, request: Request, db: Session = Depends(get_db)):
     """Get audio summary file for a specific video"""
     video = db.query(Video).filter(Video.id == video_id).first()
     if not video:
@@ -310,13 +686,56 @@ async def get_audio_summary(video_id: int, db: Session = Depends(get_db)):
     if not video.audio_summary_path or not os.path.exists(video.audio_summary_path):
         raise HTTPException(status_code=404, detail="Audio summary not found")
 
-    return FileResponse(
+    return serve_file(
+        request,
         video.audio_summary_path,
         media_type="audio/mpeg",
+        cache_control=AUDIO_CACHE_CONTROL,
         filename=f"summary_{video_id}.mp3"
     )
 
 
+@app.get("/health/live")
+async def health_live():
+    """Liveness: the worker process is up and its event loop responds"""
+    return {
+        "status": "alive",
+        "pid": os.getpid(),
+        "uptime_seconds": round(time.time() - job_tracker.started_at, 1)
+    }
+
+
+@app.get("/health/ready")
+async def health_ready():
+    """
+    Readiness: this worker can take traffic
+
+    Fails (503) while shutting down, when the database or course storage is
+    unavailable, or when background jobs pile up past READY_MAX_QUEUE_DEPTH.
+    """
+    active_jobs = job_tracker.active()
+    queue_depth = sum(active_jobs.values()) + structure_precomputer.queue_depth()
+
+    checks = {
+        "database": await run_in_threadpool(database_ok),
+        "storage": os.access(course_assembler.output_dir, os.W_OK),
+        "queue": queue_depth <= READY_MAX_QUEUE_DEPTH,
+        "accepting": not job_tracker.draining
+    }
+    ready = all(checks.values())
+
+    return FastJSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "not_ready",
+            "checks": checks,
+            "active_jobs": active_jobs,
+            "queue_depth": queue_depth,
+            "max_queue_depth": READY_MAX_QUEUE_DEPTH
+        }
+    )
+
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -332,8 +751,8 @@ async def root():
 # Q2: COURSE GENERATION ENDPOINTS
 # ============================================================
 
-@app.post("/api/course/analyze")
-async def analyze_and_create_course_structure(
+@app.post("/api/course/analyze", dependencies=[Depends(llm_slot)])
+def analyze_and_create_course_structure(
     request: CourseAnalyzeRequest,
     db: Session = Depends(get_db)
 ):
@@ -358,7 +777,9 @@ async def analyze_and_create_course_structure(
             content=video.transcription,
             source_type="transcript",
             language=request.language,
-            duration_minutes=video.audio_summary_duration
+            duration_minutes=video.audio_summary_duration,
+            video_id=video.id,
+            use_cache=not request.regenerate
         )
 
         return {
@@ -373,10 +794,9 @@ async def analyze_and_create_course_structure(
         raise HTTPException(status_code=500, detail=f"Failed to analyze content: {str(e)}")
 
 
-@app.post("/api/course/generate")
-async def generate_complete_course(
+@app.post("/api/course/generate", dependencies=[Depends(deck_assets_ready), Depends(llm_slot)])
+def generate_complete_course(
     request: CourseGenerateRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -400,14 +820,16 @@ async def generate_complete_course(
             content=video.transcription,
             source_type="transcript",
             language=request.language,
-            duration_minutes=video.audio_summary_duration
+            duration_minutes=video.audio_summary_duration,
+            video_id=video.id,
+            use_cache=not request.regenerate
         )
 
         # Step 2: Generate slides
-        slide_generator.apply_theme(request.theme)
-        slides_html = slide_generator.create_slide_deck(
+        slides_html, slide_chapters = slide_generator.render_deck(
             course_data=course_structure,
-            language=request.language
+            language=request.language,
+            theme=request.theme
         )
 
         # Step 3: Generate quiz
@@ -420,43 +842,18 @@ async def generate_complete_course(
         # Step 4: Assemble complete course
         course_id = f"course_{request.video_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
 
-        course_package = course_assembler.assemble_course(
+        course_package = assemble_and_save_course(
+            db=db,
+            video=video,
+            course_id=course_id,
             course_structure=course_structure,
             slides_html=slides_html,
             quiz_data=quiz_data,
-            course_id=course_id,
-            metadata={
-                "video_id": request.video_id,
-                "video_filename": video.filename,
-                "language": request.language,
-                "theme": request.theme,
-                "num_questions": request.num_questions
-            }
-        )
-
-        # Create ZIP in background
-        background_tasks.add_task(course_assembler.export_to_zip, course_id)
-
-        # Save course to database
-        import json
-        db_course = Course(
-            video_id=request.video_id,
-            course_id=course_id,
-            title=course_structure.get("course", {}).get("title", ""),
-            description=course_structure.get("course", {}).get("description", ""),
-            course_dir=course_package["course_dir"],
-            slides_path=course_package["files"]["slides"],
-            quiz_path=course_package["files"]["quiz_html"],
-            viewer_path=course_package["files"]["viewer"],
             language=request.language,
             theme=request.theme,
-            total_slides=course_structure.get("course", {}).get("total_slides", 0),
-            total_questions=len(quiz_data.get("quiz", {}).get("questions", [])),
-            course_structure=json.dumps(course_structure, ensure_ascii=False)
+            num_questions=request.num_questions,
+            slide_chapters=slide_chapters
         )
-        db.add(db_course)
-        db.commit()
-        db.refresh(db_course)
 
         return {
             "message": "Course generated successfully",
@@ -474,11 +871,260 @@ async def generate_complete_course(
         raise HTTPException(status_code=500, detail=f"Failed to generate course: {str(e)}")
 
 
-@app.post("/api/course/generate-slides")
-async def generate_slides_only(
+@app.post("/api/course/generate-stream", dependencies=[Depends(deck_assets_ready)])
+async def generate_course_stream(
+    request: CourseGenerateRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Generate a complete course, streaming progress as NDJSON
+    Emits the outline first, then each chapter's slides and questions as soon
+    as they are ready, and finally the assembled course
+    """
+    video = db.query(Video).filter(Video.id == request.video_id).first()
+    if not video:
+        raise HTTPException(status_code=404, detail="Video not found")
+
+    if video.processing_status != "completed":
+        raise HTTPException(status_code=400, detail="Video processing not completed yet")
+
+    if not video.transcription:
+        raise HTTPException(status_code=400, detail="Video transcription not available")
+
+    # The pipeline waits for its LLM slot, in the place reserved here, once
+    # the stream has started
+    llm_ticket = admission.check("llm")
+
+    video_id = video.id
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+
+    def emit(event: Optional[dict]):
+        loop.call_soon_threadsafe(queue.put_nowait, event)
+
+    def run_pipeline():
+        # Runs in a worker thread with its own session; the request session
+        # is closed once the streaming response starts
+        worker_db = SessionLocal()
+        try:
+            worker_video = worker_db.query(Video).filter(Video.id == video_id).first()
+
+            # Step 1: Create course structure
+            course_structure = course_structurer.analyze_content(
+                content=worker_video.transcription,
+                source_type="transcript",
+                language=request.language,
+                duration_minutes=worker_video.audio_summary_duration,
+                video_id=worker_video.id,
+                use_cache=not request.regenerate
+            )
+            course = course_structure.get("course", {})
+            emit({
+                "event": "outline",
+                "title": course.get("title", ""),
+                "description": course.get("description", ""),
+                "duration": course.get("duration", ""),
+                "difficulty": course.get("difficulty", ""),
+                "total_slides": course.get("total_slides", 0),
+                "chapters": [
+                    {
+                        "number": chapter.get("number"),
+                        "title": chapter.get("title", ""),
+                        "duration": chapter.get("duration", "")
+                    }
+                    for chapter in course.get("chapters", [])
+                ]
+            })
+
+            # Step 2 + 3: Quiz questions per chapter, each chapter streamed with its slides
+            def on_chapter_ready(chapter: dict, questions: list):
+                emit({
+                    "event": "chapter",
+                    "number": chapter.get("number"),
+                    "title": chapter.get("title", ""),
+                    "slides_html": slide_generator.create_chapter_slides(chapter, theme=request.theme),
+                    "questions": questions
+                })
+
+            quiz_data = quiz_generator.generate_quiz(
+                course_data=course_structure,
+                num_questions=request.num_questions,
+                language=request.language,
+                on_chapter_ready=on_chapter_ready
+            )
+            slides_html, slide_chapters = slide_generator.render_deck(
+                course_data=course_structure,
+                language=request.language,
+                theme=request.theme
+            )
+
+            # Step 4: Assemble complete course
+            course_id = f"course_{video_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            course_package = assemble_and_save_course(
+                db=worker_db,
+                video=worker_video,
+                course_id=course_id,
+                course_structure=course_structure,
+                slides_html=slides_html,
+                quiz_data=quiz_data,
+                language=request.language,
+                theme=request.theme,
+                num_questions=request.num_questions,
+                slide_chapters=slide_chapters
+            )
+
+            emit({
+                "event": "complete",
+                "message": "Course generated successfully",
+                "video_id": video_id,
+                "course_id": course_id,
+                "course_package": course_package,
+                "course_title": course.get("title", ""),
+                "total_slides": course.get("total_slides", 0),
+                "total_questions": len(quiz_data.get("quiz", {}).get("questions", []))
+            })
+
+        except Exception as e:
+            emit({"event": "error", "detail": f"Failed to generate course: {str(e)}"})
+        finally:
+            worker_db.close()
+            emit(None)
+
+    def run_admitted():
+        with admission.slot("llm", ticket=llm_ticket), log_context(video_id=video_id):
+            run_pipeline()
+
+    async def event_stream():
+        pipeline = loop.run_in_executor(None, run_admitted)
+        yield json.dumps({"event": "started", "video_id": video_id}) + "\n"
+        while True:
+            event = await queue.get()
+            if event is None:
+                break
+            yield json.dumps(event, ensure_ascii=False, default=str) + "\n"
+        await pipeline
+
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+
+@app.post("/api/course/generate-multilang", dependencies=[Depends(deck_assets_ready), Depends(llm_slot)])
+def generate_multilanguage_course(
+    request: CourseMultiLanguageRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Generate one course in several languages from a single structuring pass
+    The structure and quiz are created once, then translated concurrently,
+    so every language variant has the same chapters and questions
+    """
+    try:
+        languages = list(dict.fromkeys(request.languages))
+        if not languages:
+            raise HTTPException(status_code=400, detail="At least one language is required")
+
+        video = db.query(Video).filter(Video.id == request.video_id).first()
+        if not video:
+            raise HTTPException(status_code=404, detail="Video not found")
+
+        if video.processing_status != "completed":
+            raise HTTPException(status_code=400, detail="Video processing not completed yet")
+
+        if not video.transcription:
+            raise HTTPException(status_code=400, detail="Video transcription not available")
+
+        source_language = languages[0]
+
+        # Step 1: Structure and quiz once, in the first language
+        course_structure = course_structurer.analyze_content(
+            content=video.transcription,
+            source_type="transcript",
+            language=source_language,
+            duration_minutes=video.audio_summary_duration,
+            video_id=video.id,
+            use_cache=not request.regenerate
+        )
+        quiz_data = quiz_generator.generate_quiz(
+            course_data=course_structure,
+            num_questions=request.num_questions,
+            language=source_language
+        )
+
+        # Step 2: Translate structure and quiz into the other languages concurrently
+        # Languages whose translation failed are reported, not published half-translated
+        translated, failed_languages = course_translator.translate_course(
+            course_data=course_structure,
+            quiz_data=quiz_data,
+            target_languages=languages[1:],
+            source_language=source_language
+        )
+        variants = {source_language: (course_structure, quiz_data), **translated}
+
+        # Step 3: Render and assemble every language variant
+        group_id = f"course_{request.video_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        courses = []
+        for language in languages:
+            if language not in variants:
+                continue
+            variant_structure, variant_quiz = variants[language]
+            course_id = f"{group_id}_{language}"
+
+            slides_html, slide_chapters = slide_generator.render_deck(
+                course_data=variant_structure,
+                language=language,
+                theme=request.theme
+            )
+
+            course_package = assemble_and_save_course(
+                db=db,
+                video=video,
+                course_id=course_id,
+                course_structure=variant_structure,
+                slides_html=slides_html,
+                quiz_data=variant_quiz,
+                language=language,
+                theme=request.theme,
+                num_questions=request.num_questions,
+                extra_metadata={
+                    "language_group": group_id,
+                    "source_language": source_language,
+                    "translated": language != source_language
+                },
+                slide_chapters=slide_chapters
+            )
+
+            courses.append({
+                "language": language,
+                "course_id": course_id,
+                "course_package": course_package,
+                "course_title": variant_structure.get("course", {}).get("title", ""),
+                "total_slides": variant_structure.get("course", {}).get("total_slides", 0),
+                "total_questions": len(variant_quiz.get("quiz", {}).get("questions", []))
+            })
+
+        return {
+            "message": (
+                "Multi-language course generated successfully" if not failed_languages
+                else "Multi-language course generated; some translations failed"
+            ),
+            "video_id": request.video_id,
+            "language_group": group_id,
+            "source_language": source_language,
+            "courses": courses,
+            "failed_languages": failed_languages
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to generate multi-language course: {str(e)}")
+
+
+@app.post("/api/course/generate-slides", dependencies=[Depends(deck_assets_ready), Depends(llm_slot)])
+def generate_slides_only(
     video_id: int,
     theme: str = Query("light", description="Slide theme: light, dark, or corporate"),
     language: str = Query("en", description="Language code"),
+    regenerate: bool = Query(False, description="Structure the transcript again instead of reusing a cached outline"),
     db: Session = Depends(get_db)
 ):
     """Generate slides from existing course structure"""
@@ -494,14 +1140,17 @@ async def generate_slides_only(
         course_structure = course_structurer.analyze_content(
             content=video.transcription,
             source_type="transcript",
-            language=language
+            language=language,
+            duration_minutes=video.audio_summary_duration,
+            video_id=video.id,
+            use_cache=not regenerate
         )
 
         # Generate slides
-        slide_generator.apply_theme(theme)
         slides_html = slide_generator.create_slide_deck(
             course_data=course_structure,
-            language=language
+            language=language,
+            theme=theme
         )
 
         return {
@@ -517,14 +1166,14 @@ async def generate_slides_only(
         raise HTTPException(status_code=500, detail=f"Failed to generate slides: {str(e)}")
 
 
-@app.post("/api/course/generate-quiz")
-async def generate_quiz_only(
+@app.post("/api/course/generate-quiz", dependencies=[Depends(llm_slot)])
+def generate_quiz_only(
     video_id: int,
     num_questions: int = Query(10, description="Number of questions"),
     language: str = Query("en", description="Language code"),
     db: Session = Depends(get_db)
 ):
-    """Generate quiz from existing course structure"""
+    """Generate quiz from the question bank, topping up with new questions if needed"""
     try:
         video = db.query(Video).filter(Video.id == video_id).first()
         if not video:
@@ -533,53 +1182,372 @@ async def generate_quiz_only(
         if not video.transcription:
             raise HTTPException(status_code=400, detail="Video transcription not available")
 
-        # Create course structure first
-        course_structure = course_structurer.analyze_content(
-            content=video.transcription,
-            source_type="transcript",
-            language=language
+        latest_course = db.query(Course).filter(
+            Course.video_id == video_id,
+            Course.language == language
+        ).order_by(Course.created_at.desc()).first()
+
+        # Quiz assembled from the bank; structure is only needed for top-ups
+        quiz_data = question_bank.build_quiz(
+            db=db,
+            quiz_generator=quiz_generator,
+            video_id=video_id,
+            language=language,
+            title=latest_course.title if latest_course and latest_course.title else "Course",
+            load_course_data=lambda: load_course_structure(video, language, db),
+            num_questions=num_questions
         )
 
-        # Generate quiz
-        quiz_data = quiz_generator.generate_quiz(
+        return {
+            "message": "Quiz generated successfully",
+            "quiz_data": quiz_data,
+            "total_questions": len(quiz_data.get("quiz", {}).get("questions", []))
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to generate quiz: {str(e)}")
+
+
+@app.post("/api/course/{course_id}/quiz/variant", dependencies=[Depends(llm_slot)])
+def create_quiz_variant(
+    course_id: str,
+    num_questions: int = Query(None, description="Number of questions (defaults to the course quiz size)"),
+    publish: bool = Query(False, description="Replace the course quiz with this variant"),
+    db: Session = Depends(get_db)
+):
+    """Create a randomized quiz variant (e.g. for a retake) from the question bank"""
+    try:
+        import json
+        course = db.query(Course).filter(Course.course_id == course_id).first()
+        if not course:
+            raise HTTPException(status_code=404, detail="Course not found")
+
+        language = course.language or "en"
+        quiz_data = question_bank.build_quiz(
+            db=db,
+            quiz_generator=quiz_generator,
+            video_id=course.video_id,
+            language=language,
+            title=course.title or "Course",
+            load_course_data=lambda: json.loads(course.course_structure),
+            num_questions=num_questions or course.total_questions or 10,
+            course_id=course_id
+        )
+
+        if publish:
+            course_assembler.update_quiz(course_id, quiz_data, course.title or "Course", language)
+            course.total_questions = len(quiz_data.get("quiz", {}).get("questions", []))
+            db.commit()
+
+        return {
+            "message": "Quiz variant created successfully",
+            "course_id": course_id,
+            "published": publish,
+            "quiz_data": quiz_data,
+            "total_questions": len(quiz_data.get("quiz", {}).get("questions", []))
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to create quiz variant: {str(e)}")
+
+
+@app.post("/api/course/{course_id}/rerender", dependencies=[Depends(deck_assets_ready)])
+def rerender_course(
+    course_id: str,
+    request: CourseRerenderRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Re-render slides, quiz and viewer of an existing course with a new theme
+    or label language, from its stored structure and quiz (no LLM calls)
+    """
+    try:
+        import json
+        import time
+        started = time.perf_counter()
+
+        course = db.query(Course).filter(Course.course_id == course_id).first()
+        if not course:
+            raise HTTPException(status_code=404, detail="Course not found")
+
+        quiz_path = os.path.join(course.course_dir, "quiz_data.json")
+        if not course.course_structure or not os.path.exists(quiz_path):
+            raise HTTPException(status_code=400, detail="Course structure or quiz not available")
+
+        theme = request.theme or course.theme or "light"
+        language = request.language or course.language or "en"
+
+        course_structure = json.loads(course.course_structure)
+        with open(quiz_path, 'r', encoding='utf-8') as f:
+            quiz_data = json.load(f)
+
+        slides_html, slide_chapters = slide_generator.render_deck(
+            course_data=course_structure,
+            language=language,
+            theme=theme
+        )
+
+        course_package = course_assembler.rerender_course(
+            course_id=course_id,
+            course_structure=course_structure,
+            slides_html=slides_html,
+            quiz_data=quiz_data,
+            language=language,
+            metadata={"theme": theme, "label_language": language},
+            slide_chapters=slide_chapters
+        )
+        if not course_package:
+            raise HTTPException(status_code=404, detail="Course files not found")
+
+        course.theme = theme
+        db.commit()
+
+        return {
+            "message": "Course re-rendered successfully",
+            "course_id": course_id,
+            "theme": theme,
+            "language": language,
+            "render_ms": round((time.perf_counter() - started) * 1000, 1),
+            "course_package": course_package
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to re-render course: {str(e)}")
+
+
+@app.post("/api/courses/rerender", dependencies=[Depends(deck_assets_ready)])
+def rerender_catalog(request: CatalogRerenderRequest, db: Session = Depends(get_db)):
+    """
+    Re-render many courses at once from their stored structures and quizzes,
+    rendering the slide decks across a process pool (no LLM calls)
+    """
+    try:
+        import time
+        started = time.perf_counter()
+
+        query = db.query(Course).filter(Course.course_structure.isnot(None))
+        if request.course_ids:
+            query = query.filter(Course.course_id.in_(request.course_ids))
+
+        courses, jobs, quizzes, skipped = [], [], [], []
+        for course in query.all():
+            quiz_path = os.path.join(course.course_dir or "", "quiz_data.json")
+            if not os.path.exists(quiz_path):
+                skipped.append(course.course_id)
+                continue
+
+            with open(quiz_path, 'r', encoding='utf-8') as f:
+                quizzes.append(json.load(f))
+            courses.append(course)
+            theme = request.theme or course.theme or "light"
+            jobs.append({
+                "course_data": json.loads(course.course_structure),
+                "theme": theme,
+                "language": course.language or "en",
+                "assets": course_assembler.assets.deck_assets(theme)
+            })
+
+        # Rendering is CPU-bound and spread across a process pool
+        decks = render_decks_parallel(jobs)
+
+        rerendered = []
+        for course, job, quiz_data, (slides_html, slide_chapters) in zip(courses, jobs, quizzes, decks):
+            course_package = course_assembler.rerender_course(
+                course_id=course.course_id,
+                course_structure=job["course_data"],
+                slides_html=slides_html,
+                quiz_data=quiz_data,
+                language=job["language"],
+                metadata={"theme": job["theme"], "label_language": job["language"]},
+                slide_chapters=slide_chapters
+            )
+            if not course_package:
+                skipped.append(course.course_id)
+                continue
+
+            course.theme = job["theme"]
+            rerendered.append(course.course_id)
+
+        db.commit()
+
+        return {
+            "message": f"Re-rendered {len(rerendered)} courses",
+            "rerendered": rerendered,
+            "skipped": skipped,
+            "render_ms": round((time.perf_counter() - started) * 1000, 1)
+        }
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to re-render courses: {str(e)}")
+
+
+@app.post("/api/course/{course_id}/quiz/regenerate-duplicates", dependencies=[Depends(llm_slot)])
+def regenerate_duplicate_questions(course_id: str, db: Session = Depends(get_db)):
+    """Regenerate only the near-duplicate questions of a course quiz"""
+    try:
+        import json
+        course = db.query(Course).filter(Course.course_id == course_id).first()
+        if not course:
+            raise HTTPException(status_code=404, detail="Course not found")
+
+        quiz_path = os.path.join(course.course_dir, "quiz_data.json")
+        if not course.course_structure or not os.path.exists(quiz_path):
+            raise HTTPException(status_code=400, detail="Course quiz or structure not available")
+
+        course_structure = json.loads(course.course_structure)
+        with open(quiz_path, 'r', encoding='utf-8') as f:
+            quiz_data = json.load(f)
+
+        language = course.language or "en"
+        quiz_data = quiz_generator.regenerate_duplicates(
+            quiz_data=quiz_data,
             course_data=course_structure,
-            num_questions=num_questions,
+            reference_questions=question_bank.get_questions(
+                db, course.video_id, language, exclude_course_id=course_id
+            ),
             language=language
         )
 
+        course_assembler.update_quiz(course_id, quiz_data, course.title or "Course", language)
+        question_bank.add_questions(
+            db, course.video_id, language,
+            quiz_data.get("quiz", {}).get("questions", []), course_id
+        )
+
         return {
-            "message": "Quiz generated successfully",
-            "quiz_data": quiz_data,
+            "message": "Duplicate questions regenerated",
+            "course_id": course_id,
+            "regeneration_report": quiz_data.get("regeneration_report", {}),
             "total_questions": len(quiz_data.get("quiz", {}).get("questions", []))
         }
 
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to generate quiz: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to regenerate questions: {str(e)}")
+
+
+def record_export_path(course_id: str, zip_path: str):
+    """Records the cached export archive of a course"""
+    db = SessionLocal()
+    try:
+        course = db.query(Course).filter(Course.course_id == course_id).first()
+        if course:
+            course.zip_path = zip_path
+            db.commit()
+    finally:
+        db.close()
 
 
 @app.get("/api/course/{course_id}/export")
 async def export_course(course_id: str):
-    """Export course as ZIP file"""
+    """
+    Export course as ZIP file
+
+    Served from the export cache when the course files haven't changed;
+    otherwise streamed while the new version is cached. Concurrent exports
+    of the same version share one build.
+    """
+    export_ticket = admission.check("export")
     try:
-        zip_path = course_assembler.export_to_zip(course_id)
+        # Lists and hashes the course files
+        export = await run_in_threadpool(
+            export_cache.open,
+            course_id,
+            lambda zip_path: record_export_path(course_id, zip_path)
+        )
 
-        if not zip_path or not os.path.exists(zip_path):
+        if not export:
             raise HTTPException(status_code=404, detail="Course package not found")
 
-        return FileResponse(
-            zip_path,
+        kind, target = export
+        if kind == "file":
+            # Cached archives are plain file responses, outside the export slots
+            export_ticket.release()
+            return FileResponse(
+                target,
+                media_type="application/zip",
+                filename=f"{course_id}.zip"
+            )
+
+        # Sync generator: Starlette iterates it in a worker thread
+        return StreamingResponse(
+            admission.stream("export", target, export_ticket),
             media_type="application/zip",
-            filename=f"{course_id}.zip"
+            headers={"Content-Disposition": f'attachment; filename="{course_id}.zip"'}
         )
 
     except HTTPException:
+        export_ticket.release()
         raise
     except Exception as e:
+        export_ticket.release()
         raise HTTPException(status_code=500, detail=f"Failed to export course: {str(e)}")
 
 
+@app.post("/api/courses/export")
+async def export_courses(request: BulkExportRequest, db: Session = Depends(get_db)):
+    """
+    Export many courses as one ZIP, streamed while it is built
+
+    Each course directory is included under its course ID, shared assets
+    once, and a manifest.json lists the exported courses.
+    """
+    try:
+        query = db.query(Course.course_id, Course.title, Course.language, Course.created_at)
+        if request.course_ids is not None:
+            query = query.filter(Course.course_id.in_(request.course_ids))
+        if request.created_after:
+            query = query.filter(Course.created_at >= request.created_after)
+        if request.created_before:
+            query = query.filter(Course.created_at < request.created_before)
+        if request.language:
+            query = query.filter(Course.language == request.language)
+
+        courses = [
+            {
+                "course_id": row.course_id,
+                "title": row.title,
+                "language": row.language,
+                "created_at": row.created_at.isoformat() if row.created_at else None
+            }
+            for row in query.order_by(Course.created_at).all()
+        ]
+        if not courses:
+            raise HTTPException(status_code=404, detail="No courses match the filter")
+
+        export_filter = {
+            "course_ids": request.course_ids,
+            "created_after": request.created_after.isoformat() if request.created_after else None,
+            "created_before": request.created_before.isoformat() if request.created_before else None,
+            "language": request.language
+        }
+        entries = course_assembler.bulk_export_entries(
+            courses,
+            {key: value for key, value in export_filter.items() if value is not None}
+        )
+
+        filename = f"courses_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+        export_ticket = admission.check("export")
+        # Sync generator: Starlette iterates it in a worker thread
+        return StreamingResponse(
+            admission.stream("export", stream_zip(entries), export_ticket),
+            media_type="application/zip",
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to export courses: {str(e)}")
+
+
 @app.get("/api/course/{course_id}/files")
 async def get_course_files(course_id: str):
     """Get URLs to course files (slides, quiz, viewer)"""
@@ -614,13 +1582,31 @@ async def get_course_files(course_id: str):
         raise HTTPException(status_code=500, detail=f"Failed to get course files: {str(e)}")
 
 
-@app.get("/course-files/{course_id}/{filename}")
-async def serve_course_file(course_id: str, filename: str):
-    """Serve individual course files"""
-    try:
-        file_path = os.path.join("generated_courses", course_id, filename)
+@app.get("/course-files/_assets/{path:path}")
+async def serve_course_asset(path: str, request: Request):
+    """Serve shared course assets; names are content-hashed, so they never change"""
+    file_path = course_assembler.assets.resolve(path)
+    if not file_path:
+        raise HTTPException(status_code=404, detail="Asset not found")
+
+    media_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+    return serve_file(request, file_path, media_type=media_type, cache_control=IMMUTABLE_CACHE_CONTROL)
+
 
-        if not os.path.exists(file_path):
+@app.get("/course-files/{course_id}/{filename:path}")
+async def serve_course_file(course_id: str, filename: str, request: Request):
+    """Serve individual course files, including chapter fragments of chunked decks"""
+    try:
+        courses_root = os.path.realpath("generated_courses")
+        course_dir = os.path.realpath(os.path.join(courses_root, course_id))
+        file_path = os.path.realpath(os.path.join(course_dir, filename))
+
+        # Keep requests inside one course directory
+        if (
+            os.path.dirname(course_dir) != courses_root
+            or not file_path.startswith(course_dir + os.sep)
+            or not os.path.isfile(file_path)
+        ):
             raise HTTPException(status_code=404, detail="File not found")
 
         # Determine media type
@@ -628,7 +1614,7 @@ async def serve_course_file(course_id: str, filename: str):
         if filename.endswith(".json"):
             media_type = "application/json"
 
-        return FileResponse(file_path, media_type=media_type)
+        return serve_file(request, file_path, media_type=media_type, cache_control=COURSE_FILE_CACHE_CONTROL)
 
     except HTTPException:
         raise
@@ -712,6 +1698,7 @@ async def delete_course(course_id: str, db: Session = Depends(get_db)):
         import shutil
         if course.course_dir and os.path.exists(course.course_dir):
             shutil.rmtree(course.course_dir)
+        export_cache.remove(course_id)
 
         # Delete from database
         db.delete(course)
@@ -764,6 +1751,8 @@ async def cleanup_old_courses(
                 # Delete files
                 shutil.rmtree(course.course_dir)
 
+            freed_space += export_cache.remove(course.course_id)
+
             # Delete from database
             db.delete(course)
             deleted_count += 1
@@ -841,6 +1830,35 @@ async def get_storage_stats(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to get storage stats: {str(e)}")
 
 
+@app.get("/api/courses/precompute-stats")
+async def get_precompute_stats():
+    """
+    Get speculative structure precomputation counters and budget use
+    """
+    return structure_precomputer.get_stats()
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """
+    Prometheus metrics: request latency per route, stage durations, LLM
+    calls and tokens, queue depths and in-flight jobs
+
+    With several workers (METRICS_MULTIPROC_DIR), whichever worker answers
+    reports all of them: counters and histograms summed over the workers'
+    latest snapshots, gauges per live worker with a worker label.
+    """
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@app.get("/api/admission-stats")
+async def get_admission_stats():
+    """
+    Get concurrency limits, queue depths and rejection counters per workload class
+    """
+    return admission.stats()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,450 @@
+"""
+Metrics
+In-process counters, gauges and histograms rendered in the Prometheus text
+format: request latency per route, duration of each pipeline stage, LLM
+calls and tokens, and gauges read at scrape time (queues, in-flight jobs)
+
+With several worker processes behind one port, set METRICS_MULTIPROC_DIR
+(run_backend.py --prod does): each worker writes its values there and
+whichever worker answers the scrape reports the sum across all of them.
+Counters and histograms are summed; gauges are reported per worker, with a
+worker label (unless they set one themselves).
+"""
+
+import atexit
+import functools
+import inspect
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from decouple import config
+
+logger = logging.getLogger(__name__)
+
+
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+# Directory shared by the workers of one server (empty: single process)
+METRICS_MULTIPROC_DIR = config('METRICS_MULTIPROC_DIR', default='')
+# How often a worker writes its values for the others to read
+METRICS_FLUSH_SECONDS = config('METRICS_FLUSH_SECONDS', default=5.0, cast=float)
+
+PREFIX = "video_analyzer_"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# HTTP requests: milliseconds (cached files) to seconds (LLM calls)
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Pipeline stages and model calls: a fraction of a second to several minutes
+STAGE_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic count per label set"""
+
+    def __init__(self, name: str, documentation: str):
+        self.name = PREFIX + name
+        self.documentation = documentation
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def values(self) -> Dict[Labels, float]:
+        with self._lock:
+            return dict(self._values)
+
+    @staticmethod
+    def merge(values: Dict[Labels, float], other: Dict[Labels, float]):
+        for labels, value in other.items():
+            values[labels] = values.get(labels, 0) + value
+
+    def render(self, values: Optional[Dict[Labels, float]] = None) -> Iterator[str]:
+        """Renders this process's values, or the given (merged) ones"""
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in sorted((self.values() if values is None else values).items()):
+            yield f"{self.name}{_format_labels(labels)} {_format_value(value)}"
+
+
+class Histogram:
+    """Observations bucketed per label set, with sum and count"""
+
+    def __init__(self, name: str, documentation: str, buckets: Tuple[float, ...] = STAGE_BUCKETS):
+        self.name = PREFIX + name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # label set -> [per-bucket counts..., sum, count]
+        self._values: Dict[Labels, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[i] += 1
+                    break
+            entry[-2] += value
+            entry[-1] += 1
+
+    def values(self) -> Dict[Labels, List[float]]:
+        with self._lock:
+            return {labels: list(entry) for labels, entry in self._values.items()}
+
+    @staticmethod
+    def merge(values: Dict[Labels, List[float]], other: Dict[Labels, List[float]]):
+        for labels, entry in other.items():
+            current = values.get(labels)
+            if current is None:
+                values[labels] = list(entry)
+            elif len(current) == len(entry):
+                values[labels] = [a + b for a, b in zip(current, entry)]
+
+    def render(self, values: Optional[Dict[Labels, List[float]]] = None) -> Iterator[str]:
+        """Renders this process's values, or the given (merged) ones"""
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, entry in sorted((self.values() if values is None else values).items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, entry):
+                cumulative += count
+                yield f"{self.name}_bucket{_format_labels(labels, ('le', _format_value(bound)))} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(labels)} {_format_value(entry[-2])}"
+            yield f"{self.name}_count{_format_labels(labels)} {_format_value(entry[-1])}"
+
+
+class Gauge:
+    """Values read from a callback at scrape time"""
+
+    def __init__(self, name: str, documentation: str, read: Callable[[], Dict[Labels, float]], metric_type: str = "gauge"):
+        """
+        Args:
+            name: Metric name (without the common prefix)
+            documentation: HELP text
+            read: Returns {labels: value}; () for an unlabelled value
+            metric_type: "gauge", or "counter" for totals kept by another module
+        """
+        self.name = PREFIX + name
+        self.documentation = documentation
+        self.read = read
+        self.metric_type = metric_type
+
+    def values(self) -> Dict[Labels, float]:
+        try:
+            return dict(self.read())
+        except Exception as e:
+            logger.error("Metrics gauge failed", extra={"metric": self.name, "error": str(e)})
+            return {}
+
+    def render(self, values: Optional[Dict[Labels, float]] = None) -> Iterator[str]:
+        """Renders the values read now, or the given ones (every worker's)"""
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.metric_type}"
+        for labels, value in sorted((self.values() if values is None else values).items()):
+            yield f"{self.name}{_format_labels(labels)} {_format_value(value)}"
+
+
+request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Time to complete HTTP requests, by method, route template and status",
+    REQUEST_BUCKETS
+)
+stage_duration = Histogram(
+    "stage_duration_seconds",
+    "Duration of processing and course generation stages, by stage and outcome"
+)
+llm_duration = Histogram(
+    "llm_request_duration_seconds",
+    "Duration of model API calls, by model, caller, operation and outcome"
+)
+llm_calls = Counter("llm_requests_total", "Model API calls, by model, caller, operation and outcome")
+llm_tokens = Counter("llm_tokens_total", "Tokens used by model API calls, by model, caller and kind (prompt, completion)")
+
+_gauges: List[Gauge] = []
+
+
+def register_gauge(name: str, documentation: str, read: Callable[[], Dict[Labels, float]], metric_type: str = "gauge"):
+    """Adds a metric read at scrape time (e.g. queue depths owned by other modules)"""
+    _gauges.append(Gauge(name, documentation, read, metric_type))
+
+
+_collected = [request_duration, stage_duration, llm_duration, llm_calls, llm_tokens]
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format"""
+
+    if METRICS_MULTIPROC_DIR:
+        return _render_multiprocess()
+
+    lines = []
+    for metric in _collected + _gauges:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ---- Several worker processes ----
+
+_flusher: Optional[threading.Thread] = None
+_flusher_lock = threading.Lock()
+
+
+def _labels_from_json(labels) -> Labels:
+    return tuple((name, value) for name, value in labels)
+
+
+def _snapshot(include_gauges: bool = True) -> Dict:
+    """This process's values, in the form written to METRICS_MULTIPROC_DIR"""
+    return {
+        "pid": os.getpid(),
+        "collected": {metric.name: list(metric.values().items()) for metric in _collected},
+        "gauges": {gauge.name: list(gauge.values().items()) for gauge in _gauges} if include_gauges else {}
+    }
+
+
+def flush(include_gauges: bool = True):
+    """Writes this process's values for the other workers' scrapes"""
+
+    if not METRICS_MULTIPROC_DIR:
+        return
+    try:
+        os.makedirs(METRICS_MULTIPROC_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=METRICS_MULTIPROC_DIR, prefix=".tmp-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(_snapshot(include_gauges), f)
+        os.replace(tmp_path, os.path.join(METRICS_MULTIPROC_DIR, f"{os.getpid()}.json"))
+    except OSError as e:
+        logger.error("Writing metrics snapshot failed", extra={"error": str(e)})
+
+
+def start_flusher():
+    """
+    Starts writing this worker's values every METRICS_FLUSH_SECONDS (and
+    once more at exit, without gauges, which die with the process)
+    """
+
+    global _flusher
+    if not METRICS_MULTIPROC_DIR or not METRICS_ENABLED:
+        return
+    with _flusher_lock:
+        if _flusher is not None:
+            return
+
+        def run():
+            while True:
+                flush()
+                time.sleep(METRICS_FLUSH_SECONDS)
+
+        _flusher = threading.Thread(target=run, name="metrics-flusher", daemon=True)
+        _flusher.start()
+        atexit.register(flush, include_gauges=False)
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _other_snapshots() -> List[Dict]:
+    """Snapshots written by the other workers (including ones that exited: their counts still happened)"""
+
+    snapshots = []
+    try:
+        names = os.listdir(METRICS_MULTIPROC_DIR)
+    except OSError:
+        return snapshots
+    for name in names:
+        if not name.endswith(".json") or name == f"{os.getpid()}.json":
+            continue
+        try:
+            with open(os.path.join(METRICS_MULTIPROC_DIR, name), "r", encoding="utf-8") as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return snapshots
+
+
+def _with_worker(labels: Labels, pid: int) -> Labels:
+    if any(name == "worker" for name, _ in labels):
+        return labels
+    return labels + (("worker", str(pid)),)
+
+
+def _render_multiprocess() -> str:
+    """Counters and histograms summed over every worker, gauges per worker"""
+
+    snapshots = _other_snapshots()
+    lines = []
+    for metric in _collected:
+        values = metric.values()
+        for snapshot in snapshots:
+            other = snapshot.get("collected", {}).get(metric.name, [])
+            metric.merge(values, {_labels_from_json(labels): value for labels, value in other})
+        lines.extend(metric.render(values))
+
+    live_snapshots = [snapshot for snapshot in snapshots if _alive(snapshot.get("pid", 0))]
+    for gauge in _gauges:
+        values = {_with_worker(labels, os.getpid()): value for labels, value in gauge.values().items()}
+        for snapshot in live_snapshots:
+            for labels, value in snapshot.get("gauges", {}).get(gauge.name, []):
+                values[_with_worker(_labels_from_json(labels), snapshot["pid"])] = value
+        lines.extend(gauge.render(values))
+
+    return "\n".join(lines) + "\n"
+
+
+class _StageTimer:
+    """Context manager recording a stage's duration, labelled ok or error"""
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if METRICS_ENABLED:
+            stage_duration.observe(
+                time.perf_counter() - self.started,
+                stage=self.stage,
+                outcome="ok" if exc_type is None else "error"
+            )
+        return False
+
+
+def stage_timer(stage: str) -> _StageTimer:
+    """
+    Times the with block as one run of a stage
+
+    Args:
+        stage: extract, transcribe, summarize, tts, structure, slides, quiz, assemble, zip...
+    """
+    return _StageTimer(stage)
+
+
+def timed_stage(stage: str):
+    """
+    Decorator timing every call of a function as a stage
+
+    Generator functions are timed from the first item to exhaustion (or
+    until they are closed), so a streamed build counts in full.
+    """
+
+    def decorate(func):
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                with stage_timer(stage):
+                    yield from func(*args, **kwargs)
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage_timer(stage):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorate
+
+
+def record_llm_call(model: str, caller: str, operation: str, seconds: float, response=None, error: bool = False):
+    """
+    Counts a model API call and the tokens it reports
+
+    Args:
+        model: Model or deployment name sent with the call
+        caller: Module that made the call (video_processor, quiz_generator...)
+        operation: API used (chat.completions, audio.transcriptions, audio.speech)
+        seconds: Call duration
+        response: API response, read for its usage block if it has one
+        error: The call raised
+    """
+
+    if not METRICS_ENABLED:
+        return
+
+    outcome = "error" if error else "ok"
+    labels = {"model": model or "unknown", "caller": caller, "operation": operation}
+    llm_calls.inc(outcome=outcome, **labels)
+    llm_duration.observe(seconds, outcome=outcome, **labels)
+
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    for kind, attribute in (("prompt", "prompt_tokens"), ("completion", "completion_tokens"),
+                            ("prompt", "input_tokens"), ("completion", "output_tokens")):
+        count = getattr(usage, attribute, None)
+        if isinstance(count, int) and count:
+            llm_tokens.inc(count, kind=kind, model=labels["model"], caller=caller)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing each HTTP request until its response is complete
+
+    Requests are labelled with the route template (/video/{video_id}), not
+    the raw path, to keep the number of series bounded; unmatched paths
+    share the label "unmatched".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            request_duration.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status)
+            )
@@ -35,6 +35,10 @@ class Video(Base):
     audio_summary_path = Column(String, nullable=True)          # Path to generated TTS audio file
     audio_summary_duration = Column(Float, nullable=True)       # Duration of audio summary in seconds
 
+    # Processing progress, shared by all API workers
+    processing_stage = Column(String(20), nullable=True)        # Latest stage (progress.STAGES)
+    stage_seq = Column(Integer, default=0)                      # Stage transitions so far; SSE event id
+
 
 class ChatHistory(Base):
     __tablename__ = "chat_history"
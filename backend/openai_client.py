@@ -0,0 +1,83 @@
+"""
+OpenAI Client
+Creates OpenAI clients on first use, so API processes only pay for importing
+the SDK (about half a second) once they actually call a model, and records
+every call's latency and token usage in metrics
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from decouple import config
+
+from metrics import record_llm_call
+
+logger = logging.getLogger(__name__)
+
+
+_clients: Dict[Tuple[str, Optional[str]], object] = {}
+_lock = threading.Lock()
+
+
+class _Traced:
+    """
+    Attribute path into the SDK client (client.chat.completions...) whose
+    create() calls are recorded as LLM calls
+    """
+
+    def __init__(self, target, caller: str, path: str = ""):
+        self._target = target
+        self._caller = caller
+        self._path = path
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._target, name)
+        if name == "create" and callable(attribute):
+            return self._traced_create(attribute)
+        # Only descend into API resources (chat, audio...), not methods or values
+        if name.startswith("_") or callable(attribute) or not hasattr(attribute, "__dict__"):
+            return attribute
+        return _Traced(attribute, self._caller, f"{self._path}.{name}" if self._path else name)
+
+    def _traced_create(self, create):
+        def traced(*args, **kwargs):
+            started = time.perf_counter()
+            fields = {"model": kwargs.get("model"), "caller": self._caller, "operation": self._path}
+            try:
+                response = create(*args, **kwargs)
+            except Exception as e:
+                seconds = time.perf_counter() - started
+                record_llm_call(fields["model"], self._caller, self._path, seconds, error=True)
+                logger.warning("LLM call failed", extra={**fields, "seconds": round(seconds, 3), "error": str(e)})
+                raise
+            seconds = time.perf_counter() - started
+            record_llm_call(fields["model"], self._caller, self._path, seconds, response)
+            # One per generated question or translated batch: sampled
+            logger.info("LLM call", extra={**fields, "seconds": round(seconds, 3), "sampled": True})
+            return response
+        return traced
+
+
+def get_openai_client(base_url: Optional[str] = None, caller: str = "unknown"):
+    """
+    Shared OpenAI client for the configured API key
+
+    Args:
+        base_url: API base URL (the SDK default if None)
+        caller: Name the client's calls are attributed to in metrics
+
+    Returns:
+        openai.OpenAI instance (one per base URL), wrapped to record calls
+    """
+
+    key = (config('OPENAI_API_KEY'), base_url)
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                from openai import OpenAI
+                client = OpenAI(api_key=key[0], base_url=base_url)
+                _clients[key] = client
+    return _Traced(client, caller)
@@ -0,0 +1,200 @@
+"""
+Structure Precomputation
+Speculatively structures courses for freshly processed videos in spare
+capacity, so interactive course generation finds its structure cached
+"""
+
+import contextlib
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+from decouple import config
+
+from models import SessionLocal
+from course_models import StructureCache
+from logging_setup import log_context
+
+logger = logging.getLogger(__name__)
+
+
+class StructurePrecomputer:
+    """
+    Low-priority background worker that fills the course structure cache
+    """
+
+    def __init__(self, course_structurer, job_tracker=None, admission=None):
+        """
+        Args:
+            course_structurer: CourseStructurer whose cache is filled
+            job_tracker: JobTracker that shutdown drains (optional)
+            admission: AdmissionController whose LLM slots the calls share (optional)
+        """
+        self.course_structurer = course_structurer
+        self.job_tracker = job_tracker
+        self.admission = admission
+
+        languages = config('PRECOMPUTE_STRUCTURE_LANGUAGES', default='')
+        self.languages = [lang.strip() for lang in languages.split(',') if lang.strip()]
+        self.daily_budget = config('PRECOMPUTE_DAILY_BUDGET', default=50, cast=int)
+        self.num_workers = config('PRECOMPUTE_WORKERS', default=1, cast=int)
+        self.idle_poll_seconds = config('PRECOMPUTE_IDLE_POLL_SECONDS', default=2.0, cast=float)
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._workers: List[threading.Thread] = []
+        self._stopping = threading.Event()
+        # Calls started by this process that haven't stored a structure yet
+        self._reserved = 0
+        self.stats = {"enqueued": 0, "computed": 0, "skipped_cached": 0, "skipped_budget": 0, "failed": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.languages) and self.daily_budget > 0
+
+    def enqueue(self, video_id: int, transcription: str, duration_minutes: Optional[float] = None):
+        """
+        Queues structure generation for a processed video in every configured language
+
+        Args:
+            video_id: Processed video
+            transcription: Video transcript the structure is generated from
+            duration_minutes: Duration passed to the structurer, as interactive requests do
+        """
+
+        if not self.enabled or not transcription or self._stopping.is_set():
+            return
+
+        self._start_workers()
+        for language in self.languages:
+            self._queue.put({
+                "video_id": video_id,
+                "content": transcription,
+                "language": language,
+                "duration_minutes": duration_minutes
+            })
+            with self._lock:
+                self.stats["enqueued"] += 1
+
+    def _start_workers(self):
+        with self._lock:
+            if self._workers:
+                return
+            for i in range(max(1, self.num_workers)):
+                worker = threading.Thread(target=self._worker, name=f"structure-precompute-{i}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+    def stop(self):
+        """Stops taking queued jobs; the one in flight finishes (see JobTracker.drain)"""
+        self._stopping.set()
+
+    def _spent_today(self) -> int:
+        """
+        Structures precomputed today (UTC) by any worker process
+
+        The budget is counted in the shared cache table rather than in
+        memory, so running several API workers doesn't multiply it.
+        """
+
+        day_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        db = SessionLocal()
+        try:
+            return db.query(StructureCache).filter(
+                StructureCache.source == "precompute",
+                StructureCache.created_at >= day_start
+            ).count()
+        finally:
+            db.close()
+
+    def _take_budget(self) -> bool:
+        """Reserves one LLM call from today's budget"""
+        spent = self._spent_today()
+        with self._lock:
+            if spent + self._reserved >= self.daily_budget:
+                return False
+            self._reserved += 1
+            return True
+
+    def _release_budget(self):
+        with self._lock:
+            self._reserved -= 1
+
+    def _wait_until_idle(self):
+        """Yields to interactive structuring: waits until none is in flight"""
+        while self.course_structurer.interactive_calls > 0 and not self._stopping.is_set():
+            time.sleep(self.idle_poll_seconds)
+
+    def _worker(self):
+        while not self._stopping.is_set():
+            try:
+                job = self._queue.get(timeout=self.idle_poll_seconds)
+            except queue.Empty:
+                continue
+            try:
+                tracked = self.job_tracker.track("structure_precompute") if self.job_tracker else contextlib.nullcontext()
+                with tracked, log_context(video_id=job["video_id"], job_id=f"precompute-{job['video_id']}-{job['language']}"):
+                    self._run(job)
+            except Exception as e:
+                with self._lock:
+                    self.stats["failed"] += 1
+                logger.error("Error precomputing structure", extra={
+                    "video_id": job["video_id"], "language": job["language"], "error": str(e)
+                })
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job: Dict):
+        self._wait_until_idle()
+
+        cache_key = self.course_structurer.structure_cache_key(
+            job["content"], job["language"], job["duration_minutes"]
+        )
+        if self.course_structurer.get_cached_structure(cache_key, count_hit=False):
+            with self._lock:
+                self.stats["skipped_cached"] += 1
+            return
+
+        if self._stopping.is_set():
+            return
+
+        if not self._take_budget():
+            with self._lock:
+                self.stats["skipped_budget"] += 1
+            return
+
+        # Counted against the LLM limit like interactive calls
+        llm_slot = self.admission.slot("llm", admitted=True) if self.admission else contextlib.nullcontext()
+        try:
+            with llm_slot:
+                self.course_structurer.analyze_content(
+                    content=job["content"],
+                    source_type="transcript",
+                    language=job["language"],
+                    duration_minutes=job["duration_minutes"],
+                    video_id=job["video_id"],
+                    cache_source="precompute"
+                )
+        finally:
+            self._release_budget()
+        with self._lock:
+            self.stats["computed"] += 1
+
+    def get_stats(self) -> Dict:
+        """Returns counters plus queue depth and today's budget use"""
+        spent = self._spent_today() if self.enabled else 0
+        with self._lock:
+            return {
+                **self.stats,
+                "enabled": self.enabled,
+                "languages": self.languages,
+                "queued": self._queue.qsize(),
+                "budget_used": spent + self._reserved,
+                "daily_budget": self.daily_budget
+            }
+
+    def queue_depth(self) -> int:
+        """Jobs waiting in this process"""
+        return self._queue.qsize()
@@ -0,0 +1,91 @@
+"""
+Processing Progress
+Stage transitions of video processing, pushed to subscribers (the SSE
+endpoint) of the worker that runs the job as they happen. Stages are also
+recorded on the video row, which is how streams on other workers see them.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from typing import Dict, List, Tuple
+from decouple import config
+
+
+# Pipeline stages in order; "done" and "failed" end a run
+STAGES = ["pending", "extracting", "transcribing", "summarizing", "tts", "done", "failed"]
+TERMINAL_STAGES = {"done", "failed"}
+
+# Idle subscribers get a keep-alive this often
+PROGRESS_HEARTBEAT_SECONDS = config('PROGRESS_HEARTBEAT_SECONDS', default=15, cast=int)
+# Streams check the database for stages recorded by other workers this often
+PROGRESS_POLL_SECONDS = config('PROGRESS_POLL_SECONDS', default=1.0, cast=float)
+
+
+class ProgressHub:
+    """
+    Subscribers of this worker waiting for a video's next stage
+
+    Publishing is thread-safe (processing runs in worker threads); each
+    subscriber is an asyncio queue fed through its own event loop. The
+    current stage itself lives in the database.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[int, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, video_id: int, stage: str, seq: int, **data) -> Dict:
+        """
+        Sends a stage transition, already stored, to the video's subscribers
+
+        Args:
+            video_id: Video being processed
+            stage: One of STAGES
+            seq: The video's stage counter as stored in the database
+            **data: Extra fields for the event (e.g. error)
+
+        Returns:
+            The event
+        """
+
+        with self._lock:
+            event = {"video_id": video_id, "stage": stage, "seq": seq, "timestamp": time.time(), **data}
+            subscribers = list(self._subscribers.get(video_id, []))
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                pass  # The subscriber's loop has closed
+        return event
+
+    def subscribe(self, video_id: int) -> asyncio.Queue:
+        """
+        Queue receiving the video's events from now on
+
+        Must be called from the event loop that will read the queue; pair
+        with unsubscribe().
+        """
+        queue = asyncio.Queue()
+        with self._lock:
+            self._subscribers.setdefault(video_id, []).append((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, video_id: int, queue: asyncio.Queue):
+        with self._lock:
+            subscribers = [s for s in self._subscribers.get(video_id, []) if s[1] is not queue]
+            if subscribers:
+                self._subscribers[video_id] = subscribers
+            else:
+                self._subscribers.pop(video_id, None)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+
+def format_sse(event: Dict, name: str = "stage") -> str:
+    """Server-sent event frame for a progress event"""
+    return f"id: {event['seq']}\nevent: {name}\ndata: {json.dumps(event, default=str)}\n\n"
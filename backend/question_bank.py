@@ -0,0 +1,264 @@
+"""
+Question Bank
+Stores generated quiz questions per course source and assembles new quizzes
+by sampling from the bank, generating only the questions that are missing
+"""
+
+import json
+import random
+from typing import Callable, Dict, List, Optional, Tuple
+from decouple import config
+from sqlalchemy.orm import Session
+
+from course_models import BankQuestion
+from question_dedup import QuestionDeduplicator
+
+
+class QuestionBank:
+    """
+    Persistent question bank keyed by video, language, chapter, type and difficulty
+    """
+
+    def __init__(self):
+        self.deduplicator = QuestionDeduplicator(
+            threshold=config('QUIZ_DUPLICATE_THRESHOLD', default=0.6, cast=float)
+        )
+
+    def add_questions(
+        self,
+        db: Session,
+        video_id: int,
+        language: str,
+        questions: List[Dict],
+        course_id: Optional[str] = None
+    ) -> int:
+        """
+        Adds questions to the bank, skipping near-duplicates of banked questions
+
+        Args:
+            db: Database session
+            video_id: Source video of the course
+            language: Question language
+            questions: Questions from QuizGenerator
+            course_id: Course generation that produced them
+
+        Returns:
+            Number of questions added
+        """
+
+        if not questions:
+            return 0
+
+        existing = self.get_questions(db, video_id, language)
+        duplicates = {
+            duplicate["index"]
+            for duplicate in self.deduplicator.find_duplicates(questions, existing)
+        }
+
+        added = 0
+        for i, question in enumerate(questions):
+            if i in duplicates:
+                continue
+
+            question_data = {k: v for k, v in question.items() if k not in ("id", "bank_id")}
+            db.add(BankQuestion(
+                video_id=video_id,
+                course_id=course_id,
+                language=language,
+                chapter_number=question.get("chapter"),
+                question_type=question.get("type", "mcq"),
+                difficulty=question.get("difficulty", "medium"),
+                question_data=json.dumps(question_data, ensure_ascii=False)
+            ))
+            added += 1
+
+        db.commit()
+        return added
+
+    def get_questions(
+        self,
+        db: Session,
+        video_id: int,
+        language: str,
+        exclude_course_id: Optional[str] = None
+    ) -> List[Dict]:
+        """Returns banked questions for a video and language, optionally without one course's questions"""
+
+        query = db.query(BankQuestion).filter(
+            BankQuestion.video_id == video_id,
+            BankQuestion.language == language
+        )
+        if exclude_course_id:
+            query = query.filter(
+                (BankQuestion.course_id != exclude_course_id) | (BankQuestion.course_id.is_(None))
+            )
+
+        return [self._to_question(row) for row in query.all()]
+
+    def sample(
+        self,
+        db: Session,
+        video_id: int,
+        language: str,
+        counts: Dict[str, int],
+        question_types: Optional[List[str]] = None
+    ) -> Tuple[List[Dict], Dict[str, int]]:
+        """
+        Samples questions per difficulty, spread across chapters and
+        preferring the least used ones
+
+        Within each difficulty, chapters take turns: the next pick comes from
+        the chapter with the fewest questions in this quiz so far (across
+        difficulties), then the one whose next question is least used.
+
+        Args:
+            db: Database session
+            video_id: Source video of the course
+            language: Question language
+            counts: Number of questions wanted per difficulty
+            question_types: Allowed question types (all if None)
+
+        Returns:
+            (sampled questions, shortfall per difficulty)
+        """
+
+        query = db.query(BankQuestion).filter(
+            BankQuestion.video_id == video_id,
+            BankQuestion.language == language
+        )
+        if question_types:
+            query = query.filter(BankQuestion.question_type.in_(question_types))
+        rows = query.all()
+
+        sampled = []
+        shortfall = {}
+        picked_per_chapter: Dict[Optional[int], int] = {}
+        for difficulty, count in counts.items():
+            candidates = [row for row in rows if row.difficulty == difficulty]
+            chosen = self._spread_across_chapters(candidates, count, picked_per_chapter)
+            for row in chosen:
+                row.times_used = (row.times_used or 0) + 1
+                sampled.append(self._to_question(row))
+
+            if len(chosen) < count:
+                shortfall[difficulty] = count - len(chosen)
+
+        db.commit()
+        return sampled, shortfall
+
+    def _spread_across_chapters(
+        self,
+        candidates: List[BankQuestion],
+        count: int,
+        picked_per_chapter: Dict[Optional[int], int]
+    ) -> List[BankQuestion]:
+        """
+        Picks up to count questions round-robin over their chapters
+
+        Args:
+            candidates: Banked questions of one difficulty
+            count: Questions wanted
+            picked_per_chapter: Questions already picked per chapter, updated in place
+
+        Returns:
+            The picked questions
+        """
+
+        random.shuffle(candidates)
+        by_chapter: Dict[Optional[int], List[BankQuestion]] = {}
+        for row in candidates:
+            by_chapter.setdefault(row.chapter_number, []).append(row)
+        for rows in by_chapter.values():
+            rows.sort(key=lambda row: row.times_used or 0)
+
+        chosen = []
+        while len(chosen) < count and by_chapter:
+            chapter = min(
+                by_chapter,
+                key=lambda c: (picked_per_chapter.get(c, 0), by_chapter[c][0].times_used or 0)
+            )
+            chosen.append(by_chapter[chapter].pop(0))
+            if not by_chapter[chapter]:
+                del by_chapter[chapter]
+            picked_per_chapter[chapter] = picked_per_chapter.get(chapter, 0) + 1
+
+        return chosen
+
+    def build_quiz(
+        self,
+        db: Session,
+        quiz_generator,
+        video_id: int,
+        language: str,
+        title: str,
+        load_course_data: Callable[[], Dict],
+        num_questions: int = 10,
+        difficulty_mix: Optional[Dict] = None,
+        question_types: Optional[List[str]] = None,
+        course_id: Optional[str] = None
+    ) -> Dict:
+        """
+        Assembles a quiz from the bank, topping up shortfalls with the LLM
+
+        Args:
+            db: Database session
+            quiz_generator: QuizGenerator used for top-ups
+            video_id: Source video of the course
+            language: Quiz language
+            title: Course title for the quiz
+            load_course_data: Returns the course structure; only called when topping up
+            num_questions: Total number of questions
+            difficulty_mix: Dict like {"easy": 40, "medium": 40, "hard": 20} (percentages)
+            question_types: Allowed question types
+            course_id: Course the top-up questions are banked under
+
+        Returns:
+            Quiz data with a bank report
+        """
+
+        if difficulty_mix is None:
+            difficulty_mix = {"easy": 40, "medium": 40, "hard": 20}
+
+        counts = quiz_generator.split_by_difficulty(num_questions, difficulty_mix)
+        sampled, shortfall = self.sample(db, video_id, language, counts, question_types)
+
+        generated = []
+        generation_report = None
+        if shortfall:
+            top_up = quiz_generator.generate_quiz(
+                course_data=load_course_data(),
+                num_questions=sum(shortfall.values()),
+                difficulty_mix=shortfall,
+                question_types=question_types,
+                language=language,
+                reference_questions=self.get_questions(db, video_id, language)
+            )
+            generated = top_up.get("quiz", {}).get("questions", [])
+            generation_report = top_up.get("generation_report")
+            self.add_questions(db, video_id, language, generated, course_id)
+
+        questions = sampled + generated
+        random.shuffle(questions)
+        for i, q in enumerate(questions):
+            q["id"] = i + 1
+
+        return {
+            "quiz": {
+                "title": f"{title} - Quiz",
+                "passing_score": 70,
+                "time_limit": num_questions * 2,  # 2 minutes per question
+                "total_questions": len(questions),
+                "questions": questions
+            },
+            "bank_report": {
+                "sampled": len(sampled),
+                "generated": len(generated),
+                "shortfall": shortfall,
+                "generation_report": generation_report
+            }
+        }
+
+    def _to_question(self, row: BankQuestion) -> Dict:
+        question = json.loads(row.question_data)
+        question["bank_id"] = row.id
+        return question
@@ -0,0 +1,176 @@
+"""
+Question Deduplication
+Detects near-duplicate quiz questions with shingled MinHash signatures
+and LSH banding, so only the offending questions need regenerating
+"""
+
+import hashlib
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+
+# Mersenne prime used for the MinHash permutations
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 64) - 1
+
+
+class QuestionDeduplicator:
+    """
+    Finds near-duplicate questions within a quiz and against a question bank
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 4,
+        threshold: float = 0.6
+    ):
+        """
+        Args:
+            num_perm: Number of MinHash permutations (signature length)
+            bands: Number of LSH bands (num_perm must be divisible by it)
+            shingle_size: Character n-gram size (works for English and Japanese)
+            threshold: Estimated Jaccard similarity above which questions are duplicates
+        """
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+
+        # Deterministic permutation coefficients so signatures are stable across processes
+        self._permutations = []
+        for i in range(num_perm):
+            seed = hashlib.blake2b(f"minhash-{i}".encode(), digest_size=16).digest()
+            a = int.from_bytes(seed[:8], "big") % (_PRIME - 1) + 1
+            b = int.from_bytes(seed[8:], "big") % _PRIME
+            self._permutations.append((a, b))
+
+    def question_text(self, question: Dict) -> str:
+        """Text used for comparison: the question plus its correct answer"""
+
+        text = question.get("question", "")
+        answer = question.get("correct_answer")
+        options = question.get("options") or []
+
+        if question.get("type") == "mcq" and isinstance(answer, int) and 0 <= answer < len(options):
+            text += " " + str(options[answer])
+        elif question.get("type") == "fill_blank" and answer:
+            text += " " + str(answer)
+
+        return text
+
+    def _shingles(self, text: str) -> set:
+        """Character n-grams over normalized text"""
+
+        normalized = re.sub(r"[\W_]+", " ", text.lower()).strip()
+        if len(normalized) <= self.shingle_size:
+            return {normalized} if normalized else set()
+
+        return {
+            normalized[i:i + self.shingle_size]
+            for i in range(len(normalized) - self.shingle_size + 1)
+        }
+
+    def signature(self, question: Dict) -> List[int]:
+        """Computes the MinHash signature of a question"""
+
+        hashes = [
+            int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big")
+            for s in self._shingles(self.question_text(question))
+        ]
+        if not hashes:
+            return [_MAX_HASH] * self.num_perm
+
+        return [
+            min((a * h + b) % _PRIME for h in hashes)
+            for a, b in self._permutations
+        ]
+
+    def similarity(self, sig_a: List[int], sig_b: List[int]) -> float:
+        """Estimated Jaccard similarity of two signatures"""
+        matches = sum(1 for x, y in zip(sig_a, sig_b) if x == y)
+        return matches / self.num_perm
+
+    def _band_keys(self, signature: List[int]) -> List[tuple]:
+        return [
+            (band, tuple(signature[band * self.rows:(band + 1) * self.rows]))
+            for band in range(self.bands)
+        ]
+
+    def find_duplicates(
+        self,
+        questions: List[Dict],
+        reference_questions: Optional[List[Dict]] = None
+    ) -> List[Dict]:
+        """
+        Flags near-duplicate questions
+
+        A question is flagged when it is too similar to an earlier question
+        in the same quiz, or to any reference question (e.g. the course's
+        question bank). The first occurrence within the quiz is kept.
+
+        Args:
+            questions: Questions to check
+            reference_questions: Questions the quiz must not repeat
+
+        Returns:
+            List of dicts with index, duplicate_of, source ("quiz" or "bank") and similarity
+        """
+
+        buckets = defaultdict(list)
+
+        # Index reference questions first so they always win
+        for ref_index, question in enumerate(reference_questions or []):
+            sig = self.signature(question)
+            for key in self._band_keys(sig):
+                buckets[key].append(("bank", ref_index, sig))
+
+        duplicates = []
+        for index, question in enumerate(questions):
+            sig = self.signature(question)
+
+            best = None
+            seen = set()
+            for key in self._band_keys(sig):
+                for source, other_index, other_sig in buckets[key]:
+                    if (source, other_index) in seen:
+                        continue
+                    seen.add((source, other_index))
+
+                    score = self.similarity(sig, other_sig)
+                    if score >= self.threshold and (best is None or score > best["similarity"]):
+                        best = {
+                            "index": index,
+                            "duplicate_of": other_index,
+                            "source": source,
+                            "similarity": round(score, 3)
+                        }
+
+            if best:
+                duplicates.append(best)
+            else:
+                # Only unique questions become references for later ones
+                for key in self._band_keys(sig):
+                    buckets[key].append(("quiz", index, sig))
+
+        return duplicates
+
+
+if __name__ == "__main__":
+    sample_questions = [
+        {"type": "mcq", "question": "What does Python use to define code blocks?",
+         "options": ["Braces", "Indentation", "Keywords", "Semicolons"], "correct_answer": 1},
+        {"type": "mcq", "question": "What does Python use to define its code blocks?",
+         "options": ["Indentation", "Braces", "Keywords", "Semicolons"], "correct_answer": 0},
+        {"type": "true_false", "question": "Python variables must be declared with a type.",
+         "options": ["True", "False"], "correct_answer": 1}
+    ]
+
+    deduplicator = QuestionDeduplicator()
+    print("Duplicates:", deduplicator.find_duplicates(sample_questions))
@@ -4,12 +4,20 @@ Automatically generates quiz questions from course content
 Supports multiple question types and difficulty levels
 """
 
-from openai import OpenAI
 import json
+import logging
 import random
-from typing import Dict, List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Optional
 from decouple import config
 
+from openai_client import get_openai_client
+from question_dedup import QuestionDeduplicator
+from metrics import timed_stage
+
+logger = logging.getLogger(__name__)
+
 
 class QuizGenerator:
     """
@@ -18,28 +26,57 @@ class QuizGenerator:
 
     def __init__(self):
         self.model = "gpt-4o"
-        self.client = OpenAI(api_key=config('OPENAI_API_KEY'))
 
+        # Concurrency and retry policy for question generation
+        self.max_workers = config('QUIZ_MAX_WORKERS', default=6, cast=int)
+        self.max_attempts = config('QUIZ_MAX_ATTEMPTS', default=8, cast=int)
+        self.retry_backoff = config('QUIZ_RETRY_BACKOFF_SECONDS', default=1.0, cast=float)
+        self.deadline_seconds = config('QUIZ_DEADLINE_SECONDS', default=120.0, cast=float)
+
+        # Near-duplicate detection and targeted regeneration
+        self.deduplicator = QuestionDeduplicator(
+            threshold=config('QUIZ_DUPLICATE_THRESHOLD', default=0.6, cast=float)
+        )
+        self.dedup_rounds = config('QUIZ_DEDUP_ROUNDS', default=2, cast=int)
+
+    @property
+    def client(self):
+        """OpenAI client, created on first use (importing the SDK is slow)"""
+        return get_openai_client(caller="quiz_generator")
+
+    @timed_stage("quiz")
     def generate_quiz(
         self,
         course_data: Dict,
         num_questions: int = 10,
         difficulty_mix: Optional[Dict] = None,
         question_types: Optional[List[str]] = None,
-        language: str = "en"
+        language: str = "en",
+        deadline_seconds: Optional[float] = None,
+        reference_questions: Optional[List[Dict]] = None,
+        on_chapter_ready: Optional[Callable[[Dict, List[Dict]], None]] = None
     ) -> Dict:
         """
         Generates a complete quiz from course content
 
+        Questions are generated concurrently, and failed questions are retried
+        with backoff until num_questions is met or the deadline passes.
+        Near-duplicates (within the quiz or against reference_questions)
+        are regenerated individually.
+
         Args:
             course_data: Course structure with chapters
             num_questions: Total number of questions to generate
             difficulty_mix: Dict like {"easy": 40, "medium": 40, "hard": 20} (percentages)
             question_types: List like ["mcq", "true_false", "fill_blank"]
             language: Language code
+            deadline_seconds: Time budget for the whole quiz (defaults to QUIZ_DEADLINE_SECONDS)
+            reference_questions: Existing questions (e.g. the course's question bank) not to repeat
+            on_chapter_ready: Called with (chapter, questions) as soon as all of a chapter's
+                              questions are generated, before deduplication and numbering
 
         Returns:
-            Dict with quiz data
+            Dict with quiz data and a generation report
         """
 
         if difficulty_mix is None:
@@ -48,40 +85,27 @@ class QuizGenerator:
         if question_types is None:
             question_types = ["mcq", "true_false", "fill_blank"]
 
+        if deadline_seconds is None:
+            deadline_seconds = self.deadline_seconds
+
         course = course_data.get("course", {})
         chapters = course.get("chapters", [])
 
-        # Calculate questions per difficulty
-        num_easy = int(num_questions * difficulty_mix.get("easy", 40) / 100)
-        num_medium = int(num_questions * difficulty_mix.get("medium", 40) / 100)
-        num_hard = num_questions - num_easy - num_medium
+        started = time.monotonic()
+        deadline = started + deadline_seconds
+        slots = self._plan_slots(chapters, num_questions, difficulty_mix, question_types)
+        on_result = self._chapter_tracker(chapters, slots, on_chapter_ready) if on_chapter_ready else None
+        results = self._run_slots(slots, language, deadline, on_result)
+        results, duplicates, unresolved = self._resolve_duplicates(
+            slots, results, reference_questions or [], language, deadline
+        )
 
         questions = []
-
-        # Generate questions for each difficulty level
-        for difficulty, count in [("easy", num_easy), ("medium", num_medium), ("hard", num_hard)]:
-            for _ in range(count):
-                # Pick a random chapter
-                if not chapters:
-                    continue
-
-                chapter = random.choice(chapters)
-
-                # Pick a random question type
-                q_type = random.choice(question_types)
-
-                # Generate question
-                question = self._generate_question(
-                    chapter=chapter,
-                    question_type=q_type,
-                    difficulty=difficulty,
-                    language=language
-                )
-
-                if question:
-                    question["id"] = len(questions) + 1
-                    question["chapter"] = chapter.get("number", 1)
-                    questions.append(question)
+        for slot, (question, _) in zip(slots, results):
+            if question:
+                question["chapter"] = slot["chapter"].get("number", 1)
+                question["difficulty"] = slot["difficulty"]
+                questions.append(question)
 
         # Shuffle questions
         random.shuffle(questions)
@@ -90,6 +114,12 @@ class QuizGenerator:
         for i, q in enumerate(questions):
             q["id"] = i + 1
 
+        report = self._build_report(slots, results, num_questions, started)
+        report["duplicates"] = duplicates
+        report["unresolved_duplicates"] = unresolved
+        if not report["complete"]:
+            logger.warning("Quiz generation incomplete", extra={"generated": report["generated"], "requested": num_questions})
+
         quiz_data = {
             "quiz": {
                 "title": f"{course.get('title', 'Course')} - Quiz",
@@ -97,17 +127,360 @@ class QuizGenerator:
                 "time_limit": num_questions * 2,  # 2 minutes per question
                 "total_questions": len(questions),
                 "questions": questions
-            }
+            },
+            "generation_report": report
         }
 
         return quiz_data
 
+    def split_by_difficulty(self, num_questions: int, difficulty_mix: Dict) -> Dict[str, int]:
+        """
+        Splits the question count across difficulties using largest remainders,
+        so the counts always add up to num_questions and follow the mix
+        """
+
+        total = sum(difficulty_mix.values()) or 1
+        exact = {
+            difficulty: num_questions * weight / total
+            for difficulty, weight in difficulty_mix.items()
+        }
+        counts = {difficulty: int(value) for difficulty, value in exact.items()}
+
+        leftover = num_questions - sum(counts.values())
+        by_remainder = sorted(exact, key=lambda d: exact[d] - counts[d], reverse=True)
+        for difficulty in by_remainder[:leftover]:
+            counts[difficulty] += 1
+
+        return counts
+
+    def _plan_slots(
+        self,
+        chapters: List[Dict],
+        num_questions: int,
+        difficulty_mix: Dict,
+        question_types: List[str]
+    ) -> List[Dict]:
+        """
+        Decides chapter, type and difficulty for every question up front,
+        so each slot can be generated (and retried) independently
+        """
+
+        if not chapters:
+            return []
+
+        # Spread questions across chapters, and across each chapter's key points,
+        # instead of picking chapters independently per question
+        chapter_order = random.sample(chapters, len(chapters))
+        questions_per_chapter = {}
+
+        slots = []
+        counts = self.split_by_difficulty(num_questions, difficulty_mix)
+        for difficulty, count in counts.items():
+            for _ in range(count):
+                chapter = chapter_order[len(slots) % len(chapter_order)]
+                focus = questions_per_chapter.get(id(chapter), 0)
+                questions_per_chapter[id(chapter)] = focus + 1
+
+                slots.append({
+                    "slot": len(slots) + 1,
+                    "difficulty": difficulty,
+                    "type": random.choice(question_types),
+                    "chapter": chapter,
+                    "focus": focus
+                })
+
+        return slots
+
+    def _chapter_tracker(
+        self,
+        chapters: List[Dict],
+        slots: List[Dict],
+        on_chapter_ready: Callable[[Dict, List[Dict]], None]
+    ) -> Callable[[int, tuple], None]:
+        """
+        Returns a slot callback that reports each chapter once all its slots are done
+        """
+
+        pending = {id(chapter): 0 for chapter in chapters}
+        for slot in slots:
+            pending[id(slot["chapter"])] += 1
+        ready = {id(chapter): [] for chapter in chapters}
+
+        # Chapters without questions are ready straight away
+        for chapter in chapters:
+            if pending[id(chapter)] == 0:
+                on_chapter_ready(chapter, [])
+
+        def on_result(index: int, result: tuple):
+            chapter = slots[index]["chapter"]
+            question = result[0]
+            if question:
+                question["chapter"] = chapter.get("number", 1)
+                question["difficulty"] = slots[index]["difficulty"]
+                ready[id(chapter)].append(question)
+
+            pending[id(chapter)] -= 1
+            if pending[id(chapter)] == 0:
+                on_chapter_ready(chapter, ready[id(chapter)])
+
+        return on_result
+
+    def _run_slots(
+        self,
+        slots: List[Dict],
+        language: str,
+        deadline: float,
+        on_result: Optional[Callable[[int, tuple], None]] = None
+    ) -> List[tuple]:
+        """
+        Generates all slots concurrently on a bounded thread pool
+
+        Args:
+            on_result: Called with (slot index, result) as each slot finishes
+
+        Returns:
+            List of (question or None, stats) tuples, in slot order
+        """
+
+        if not slots:
+            return []
+
+        results = [None] * len(slots)
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(slots)))
+        futures = {
+            executor.submit(self._generate_slot, slot, language, deadline): index
+            for index, slot in enumerate(slots)
+        }
+
+        try:
+            pending = set(futures)
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = futures[future]
+                    results[index] = future.result()
+                    if on_result:
+                        on_result(index, results[index])
+        finally:
+            # Don't wait for calls still in flight past the deadline
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        for index, slot in enumerate(slots):
+            if results[index] is None:
+                results[index] = (None, self._slot_stats(slot, 0, 0.0, "timed_out"))
+                if on_result:
+                    on_result(index, results[index])
+
+        return results
+
+    def _generate_slot(self, slot: Dict, language: str, deadline: float) -> tuple:
+        """
+        Generates one question, retrying with exponential backoff
+        until it succeeds, attempts run out or the deadline passes
+        """
+
+        started = time.monotonic()
+        attempts = 0
+
+        while attempts < self.max_attempts and time.monotonic() < deadline:
+            attempts += 1
+            question = self._generate_question(
+                chapter=slot["chapter"],
+                question_type=slot["type"],
+                difficulty=slot["difficulty"],
+                language=language,
+                focus=slot.get("focus", 0),
+                avoid=slot.get("avoid")
+            )
+            if question:
+                return question, self._slot_stats(slot, attempts, time.monotonic() - started, "ok")
+
+            delay = self.retry_backoff * (2 ** (attempts - 1)) * random.uniform(0.5, 1.5)
+            remaining = deadline - time.monotonic()
+            if attempts >= self.max_attempts or remaining <= delay:
+                break
+            time.sleep(delay)
+
+        return None, self._slot_stats(slot, attempts, time.monotonic() - started, "failed")
+
+    def _resolve_duplicates(
+        self,
+        slots: List[Dict],
+        results: List[tuple],
+        reference_questions: List[Dict],
+        language: str,
+        deadline: float
+    ) -> tuple:
+        """
+        Regenerates only the questions flagged as near-duplicates
+
+        Each offending slot is pointed at the next key points of its chapter and
+        told which question to avoid, then regenerated on its own. A duplicate
+        is only replaced when regeneration succeeds, so the count never drops.
+
+        Returns:
+            (results, flagged duplicates, number of duplicates left unresolved)
+        """
+
+        flagged = []
+        unresolved = 0
+
+        for round_number in range(self.dedup_rounds + 1):
+            kept = [i for i, (question, _) in enumerate(results) if question]
+            duplicates = self.deduplicator.find_duplicates(
+                [results[i][0] for i in kept],
+                reference_questions
+            )
+
+            if not duplicates or round_number == self.dedup_rounds or time.monotonic() >= deadline:
+                unresolved = len(duplicates)
+                break
+
+            retry_indices = []
+            for duplicate in duplicates:
+                index = kept[duplicate["index"]]
+                if duplicate["source"] == "bank":
+                    original = reference_questions[duplicate["duplicate_of"]]
+                    duplicate_of = None
+                else:
+                    original = results[kept[duplicate["duplicate_of"]]][0]
+                    duplicate_of = slots[kept[duplicate["duplicate_of"]]]["slot"]
+
+                slot = slots[index]
+                slot.setdefault("avoid", []).append(original.get("question", ""))
+                slot["focus"] = slot.get("focus", 0) + 1
+
+                flagged.append({
+                    "slot": slot["slot"],
+                    "duplicate_of_slot": duplicate_of,
+                    "source": duplicate["source"],
+                    "similarity": duplicate["similarity"],
+                    "round": round_number + 1
+                })
+                retry_indices.append(index)
+
+            regenerated = self._run_slots([slots[i] for i in retry_indices], language, deadline)
+            for index, (question, stats) in zip(retry_indices, regenerated):
+                previous = results[index][1]
+                stats["attempts"] += previous["attempts"]
+                stats["retries"] = max(0, stats["attempts"] - 1)
+                stats["latency_ms"] = round(stats["latency_ms"] + previous["latency_ms"], 1)
+                stats["regenerated"] = True
+
+                if question:
+                    results[index] = (question, stats)
+                else:
+                    stats["status"] = "duplicate_kept"
+                    results[index] = (results[index][0], stats)
+
+        return results, flagged, unresolved
+
+    def regenerate_duplicates(
+        self,
+        quiz_data: Dict,
+        course_data: Dict,
+        reference_questions: Optional[List[Dict]] = None,
+        language: str = "en",
+        deadline_seconds: Optional[float] = None
+    ) -> Dict:
+        """
+        Replaces only the near-duplicate questions of an existing quiz
+
+        Args:
+            quiz_data: Existing quiz (from quiz_data.json)
+            course_data: Course structure the quiz was generated from
+            reference_questions: Other questions the quiz must not repeat
+            language: Language code
+            deadline_seconds: Time budget (defaults to QUIZ_DEADLINE_SECONDS)
+
+        Returns:
+            Quiz data with duplicates replaced and a regeneration report
+        """
+
+        if deadline_seconds is None:
+            deadline_seconds = self.deadline_seconds
+
+        chapters = course_data.get("course", {}).get("chapters", [])
+        chapters_by_number = {chapter.get("number"): chapter for chapter in chapters}
+        questions = quiz_data.get("quiz", {}).get("questions", [])
+
+        slots = []
+        for i, question in enumerate(questions):
+            default_chapter = chapters[0] if chapters else {}
+            slots.append({
+                "slot": i + 1,
+                "difficulty": question.get("difficulty", "medium"),
+                "type": question.get("type", "mcq"),
+                "chapter": chapters_by_number.get(question.get("chapter"), default_chapter),
+                "focus": 0
+            })
+
+        started = time.monotonic()
+        results = [
+            (question, self._slot_stats(slot, 0, 0.0, "existing"))
+            for slot, question in zip(slots, questions)
+        ]
+        results, duplicates, unresolved = self._resolve_duplicates(
+            slots, results, reference_questions or [], language, started + deadline_seconds
+        )
+
+        updated = []
+        for original, (question, _) in zip(questions, results):
+            if question is not original:
+                question["id"] = original.get("id")
+                question["chapter"] = original.get("chapter")
+                question["difficulty"] = original.get("difficulty") or question.get("difficulty")
+            updated.append(question)
+
+        quiz_data["quiz"]["questions"] = updated
+        quiz_data["regeneration_report"] = {
+            "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+            "regenerated": sum(1 for original, question in zip(questions, updated) if question is not original),
+            "duplicates": duplicates,
+            "unresolved_duplicates": unresolved
+        }
+
+        return quiz_data
+
+    def _slot_stats(self, slot: Dict, attempts: int, elapsed: float, status: str) -> Dict:
+        """Per-question latency and retry stats for the generation report"""
+        return {
+            "slot": slot["slot"],
+            "chapter": slot["chapter"].get("number", 1),
+            "type": slot["type"],
+            "difficulty": slot["difficulty"],
+            "status": status,
+            "attempts": attempts,
+            "retries": max(0, attempts - 1),
+            "latency_ms": round(elapsed * 1000, 1)
+        }
+
+    def _build_report(self, slots: List[Dict], results: List[tuple], requested: int, started: float) -> Dict:
+        """Summarizes how the quiz was generated"""
+
+        stats = [slot_stats for _, slot_stats in results]
+        generated = sum(1 for question, _ in results if question)
+
+        return {
+            "requested": requested,
+            "generated": generated,
+            "complete": generated >= requested,
+            "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+            "total_retries": sum(s["retries"] for s in stats),
+            "questions": stats
+        }
+
     def _generate_question(
         self,
         chapter: Dict,
         question_type: str,
         difficulty: str,
-        language: str
+        language: str,
+        focus: int = 0,
+        avoid: Optional[List[str]] = None
     ) -> Optional[Dict]:
         """
         Generates a single question from chapter content
@@ -117,6 +490,8 @@ class QuizGenerator:
             question_type: "mcq", "true_false", or "fill_blank"
             difficulty: "easy", "medium", or "hard"
             language: Language code
+            focus: Which group of key points to build the question around
+            avoid: Existing question texts the new question must not repeat
 
         Returns:
             Question dict or None
@@ -129,7 +504,13 @@ class QuizGenerator:
         # Combine content for context
         context = f"Chapter: {title}\n\n"
         context += f"Content: {content[:2000]}\n\n"
-        context += f"Key Points: {', '.join(key_points[:3])}"
+        start = (focus * 3) % len(key_points) if key_points else 0
+        focus_points = (key_points[start:] + key_points[:start])[:3]
+        context += f"Key Points: {', '.join(focus_points)}"
+
+        if avoid:
+            context += "\n\nDo NOT ask about the same thing as these existing questions:\n"
+            context += "\n".join(f"- {text}" for text in avoid[-5:])
 
         if question_type == "mcq":
             return self._generate_mcq(context, difficulty, language)
@@ -188,7 +569,7 @@ Note: correct_answer is 0-indexed (0=A, 1=B, 2=C, 3=D)
             return question
 
         except Exception as e:
-            print(f"Error generating MCQ: {str(e)}")
+            logger.error("Error generating MCQ", extra={"error": str(e)})
             return None
 
     def _generate_true_false(self, context: str, difficulty: str, language: str) -> Optional[Dict]:
@@ -235,7 +616,7 @@ Return as JSON:
             return question
 
         except Exception as e:
-            print(f"Error generating True/False: {str(e)}")
+            logger.error("Error generating True/False", extra={"error": str(e)})
             return None
 
     def _generate_fill_blank(self, context: str, difficulty: str, language: str) -> Optional[Dict]:
@@ -279,7 +660,7 @@ Return as JSON:
             return question
 
         except Exception as e:
-            print(f"Error generating Fill-in-Blank: {str(e)}")
+            logger.error("Error generating Fill-in-Blank", extra={"error": str(e)})
             return None
 
     def generate_distractors(self, correct_answer: str, context: str, num_distractors: int = 3) -> List[str]:
@@ -328,7 +709,7 @@ Return as JSON:
             return result.get("distractors", [])
 
         except Exception as e:
-            print(f"Error generating distractors: {str(e)}")
+            logger.error("Error generating distractors", extra={"error": str(e)})
             return []
 
     def validate_quiz(self, quiz_data: Dict) -> tuple[bool, List[str]]:
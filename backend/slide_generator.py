@@ -4,581 +4,418 @@ Creates professional HTML-based slide decks from course structure
 Uses Reveal.js framework
 """
 
+import hashlib
 import json
-from typing import Dict, List, Optional
-from jinja2 import Template
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from jinja2 import Environment
 from datetime import datetime
+from decouple import config
+
+from metrics import timed_stage
+
+logger = logging.getLogger(__name__)
+
+
+THEMES = {
+    "light": {
+        "primary": "#2c3e50",
+        "secondary": "#3498db",
+        "accent": "#e74c3c",
+        "background": "#ffffff",
+        "text": "#333333",
+        "heading": "#2c3e50"
+    },
+    "dark": {
+        "primary": "#ecf0f1",
+        "secondary": "#3498db",
+        "accent": "#e67e22",
+        "background": "#1a1a1a",
+        "text": "#ecf0f1",
+        "heading": "#ffffff"
+    },
+    "corporate": {
+        "primary": "#0066cc",
+        "secondary": "#00cc66",
+        "accent": "#ff9900",
+        "background": "#f8f9fa",
+        "text": "#333333",
+        "heading": "#0066cc"
+    }
+}
+
+TITLE_LABELS = {
+    "en": {
+        "duration": "Duration",
+        "difficulty": "Difficulty",
+        "beginner": "Beginner",
+        "intermediate": "Intermediate",
+        "advanced": "Advanced"
+    },
+    "ja": {
+        "duration": "期間",
+        "difficulty": "難易度",
+        "beginner": "初級",
+        "intermediate": "中級",
+        "advanced": "上級"
+    }
+}
+
+TOC_LABELS = {
+    "en": "Table of Contents",
+    "ja": "目次"
+}
+
+SUMMARY_LABELS = {
+    "en": {
+        "title": "Course Summary",
+        "outcomes": "What You've Learned",
+        "next": "Next Steps",
+        "thanks": "Thank You!"
+    },
+    "ja": {
+        "title": "コースのまとめ",
+        "outcomes": "学んだこと",
+        "next": "次のステップ",
+        "thanks": "ありがとうございました！"
+    }
+}
 
+CONTENT_ICONS = ["💡", "🔑", "⭐", "📌", "✨", "🎯", "🚀"]
 
-class SlideGenerator:
-    """
-    Generates professional slide decks from course structure
-    """
-
-    def __init__(self, theme: str = "light"):
-        """
-        Args:
-            theme: "light", "dark", or "corporate"
-        """
-        self.theme = theme
-        self.theme_colors = self._get_theme_colors(theme)
-
-    def _get_theme_colors(self, theme: str) -> Dict:
-        """Returns color scheme for the selected theme"""
-        themes = {
-            "light": {
-                "primary": "#2c3e50",
-                "secondary": "#3498db",
-                "accent": "#e74c3c",
-                "background": "#ffffff",
-                "text": "#333333",
-                "heading": "#2c3e50"
-            },
-            "dark": {
-                "primary": "#ecf0f1",
-                "secondary": "#3498db",
-                "accent": "#e67e22",
-                "background": "#1a1a1a",
-                "text": "#ecf0f1",
-                "heading": "#ffffff"
-            },
-            "corporate": {
-                "primary": "#0066cc",
-                "secondary": "#00cc66",
-                "accent": "#ff9900",
-                "background": "#f8f9fa",
-                "text": "#333333",
-                "heading": "#0066cc"
-            }
-        }
-        return themes.get(theme, themes["light"])
-
-    def create_slide_deck(
-        self,
-        course_data: Dict,
-        language: str = "en"
-    ) -> str:
-        """
-        Creates complete HTML slide deck from course structure
-
-        Args:
-            course_data: Course structure from CourseStructurer
-            language: Language code
-
-        Returns:
-            Complete HTML string for slide deck
-        """
-
-        course = course_data.get("course", {})
-
-        # Build slides
-        slides_html = []
-
-        # 1. Title slide
-        slides_html.append(self._create_title_slide(course, language))
-
-        # 2. Table of contents
-        slides_html.append(self._create_toc_slide(course, language))
-
-        # 3. Chapter slides
-        for chapter in course.get("chapters", []):
-            # Chapter title slide
-            slides_html.append(self._create_chapter_title_slide(chapter))
-
-            # Learning objectives slide
-            slides_html.append(self._create_objectives_slide(chapter))
-
-            # Content slides
-            content_slides = self._create_content_slides(chapter)
-            slides_html.extend(content_slides)
-
-            # Chapter summary slide
-            slides_html.append(self._create_chapter_summary_slide(chapter))
-
-        # 4. Final summary slide
-        slides_html.append(self._create_final_summary_slide(course, language))
-
-        # Combine all slides
-        all_slides = "\n\n".join(slides_html)
-
-        # Wrap in Reveal.js template
-        full_html = self._wrap_in_template(all_slides, course, language)
-
-        return full_html
-
-    def _create_title_slide(self, course: Dict, language: str) -> str:
-        """Creates the title slide"""
+# Max key points per content slide, for readability
+POINTS_PER_SLIDE = 6
 
-        duration = course.get("duration", "")
-        difficulty = course.get("difficulty", "intermediate")
+# Chapter fragments of a chunked deck, relative to the deck
+CHAPTERS_DIRNAME = "chapters"
 
-        labels = {
-            "en": {
-                "duration": "Duration",
-                "difficulty": "Difficulty",
-                "beginner": "Beginner",
-                "intermediate": "Intermediate",
-                "advanced": "Advanced"
-            },
-            "ja": {
-                "duration": "期間",
-                "difficulty": "難易度",
-                "beginner": "初級",
-                "intermediate": "中級",
-                "advanced": "上級"
-            }
-        }
 
-        lang = labels.get(language, labels["en"])
-        difficulty_text = lang.get(difficulty, difficulty)
+# Templates are compiled once at import and shared by every generator.
+# Course text is trusted LLM output and is inserted as-is, like before.
+_env = Environment(autoescape=False, trim_blocks=True, lstrip_blocks=True)
 
-        html = f"""
+TITLE_SLIDE = _env.from_string("""
         <section data-transition="zoom" style="text-align: center;">
-            <div style="background: linear-gradient(135deg, {self.theme_colors['primary']} 0%, {self.theme_colors['secondary']} 100%);
+            <div style="background: linear-gradient(135deg, {{ colors.primary }} 0%, {{ colors.secondary }} 100%);
                         padding: 30px 40px; border-radius: 20px; box-shadow: 0 10px 40px rgba(0,0,0,0.2);
                         display: inline-block; max-width: 90%;">
-                <h1 style="color: white; font-size: 1.8em; margin: 0; line-height: 1.3;">{course.get('title', 'Course Title')}</h1>
+                <h1 style="color: white; font-size: 1.8em; margin: 0; line-height: 1.3;">{{ course.get('title', 'Course Title') }}</h1>
             </div>
             <p style="font-size: 0.95em; margin-top: 30px; line-height: 1.5; max-width: 80%; margin-left: auto; margin-right: auto;">
-                {course.get('description', '')}
+                {{ course.get('description', '') }}
             </p>
             <div style="margin-top: 40px; display: inline-flex; gap: 40px; font-size: 0.85em;
                         background: rgba(0,0,0,0.03); padding: 20px 40px; border-radius: 10px;">
                 <div style="text-align: center;">
                     <div style="font-size: 2em; margin-bottom: 5px;">⏱️</div>
-                    <div style="color: {self.theme_colors['secondary']}; font-weight: bold;">{duration}</div>
-                    <div style="font-size: 0.85em; color: #666; margin-top: 3px;">{lang['duration']}</div>
+                    <div style="color: {{ colors.secondary }}; font-weight: bold;">{{ duration }}</div>
+                    <div style="font-size: 0.85em; color: #666; margin-top: 3px;">{{ labels.duration }}</div>
                 </div>
                 <div style="text-align: center;">
                     <div style="font-size: 2em; margin-bottom: 5px;">📊</div>
-                    <div style="color: {self.theme_colors['secondary']}; font-weight: bold;">{difficulty_text}</div>
-                    <div style="font-size: 0.85em; color: #666; margin-top: 3px;">{lang['difficulty']}</div>
+                    <div style="color: {{ colors.secondary }}; font-weight: bold;">{{ difficulty }}</div>
+                    <div style="font-size: 0.85em; color: #666; margin-top: 3px;">{{ labels.difficulty }}</div>
                 </div>
             </div>
             <p style="margin-top: 50px; font-size: 0.75em; color: #999;">
-                {datetime.now().strftime("%B %Y")}
+                {{ generated }}
             </p>
         </section>
-        """
-        return html
-
-    def _create_toc_slide(self, course: Dict, language: str) -> str:
-        """Creates table of contents slide"""
-
-        labels = {
-            "en": "Table of Contents",
-            "ja": "目次"
-        }
-        title = labels.get(language, labels["en"])
-
-        chapters = course.get("chapters", [])
-        toc_items = []
+""")
 
-        for chapter in chapters:
-            chapter_num = chapter.get("number", "")
-            chapter_title = chapter.get("title", "")
-            duration = chapter.get("duration", "")
-            toc_items.append(
-                f'<li style="margin: 20px 0; padding: 15px 20px; background: linear-gradient(to right, rgba(52, 152, 219, 0.1) 0%, transparent 100%); '
-                f'border-left: 4px solid {self.theme_colors["secondary"]}; border-radius: 5px;">'
-                f'<div style="display: flex; justify-content: space-between; align-items: center;">'
-                f'<div><span style="color: {self.theme_colors["secondary"]}; font-weight: bold; font-size: 1.3em; margin-right: 15px;">{chapter_num}</span>'
-                f'<span style="font-size: 1.05em;">{chapter_title}</span></div>'
-                f'<span style="color: {self.theme_colors["secondary"]}; font-size: 0.9em; font-weight: 600;">⏱️ {duration}</span>'
-                f'</div></li>'
-            )
-
-        toc_html = "\n".join(toc_items)
-
-        html = f"""
+TOC_SLIDE = _env.from_string("""
         <section>
-            <h2 style="margin-bottom: 40px;">📚 {title}</h2>
+            <h2 style="margin-bottom: 40px;">📚 {{ title }}</h2>
             <ul style="text-align: left; list-style: none; padding: 0;">
-                {toc_html}
+{% for chapter in chapters %}
+                <li style="margin: 20px 0; padding: 15px 20px; background: linear-gradient(to right, rgba(52, 152, 219, 0.1) 0%, transparent 100%); border-left: 4px solid {{ colors.secondary }}; border-radius: 5px;"><div style="display: flex; justify-content: space-between; align-items: center;"><div><span style="color: {{ colors.secondary }}; font-weight: bold; font-size: 1.3em; margin-right: 15px;">{{ chapter.get('number', '') }}</span><span style="font-size: 1.05em;">{{ chapter.get('title', '') }}</span></div><span style="color: {{ colors.secondary }}; font-size: 0.9em; font-weight: 600;">⏱️ {{ chapter.get('duration', '') }}</span></div></li>
+{% endfor %}
             </ul>
         </section>
-        """
-        return html
+""")
 
-    def _create_chapter_title_slide(self, chapter: Dict) -> str:
-        """Creates chapter title slide"""
-
-        chapter_num = chapter.get("number", "")
-        title = chapter.get("title", "")
-        duration = chapter.get("duration", "")
-
-        html = f"""
-        <section data-transition="slide" data-background="linear-gradient(135deg, {self.theme_colors['primary']} 0%, {self.theme_colors['secondary']} 100%)"
+CHAPTER_TITLE_SLIDE = _env.from_string("""
+        <section{% if chapter_src %} data-chapter-src="{{ chapter_src }}"{% endif %} data-transition="slide" data-background="linear-gradient(135deg, {{ colors.primary }} 0%, {{ colors.secondary }} 100%)"
                  data-background-transition="zoom" style="text-align: center;">
             <div style="background: rgba(255, 255, 255, 0.1); backdrop-filter: blur(10px); padding: 40px 50px;
                         border-radius: 20px; box-shadow: 0 10px 40px rgba(0,0,0,0.3); display: inline-block;">
                 <div style="color: rgba(255,255,255,0.9); font-size: 1em; font-weight: 600;
-                           letter-spacing: 2px; margin-bottom: 20px;">CHAPTER {chapter_num}</div>
-                <h2 style="color: white; font-size: 2.2em; margin: 0; line-height: 1.3;">{title}</h2>
+                           letter-spacing: 2px; margin-bottom: 20px;">CHAPTER {{ chapter.get('number', '') }}</div>
+                <h2 style="color: white; font-size: 2.2em; margin: 0; line-height: 1.3;">{{ chapter.get('title', '') }}</h2>
                 <div style="margin-top: 30px; color: rgba(255,255,255,0.85); font-size: 1em;">
                     <span style="background: rgba(255,255,255,0.2); padding: 8px 20px; border-radius: 20px;">
-                        ⏱️ {duration}
+                        ⏱️ {{ chapter.get('duration', '') }}
                     </span>
                 </div>
             </div>
         </section>
-        """
-        return html
+""")
 
-    def _create_objectives_slide(self, chapter: Dict) -> str:
-        """Creates learning objectives slide"""
-
-        objectives = chapter.get("learning_objectives", [])
-
-        obj_items = []
-        for i, obj in enumerate(objectives, 1):
-            obj_items.append(
-                f'<li style="margin: 12px 0; padding: 12px 15px; background: linear-gradient(to right, rgba(52, 152, 219, 0.08) 0%, transparent 100%); '
-                f'border-left: 4px solid {self.theme_colors["accent"]}; border-radius: 5px; list-style: none; font-size: 0.9em; line-height: 1.4;">'
-                f'<span style="color: {self.theme_colors["accent"]}; font-weight: bold; margin-right: 10px;">✓</span>{obj}'
-                f'</li>'
-            )
-
-        obj_html = "\n".join(obj_items)
-
-        html = f"""
+OBJECTIVES_SLIDE = _env.from_string("""
         <section>
             <h3 style="margin-bottom: 20px; margin-top: 10px;">🎯 Learning Objectives</h3>
             <ul style="text-align: left; padding: 0; margin-top: 0;">
-                {obj_html}
+{% for objective in objectives %}
+                <li style="margin: 12px 0; padding: 12px 15px; background: linear-gradient(to right, rgba(52, 152, 219, 0.08) 0%, transparent 100%); border-left: 4px solid {{ colors.accent }}; border-radius: 5px; list-style: none; font-size: 0.9em; line-height: 1.4;"><span style="color: {{ colors.accent }}; font-weight: bold; margin-right: 10px;">✓</span>{{ objective }}</li>
+{% endfor %}
             </ul>
         </section>
-        """
-        return html
+""")
 
-    def _create_content_slides(self, chapter: Dict) -> List[str]:
-        """Creates content slides from chapter content"""
-
-        slides = []
-        key_points = chapter.get("key_points", [])
-        content = chapter.get("content", "")
-
-        # Split key points into slides (max 6 points per slide for better readability)
-        points_per_slide = 6
-
-        for i in range(0, len(key_points), points_per_slide):
-            slide_points = key_points[i:i + points_per_slide]
-
-            point_items = []
-            icons = ["💡", "🔑", "⭐", "📌", "✨", "🎯", "🚀"]  # Variety of icons
-            for idx, point in enumerate(slide_points):
-                icon = icons[idx % len(icons)]
-                point_items.append(
-                    f'<li style="margin: 12px 0; padding: 10px 15px; font-size: 0.85em; line-height: 1.4; '
-                    f'background: linear-gradient(to right, rgba(52, 152, 219, 0.06) 0%, transparent 100%); '
-                    f'border-left: 3px solid {self.theme_colors["secondary"]}; border-radius: 5px; list-style: none;">'
-                    f'<span style="margin-right: 10px;">{icon}</span>{point}'
-                    f'</li>'
-                )
-
-            points_html = "\n".join(point_items)
-
-            # Add slide number indicator if multiple content slides
-            slide_indicator = ""
-            if len(key_points) > points_per_slide:
-                slide_num = (i // points_per_slide) + 1
-                total_slides = (len(key_points) + points_per_slide - 1) // points_per_slide
-                slide_indicator = f'<div style="position: absolute; top: 20px; right: 20px; font-size: 0.7em; ' \
-                                f'color: {self.theme_colors["secondary"]}; background: rgba(52, 152, 219, 0.1); ' \
-                                f'padding: 5px 15px; border-radius: 15px;">Part {slide_num} of {total_slides}</div>'
-
-            html = f"""
+CONTENT_SLIDE = _env.from_string("""
             <section>
-                {slide_indicator}
-                <h3 style="margin-bottom: 20px; margin-top: 10px;">{chapter.get('title', '')}</h3>
+{% if total_parts > 1 %}
+                <div style="position: absolute; top: 20px; right: 20px; font-size: 0.7em; color: {{ colors.secondary }}; background: rgba(52, 152, 219, 0.1); padding: 5px 15px; border-radius: 15px;">Part {{ part }} of {{ total_parts }}</div>
+{% endif %}
+                <h3 style="margin-bottom: 20px; margin-top: 10px;">{{ title }}</h3>
                 <ul style="text-align: left; padding: 0; margin-top: 0;">
-                    {points_html}
+{% for point in points %}
+                    <li style="margin: 12px 0; padding: 10px 15px; font-size: 0.85em; line-height: 1.4; background: linear-gradient(to right, rgba(52, 152, 219, 0.06) 0%, transparent 100%); border-left: 3px solid {{ colors.secondary }}; border-radius: 5px; list-style: none;"><span style="margin-right: 10px;">{{ icons[loop.index0 % icons|length] }}</span>{{ point }}</li>
+{% endfor %}
                 </ul>
                 <aside class="notes">
-                    {content[:500]}
+                    {{ notes }}
                 </aside>
             </section>
-            """
-            slides.append(html)
-
-        return slides
+""")
 
-    def _create_chapter_summary_slide(self, chapter: Dict) -> str:
-        """Creates chapter summary slide"""
-
-        key_points = chapter.get("key_points", [])[:3]  # Top 3 points
-
-        summary_items = []
-        for i, point in enumerate(key_points, 1):
-            summary_items.append(
-                f'<li style="margin: 20px 0; padding: 18px 22px; background: linear-gradient(135deg, rgba(231, 76, 60, 0.08) 0%, rgba(52, 152, 219, 0.08) 100%); '
-                f'border-left: 4px solid {self.theme_colors["accent"]}; border-radius: 8px; list-style: none; '
-                f'box-shadow: 0 2px 8px rgba(0,0,0,0.05);">'
-                f'<span style="color: {self.theme_colors["accent"]}; font-weight: bold; font-size: 1.2em; margin-right: 12px;">{i}</span>{point}'
-                f'</li>'
-            )
-
-        summary_html = "\n".join(summary_items)
-
-        html = f"""
-        <section data-background="{self.theme_colors['background']}">
-            <h3 style="margin-bottom: 40px;">🎁 Key Takeaways: {chapter.get('title', '')}</h3>
+CHAPTER_SUMMARY_SLIDE = _env.from_string("""
+        <section data-background="{{ colors.background }}">
+            <h3 style="margin-bottom: 40px;">🎁 Key Takeaways: {{ chapter.get('title', '') }}</h3>
             <ul style="text-align: left; padding: 0; font-size: 0.95em;">
-                {summary_html}
+{% for point in points %}
+                <li style="margin: 20px 0; padding: 18px 22px; background: linear-gradient(135deg, rgba(231, 76, 60, 0.08) 0%, rgba(52, 152, 219, 0.08) 100%); border-left: 4px solid {{ colors.accent }}; border-radius: 8px; list-style: none; box-shadow: 0 2px 8px rgba(0,0,0,0.05);"><span style="color: {{ colors.accent }}; font-weight: bold; font-size: 1.2em; margin-right: 12px;">{{ loop.index }}</span>{{ point }}</li>
+{% endfor %}
             </ul>
         </section>
-        """
-        return html
-
-    def _create_final_summary_slide(self, course: Dict, language: str) -> str:
-        """Creates final course summary slide"""
+""")
 
-        labels = {
-            "en": {
-                "title": "Course Summary",
-                "outcomes": "What You've Learned",
-                "next": "Next Steps",
-                "thanks": "Thank You!"
-            },
-            "ja": {
-                "title": "コースのまとめ",
-                "outcomes": "学んだこと",
-                "next": "次のステップ",
-                "thanks": "ありがとうございました！"
-            }
-        }
-
-        lang = labels.get(language, labels["en"])
-        outcomes = course.get("learning_outcomes", [])
-
-        outcome_items = []
-        for i, outcome in enumerate(outcomes, 1):
-            outcome_items.append(
-                f'<li style="margin: 18px 0; padding: 15px 20px; '
-                f'background: linear-gradient(to right, rgba(52, 152, 219, 0.08) 0%, transparent 100%); '
-                f'border-left: 4px solid {self.theme_colors["secondary"]}; border-radius: 5px; list-style: none;">'
-                f'<span style="color: {self.theme_colors["secondary"]}; font-weight: bold; margin-right: 10px;">✓</span>{outcome}'
-                f'</li>'
-            )
-
-        outcomes_html = "\n".join(outcome_items)
-
-        html = f"""
+FINAL_SUMMARY_SLIDE = _env.from_string("""
         <section data-transition="zoom" style="text-align: center;">
-            <div style="background: linear-gradient(135deg, {self.theme_colors['primary']} 0%, {self.theme_colors['secondary']} 100%);
+            <div style="background: linear-gradient(135deg, {{ colors.primary }} 0%, {{ colors.secondary }} 100%);
                         padding: 25px 40px; border-radius: 15px; box-shadow: 0 8px 30px rgba(0,0,0,0.2);
                         display: inline-block; margin-bottom: 40px;">
-                <h2 style="color: white; font-size: 1.8em; margin: 0;">🎓 {lang['title']}</h2>
+                <h2 style="color: white; font-size: 1.8em; margin: 0;">🎓 {{ labels.title }}</h2>
             </div>
             <div style="margin-top: 30px; text-align: left; max-width: 85%; margin-left: auto; margin-right: auto;">
-                <h3 style="margin-bottom: 25px;">✨ {lang['outcomes']}</h3>
+                <h3 style="margin-bottom: 25px;">✨ {{ labels.outcomes }}</h3>
                 <ul style="padding: 0; font-size: 0.9em;">
-                    {outcomes_html}
+{% for outcome in outcomes %}
+                    <li style="margin: 18px 0; padding: 15px 20px; background: linear-gradient(to right, rgba(52, 152, 219, 0.08) 0%, transparent 100%); border-left: 4px solid {{ colors.secondary }}; border-radius: 5px; list-style: none;"><span style="color: {{ colors.secondary }}; font-weight: bold; margin-right: 10px;">✓</span>{{ outcome }}</li>
+{% endfor %}
                 </ul>
             </div>
             <div style="margin-top: 60px; padding: 25px 40px; background: linear-gradient(135deg, rgba(231, 76, 60, 0.1) 0%, rgba(52, 152, 219, 0.1) 100%);
                         border-radius: 15px; display: inline-block;">
-                <p style="font-size: 1.6em; margin: 0; font-weight: 600; background: linear-gradient(135deg, {self.theme_colors['primary']} 0%, {self.theme_colors['accent']} 100%);
+                <p style="font-size: 1.6em; margin: 0; font-weight: 600; background: linear-gradient(135deg, {{ colors.primary }} 0%, {{ colors.accent }} 100%);
                           -webkit-background-clip: text; -webkit-text-fill-color: transparent; background-clip: text;">
-                    {lang['thanks']}
+                    {{ labels.thanks }}
                 </p>
             </div>
         </section>
-        """
-        return html
+""")
+
+THEME_CSS = _env.from_string(""":root {
+    --primary-color: {{ colors.primary }};
+    --secondary-color: {{ colors.secondary }};
+    --accent-color: {{ colors.accent }};
+    --background-color: {{ colors.background }};
+    --text-color: {{ colors.text }};
+    --heading-color: {{ colors.heading }};
+}
+
+.reveal {
+    background-color: var(--background-color);
+    color: var(--text-color);
+    font-family: 'Inter', 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+    font-size: 28px;
+}
+
+.reveal h1, .reveal h2, .reveal h3, .reveal h4 {
+    color: var(--heading-color);
+    font-family: 'Poppins', 'Inter', sans-serif;
+    font-weight: 700;
+    text-transform: none;
+    letter-spacing: -0.5px;
+}
+
+.reveal h1 {
+    font-size: 2.2em;
+    line-height: 1.2;
+}
+
+.reveal h2 {
+    font-size: 1.8em;
+    line-height: 1.3;
+}
+
+.reveal h3 {
+    font-size: 1.4em;
+    line-height: 1.4;
+}
+
+.reveal p {
+    line-height: 1.6;
+    margin: 20px 0;
+}
+
+.reveal a {
+    color: var(--secondary-color);
+    text-decoration: none;
+    transition: all 0.3s ease;
+}
+
+.reveal a:hover {
+    color: var(--accent-color);
+    text-decoration: underline;
+}
+
+.reveal .progress {
+    background: rgba(0,0,0,0.15);
+    height: 4px;
+}
+
+.reveal .progress span {
+    background: linear-gradient(90deg, var(--secondary-color) 0%, var(--accent-color) 100%);
+    transition: width 0.8s ease;
+}
+
+.reveal .controls {
+    color: var(--secondary-color);
+    right: 20px;
+    bottom: 20px;
+}
+
+.reveal .controls button {
+    opacity: 0.7;
+    transition: opacity 0.3s ease;
+}
+
+.reveal .controls button:hover {
+    opacity: 1;
+}
+
+.reveal .slide-number {
+    background-color: rgba(0, 0, 0, 0.05);
+    color: var(--text-color);
+    padding: 5px 12px;
+    border-radius: 4px;
+    font-size: 0.6em;
+    font-weight: 600;
+}
+
+.reveal ul {
+    line-height: 1.4;
+}
+
+.reveal li {
+    margin: 8px 0;
+}
+
+.reveal section {
+    text-align: left;
+    height: 100%;
+    display: flex;
+    flex-direction: column;
+    justify-content: center;
+}
+
+.reveal section[style*="text-align: center"] {
+    text-align: center !important;
+}
+
+/* Animations */
+.reveal .slides section {
+    transition: all 0.5s ease;
+}
+
+/* Print styles */
+@media print {
+    .reveal {
+        background-color: white;
+        font-size: 12pt;
+    }
+    .reveal h1, .reveal h2, .reveal h3 {
+        color: black;
+    }
+    .reveal .controls, .reveal .progress, .reveal .slide-number {
+        display: none !important;
+    }
+}
 
-    def _wrap_in_template(self, slides_html: str, course: Dict, language: str) -> str:
-        """Wraps slides in complete Reveal.js HTML template"""
+/* Responsive adjustments */
+@media (max-width: 1920px) {
+    .reveal {
+        font-size: 26px;
+    }
+}
+
+@media (max-width: 1600px) {
+    .reveal {
+        font-size: 24px;
+    }
+}
+
+@media (max-width: 768px) {
+    .reveal {
+        font-size: 22px;
+    }
+    .reveal h1 {
+        font-size: 1.8em;
+    }
+    .reveal h2 {
+        font-size: 1.5em;
+    }
+    .reveal h3 {
+        font-size: 1.2em;
+    }
+}
+""")
 
-        template = f"""
+DECK_SHELL = _env.from_string("""
 <!DOCTYPE html>
-<html lang="{language}">
+<html lang="{{ language }}">
 <head>
     <meta charset="utf-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{course.get('title', 'Course')}</title>
+    <title>{{ course.get('title', 'Course') }}</title>
 
-    <!-- Reveal.js CSS -->
-    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/reveal.js@4.5.0/dist/reveal.css">
-    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/reveal.js@4.5.0/dist/theme/white.css" id="theme">
+    <!-- Reveal.js and theme CSS -->
+{% for href in stylesheets %}
+    <link rel="stylesheet" href="{{ href }}">
+{% endfor %}
+{% if theme_css %}
 
     <!-- Custom CSS -->
     <style>
-        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&family=Poppins:wght@600;700&display=swap');
-
-        :root {{
-            --primary-color: {self.theme_colors['primary']};
-            --secondary-color: {self.theme_colors['secondary']};
-            --accent-color: {self.theme_colors['accent']};
-            --background-color: {self.theme_colors['background']};
-            --text-color: {self.theme_colors['text']};
-            --heading-color: {self.theme_colors['heading']};
-        }}
-
-        .reveal {{
-            background-color: var(--background-color);
-            color: var(--text-color);
-            font-family: 'Inter', 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            font-size: 28px;
-        }}
-
-        .reveal h1, .reveal h2, .reveal h3, .reveal h4 {{
-            color: var(--heading-color);
-            font-family: 'Poppins', 'Inter', sans-serif;
-            font-weight: 700;
-            text-transform: none;
-            letter-spacing: -0.5px;
-        }}
-
-        .reveal h1 {{
-            font-size: 2.2em;
-            line-height: 1.2;
-        }}
-
-        .reveal h2 {{
-            font-size: 1.8em;
-            line-height: 1.3;
-        }}
-
-        .reveal h3 {{
-            font-size: 1.4em;
-            line-height: 1.4;
-        }}
-
-        .reveal p {{
-            line-height: 1.6;
-            margin: 20px 0;
-        }}
-
-        .reveal a {{
-            color: var(--secondary-color);
-            text-decoration: none;
-            transition: all 0.3s ease;
-        }}
-
-        .reveal a:hover {{
-            color: var(--accent-color);
-            text-decoration: underline;
-        }}
-
-        .reveal .progress {{
-            background: rgba(0,0,0,0.15);
-            height: 4px;
-        }}
-
-        .reveal .progress span {{
-            background: linear-gradient(90deg, var(--secondary-color) 0%, var(--accent-color) 100%);
-            transition: width 0.8s ease;
-        }}
-
-        .reveal .controls {{
-            color: var(--secondary-color);
-            right: 20px;
-            bottom: 20px;
-        }}
-
-        .reveal .controls button {{
-            opacity: 0.7;
-            transition: opacity 0.3s ease;
-        }}
-
-        .reveal .controls button:hover {{
-            opacity: 1;
-        }}
-
-        .reveal .slide-number {{
-            background-color: rgba(0, 0, 0, 0.05);
-            color: var(--text-color);
-            padding: 5px 12px;
-            border-radius: 4px;
-            font-size: 0.6em;
-            font-weight: 600;
-        }}
-
-        .reveal ul {{
-            line-height: 1.4;
-        }}
-
-        .reveal li {{
-            margin: 8px 0;
-        }}
-
-        .reveal section {{
-            text-align: left;
-            height: 100%;
-            display: flex;
-            flex-direction: column;
-            justify-content: center;
-        }}
-
-        .reveal section[style*="text-align: center"] {{
-            text-align: center !important;
-        }}
-
-        /* Animations */
-        .reveal .slides section {{
-            transition: all 0.5s ease;
-        }}
-
-        /* Print styles */
-        @media print {{
-            .reveal {{
-                background-color: white;
-                font-size: 12pt;
-            }}
-            .reveal h1, .reveal h2, .reveal h3 {{
-                color: black;
-            }}
-            .reveal .controls, .reveal .progress, .reveal .slide-number {{
-                display: none !important;
-            }}
-        }}
-
-        /* Responsive adjustments */
-        @media (max-width: 1920px) {{
-            .reveal {{
-                font-size: 26px;
-            }}
-        }}
-
-        @media (max-width: 1600px) {{
-            .reveal {{
-                font-size: 24px;
-            }}
-        }}
-
-        @media (max-width: 768px) {{
-            .reveal {{
-                font-size: 22px;
-            }}
-            .reveal h1 {{
-                font-size: 1.8em;
-            }}
-            .reveal h2 {{
-                font-size: 1.5em;
-            }}
-            .reveal h3 {{
-                font-size: 1.2em;
-            }}
-        }}
+{% if font_import %}
+        @import url('{{ font_import }}');
+
+{% endif %}
+{{ theme_css }}
     </style>
+{% endif %}
 </head>
 <body>
     <div class="reveal">
         <div class="slides">
-            {slides_html}
+            {{ slides_html }}
         </div>
     </div>
 
     <!-- Reveal.js JavaScript -->
-    <script src="https://cdn.jsdelivr.net/npm/reveal.js@4.5.0/dist/reveal.js"></script>
-    <script src="https://cdn.jsdelivr.net/npm/reveal.js@4.5.0/plugin/notes/notes.js"></script>
-    <script src="https://cdn.jsdelivr.net/npm/reveal.js@4.5.0/plugin/highlight/highlight.js"></script>
-    <script src="https://cdn.jsdelivr.net/npm/reveal.js@4.5.0/plugin/zoom/zoom.js"></script>
+{% for src in scripts %}
+    <script src="{{ src }}"></script>
+{% endfor %}
 
     <script>
         // Initialize Reveal.js
-        Reveal.initialize({{
+        Reveal.initialize({
             hash: true,
             controls: true,
             progress: true,
@@ -588,15 +425,430 @@ class SlideGenerator:
 
             // Plugins
             plugins: [ RevealNotes, RevealHighlight, RevealZoom ]
-        }});
+        });
+    </script>
+{% if lazy_chapters %}
+
+    <script>
+        // Chapters are fetched as the learner gets close to them. Until then
+        // each chapter is represented by its title slide (the placeholder).
+        const chapterLoads = new Map();
+
+        function loadChapter(placeholder) {
+            const src = placeholder.dataset.chapterSrc;
+            if (!chapterLoads.has(src)) {
+                chapterLoads.set(src, fetch(src)
+                    .then(response => {
+                        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                        return response.text();
+                    })
+                    .then(html => {
+                        const current = Reveal.getCurrentSlide();
+                        const template = document.createElement('template');
+                        template.innerHTML = html;
+                        const first = template.content.querySelector('section');
+                        placeholder.replaceWith(template.content);
+                        Reveal.sync();
+
+                        // Loading shifts later slide indexes; stay on the same slide
+                        const indices = Reveal.getIndices(current === placeholder ? first : current);
+                        Reveal.slide(indices.h, indices.v);
+                    })
+                    .catch(error => {
+                        placeholder.dataset.chapterFailed = 'true';
+                        console.error(`Failed to load ${src}:`, error);
+                    }));
+            }
+            return chapterLoads.get(src);
+        }
+
+        function placeholdersUpTo(index) {
+            return Reveal.getHorizontalSlides().filter((slide, i) =>
+                i <= index && slide.dataset.chapterSrc && !slide.dataset.chapterFailed);
+        }
+
+        async function ensureLoaded(index) {
+            let pending = placeholdersUpTo(index);
+            while (pending.length) {
+                await Promise.all(pending.map(loadChapter));
+                pending = placeholdersUpTo(index);
+            }
+        }
+
+        Reveal.on('ready', async event => {
+            // Deep links point past placeholders that haven't expanded yet
+            const [h, v] = location.hash.slice(2).split('/').map(n => parseInt(n));
+            if (location.hash.startsWith('#/') && !isNaN(h)) {
+                await ensureLoaded(h);
+                Reveal.slide(h, isNaN(v) ? 0 : v);
+            }
+            ensureLoaded(Reveal.getIndices().h + 1);
+        });
+
+        Reveal.on('slidechanged', event => ensureLoaded(event.indexh + 1));
     </script>
+{% endif %}
 </body>
 </html>
-"""
-        return template
+""")
+
+
+# Public CDNs, only used when ASSETS_CDN_FALLBACK is on (or for standalone decks)
+ASSETS_CDN_FALLBACK = config('ASSETS_CDN_FALLBACK', default=False, cast=bool)
+REVEAL_CDN = "https://cdn.jsdelivr.net/npm/reveal.js@4.5.0"
+GOOGLE_FONTS_CSS = "https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&family=Poppins:wght@600;700&display=swap"
+REVEAL_STYLESHEETS = ["dist/reveal.css", "dist/theme/white.css"]
+REVEAL_SCRIPTS = [
+    "dist/reveal.js",
+    "plugin/notes/notes.js",
+    "plugin/highlight/highlight.js",
+    "plugin/zoom/zoom.js"
+]
+
+# Used when a deck is rendered without a shared asset bundle (demos,
+# benchmarks): a single self-contained file has nothing local to link to
+CDN_DECK_ASSETS = {
+    "stylesheets": [f"{REVEAL_CDN}/{path}" for path in REVEAL_STYLESHEETS],
+    "scripts": [f"{REVEAL_CDN}/{path}" for path in REVEAL_SCRIPTS]
+}
+
+
+@lru_cache(maxsize=None)
+def render_theme_css(theme: str) -> str:
+    """Renders the deck stylesheet once per theme"""
+    return THEME_CSS.render(colors=THEMES.get(theme, THEMES["light"]))
+
+
+class _FragmentCache:
+    """Thread-safe LRU of rendered chapter fragments keyed by content hash"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            html = self._items.get(key)
+            if html is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return html
+
+    def put(self, key: str, html: str):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._items[key] = html
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+chapter_fragment_cache = _FragmentCache(config('SLIDE_FRAGMENT_CACHE_SIZE', default=512, cast=int))
+
+
+def resolve_theme(theme: Optional[str]) -> str:
+    """Returns a known theme name, falling back to light"""
+    return theme if theme in THEMES else "light"
+
+
+class SlideGenerator:
+    """
+    Generates professional slide decks from course structure
+
+    Rendering is stateless: theme and language are passed per call, so one
+    generator can serve concurrent requests with different themes.
+    """
+
+    def __init__(self, theme: str = "light", asset_bundle=None):
+        """
+        Args:
+            theme: Default theme when a call doesn't pass one ("light", "dark", or "corporate")
+            asset_bundle: Optional CourseAssets; decks then link its shared
+                stylesheets and scripts instead of inlining CSS and using CDNs
+        """
+        self.theme = theme
+        self.theme_colors = self._get_theme_colors(theme)
+        self.asset_bundle = asset_bundle
+
+    def _get_theme_colors(self, theme: str) -> Dict:
+        """Returns color scheme for the selected theme"""
+        return THEMES[resolve_theme(theme)]
+
+    def create_slide_deck(
+        self,
+        course_data: Dict,
+        language: str = "en",
+        theme: Optional[str] = None,
+        assets: Optional[Dict] = None
+    ) -> str:
+        """
+        Creates complete HTML slide deck from course structure
+
+        Args:
+            course_data: Course structure from CourseStructurer
+            language: Language code
+            theme: Theme for this deck (the generator's default if None)
+            assets: Stylesheet and script URLs from CourseAssets.deck_assets
+                (taken from the generator's asset bundle if None)
+
+        Returns:
+            Complete HTML string for slide deck
+        """
+        slides_html, _ = self.render_deck(course_data, language, theme, assets, chunked=False)
+        return slides_html
+
+    @timed_stage("slides")
+    def render_deck(
+        self,
+        course_data: Dict,
+        language: str = "en",
+        theme: Optional[str] = None,
+        assets: Optional[Dict] = None,
+        chunked: Optional[bool] = None
+    ) -> Tuple[str, Dict[str, str]]:
+        """
+        Renders a slide deck, either as one page or chunked per chapter
+
+        A chunked deck is a lightweight shell that holds each chapter's title
+        slide and fetches the rest of the chapter (with its speaker notes)
+        on demand, from a fragment file next to the deck.
+
+        Args:
+            course_data: Course structure from CourseStructurer
+            language: Language code
+            theme: Theme for this deck (the generator's default if None)
+            assets: Stylesheet and script URLs from CourseAssets.deck_assets
+            chunked: Force chunked (True) or single-page (False) output;
+                by default decks of SLIDE_CHUNK_THRESHOLD slides or more are chunked
+
+        Returns:
+            (deck HTML, dict of chapter fragment path -> HTML; empty if not chunked)
+        """
+
+        theme = resolve_theme(theme or self.theme)
+        colors = THEMES[theme]
+        course = course_data.get("course", {})
+
+        # Build slides
+        slides_html = []
+
+        # 1. Title slide
+        slides_html.append(self._create_title_slide(course, language, colors))
+
+        # 2. Table of contents
+        slides_html.append(self._create_toc_slide(course, language, colors))
+
+        # 3. Chapter slides
+        if chunked is None:
+            threshold = config('SLIDE_CHUNK_THRESHOLD', default=150, cast=int)
+            chunked = threshold > 0 and self.count_slides(course_data) >= threshold
+
+        chapter_files = {}
+        for i, chapter in enumerate(course.get("chapters", []), 1):
+            if chunked:
+                chapter_src = f"{CHAPTERS_DIRNAME}/chapter-{i:02d}.html"
+                chapter_files[chapter_src] = self.create_chapter_slides(chapter, theme)
+                slides_html.append(CHAPTER_TITLE_SLIDE.render(colors=colors, chapter=chapter, chapter_src=chapter_src))
+            else:
+                slides_html.append(self.create_chapter_slides(chapter, theme))
+
+        # 4. Final summary slide
+        slides_html.append(self._create_final_summary_slide(course, language, colors))
+
+        # Combine all slides
+        all_slides = "\n\n".join(slides_html)
+
+        # Wrap in Reveal.js template
+        if assets is None and self.asset_bundle is not None:
+            assets = self.asset_bundle.deck_assets(theme)
+        full_html = self._wrap_in_template(all_slides, course, language, theme, assets, lazy_chapters=chunked)
+
+        return full_html, chapter_files
+
+    def count_slides(self, course_data: Dict) -> int:
+        """Number of slides a deck will have, without rendering it"""
+
+        chapters = course_data.get("course", {}).get("chapters", [])
+        count = 3  # Title, table of contents, final summary
+        for chapter in chapters:
+            content_slides = (len(chapter.get("key_points", [])) + POINTS_PER_SLIDE - 1) // POINTS_PER_SLIDE
+            count += 3 + content_slides  # Chapter title, objectives, summary
+        return count
+
+    def create_chapter_slides(self, chapter: Dict, theme: Optional[str] = None) -> str:
+        """
+        Creates all slides of one chapter as an HTML fragment
+
+        Fragments are memoized by theme colors and chapter content, so
+        re-rendering an unchanged chapter is a cache lookup.
+
+        Args:
+            chapter: Chapter data from the course structure
+            theme: Theme for the fragment (the generator's default if None)
+
+        Returns:
+            HTML string with the chapter's <section> elements
+        """
+
+        colors = THEMES[resolve_theme(theme or self.theme)]
+        key = self._chapter_key(chapter, colors)
+        cached = chapter_fragment_cache.get(key)
+        if cached is not None:
+            return cached
+
+        slides_html = []
+
+        # Chapter title slide
+        slides_html.append(self._create_chapter_title_slide(chapter, colors))
+
+        # Learning objectives slide
+        slides_html.append(self._create_objectives_slide(chapter, colors))
+
+        # Content slides
+        content_slides = self._create_content_slides(chapter, colors)
+        slides_html.extend(content_slides)
+
+        # Chapter summary slide
+        slides_html.append(self._create_chapter_summary_slide(chapter, colors))
+
+        html = "\n\n".join(slides_html)
+        chapter_fragment_cache.put(key, html)
+        return html
+
+    def _chapter_key(self, chapter: Dict, colors: Dict) -> str:
+        """Content hash of a chapter plus the colors it is rendered with"""
+        payload = json.dumps([colors, chapter], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _create_title_slide(self, course: Dict, language: str, colors: Dict) -> str:
+        """Creates the title slide"""
+
+        labels = TITLE_LABELS.get(language, TITLE_LABELS["en"])
+        difficulty = course.get("difficulty", "intermediate")
+
+        return TITLE_SLIDE.render(
+            colors=colors,
+            course=course,
+            labels=labels,
+            duration=course.get("duration", ""),
+            difficulty=labels.get(difficulty, difficulty),
+            generated=datetime.now().strftime("%B %Y")
+        )
+
+    def _create_toc_slide(self, course: Dict, language: str, colors: Dict) -> str:
+        """Creates table of contents slide"""
+
+        return TOC_SLIDE.render(
+            colors=colors,
+            title=TOC_LABELS.get(language, TOC_LABELS["en"]),
+            chapters=course.get("chapters", [])
+        )
+
+    def _create_chapter_title_slide(self, chapter: Dict, colors: Dict) -> str:
+        """Creates chapter title slide"""
+        return CHAPTER_TITLE_SLIDE.render(colors=colors, chapter=chapter)
+
+    def _create_objectives_slide(self, chapter: Dict, colors: Dict) -> str:
+        """Creates learning objectives slide"""
+
+        return OBJECTIVES_SLIDE.render(
+            colors=colors,
+            objectives=chapter.get("learning_objectives", [])
+        )
+
+    def _create_content_slides(self, chapter: Dict, colors: Dict) -> List[str]:
+        """Creates content slides from chapter content"""
+
+        key_points = chapter.get("key_points", [])
+        content = chapter.get("content", "")
+        total_parts = (len(key_points) + POINTS_PER_SLIDE - 1) // POINTS_PER_SLIDE
+
+        slides = []
+        for i in range(0, len(key_points), POINTS_PER_SLIDE):
+            slides.append(CONTENT_SLIDE.render(
+                colors=colors,
+                title=chapter.get("title", ""),
+                points=key_points[i:i + POINTS_PER_SLIDE],
+                icons=CONTENT_ICONS,
+                part=(i // POINTS_PER_SLIDE) + 1,
+                total_parts=total_parts,
+                notes=content[:500]
+            ))
+
+        return slides
+
+    def _create_chapter_summary_slide(self, chapter: Dict, colors: Dict) -> str:
+        """Creates chapter summary slide"""
+
+        return CHAPTER_SUMMARY_SLIDE.render(
+            colors=colors,
+            chapter=chapter,
+            points=chapter.get("key_points", [])[:3]  # Top 3 points
+        )
+
+    def _create_final_summary_slide(self, course: Dict, language: str, colors: Dict) -> str:
+        """Creates final course summary slide"""
+
+        return FINAL_SUMMARY_SLIDE.render(
+            colors=colors,
+            labels=SUMMARY_LABELS.get(language, SUMMARY_LABELS["en"]),
+            outcomes=course.get("learning_outcomes", [])
+        )
+
+    def _wrap_in_template(
+        self,
+        slides_html: str,
+        course: Dict,
+        language: str,
+        theme: str,
+        assets: Optional[Dict] = None,
+        lazy_chapters: bool = False
+    ) -> str:
+        """Wraps slides in complete Reveal.js HTML template"""
+
+        if assets:
+            # Theme CSS is one of the shared stylesheets
+            return DECK_SHELL.render(
+                language=language,
+                course=course,
+                stylesheets=assets["stylesheets"],
+                scripts=assets["scripts"],
+                theme_css=None,
+                slides_html=slides_html,
+                lazy_chapters=lazy_chapters
+            )
+
+        return DECK_SHELL.render(
+            language=language,
+            course=course,
+            stylesheets=CDN_DECK_ASSETS["stylesheets"],
+            scripts=CDN_DECK_ASSETS["scripts"],
+            theme_css=render_theme_css(theme),
+            # Without the web fonts the theme falls back to system fonts
+            font_import=GOOGLE_FONTS_CSS if ASSETS_CDN_FALLBACK else None,
+            slides_html=slides_html,
+            lazy_chapters=lazy_chapters
+        )
 
     def apply_theme(self, theme: str):
-        """Changes the theme"""
+        """
+        Changes the default theme
+
+        Not safe on a generator shared between requests; pass theme to
+        create_slide_deck instead.
+        """
         self.theme = theme
         self.theme_colors = self._get_theme_colors(theme)
 
@@ -611,13 +863,52 @@ class SlideGenerator:
         try:
             with open(output_path, 'w', encoding='utf-8') as f:
                 f.write(slides_html)
-            print(f"Slides exported to: {output_path}")
+            logger.info("Slides exported", extra={"output_path": output_path})
             return True
         except Exception as e:
-            print(f"Error exporting slides: {str(e)}")
+            logger.error("Error exporting slides", extra={"output_path": output_path, "error": str(e)})
             return False
 
 
+def _render_deck_job(job: Dict) -> Tuple[str, Dict[str, str]]:
+    """Process pool entry point: renders one deck from a job dict"""
+    return SlideGenerator().render_deck(
+        job["course_data"],
+        language=job.get("language", "en"),
+        theme=job.get("theme"),
+        assets=job.get("assets"),
+        chunked=job.get("chunked")
+    )
+
+
+def render_decks_parallel(jobs: List[Dict], max_workers: Optional[int] = None) -> List[Tuple[str, Dict[str, str]]]:
+    """
+    Renders many slide decks across a process pool, e.g. for catalog-wide rebuilds
+
+    Args:
+        jobs: Dicts with course_data, and optionally theme, language, chunked
+            and assets (deck asset URLs, as resolved by CourseAssets in the parent)
+        max_workers: Worker processes (SLIDE_RENDER_PROCESSES, or CPU count)
+
+    Returns:
+        (deck HTML, chapter fragments) per job, as from render_deck, in job order
+    """
+
+    if not jobs:
+        return []
+
+    if max_workers is None:
+        max_workers = config('SLIDE_RENDER_PROCESSES', default=0, cast=int) or os.cpu_count() or 1
+    max_workers = min(max_workers, len(jobs))
+
+    # Not worth a process pool for a single deck
+    if max_workers <= 1:
+        return [_render_deck_job(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_render_deck_job, jobs, chunksize=max(1, len(jobs) // (max_workers * 4))))
+
+
 # Helper function
 def generate_slides(course_data: Dict, theme: str = "light", language: str = "en") -> str:
     """
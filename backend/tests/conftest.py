@@ -0,0 +1,74 @@
+"""
+Shared test helpers
+
+fake_llm stands in for the OpenAI client: tests give it a responder that
+turns each chat.completions.create() call into a JSON reply, or raises.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeLLM:
+    """Records calls; each reply is json.dumps(responder(call_number, prompt))"""
+
+    def __init__(self):
+        self.responder = lambda call, prompt: {}
+        self.delay = 0.0
+        self.calls = 0
+        self.max_concurrent = 0
+        self._running = 0
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model=None, messages=None, **kwargs):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+            self._running += 1
+            self.max_concurrent = max(self.max_concurrent, self._running)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            content = json.dumps(self.responder(call, messages[-1]["content"]))
+        finally:
+            with self._lock:
+                self._running -= 1
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def distinct_text(n: int) -> str:
+    """A sentence sharing no words with distinct_text(m) for m != n"""
+    return " ".join(hashlib.sha1(f"{n}-{i}".encode()).hexdigest()[:10] for i in range(10))
+
+
+@pytest.fixture
+def fake_llm():
+    return FakeLLM()
+
+
+@pytest.fixture
+def course_chapters():
+    return {
+        "course": {
+            "title": "Test Course",
+            "chapters": [
+                {
+                    "number": n,
+                    "title": f"Chapter {n}",
+                    "content": f"Content of chapter {n}",
+                    "key_points": [f"Point {i} of chapter {n}" for i in range(6)]
+                }
+                for n in range(1, 4)
+            ]
+        }
+    }
@@ -0,0 +1,117 @@
+"""
+Course file serving tests
+
+Precompressed siblings are written at build time and negotiated per
+request, with strong ETags, 304s and byte ranges.
+
+Usage (from backend/):
+    python -m pytest tests
+"""
+
+import gzip
+import os
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from file_serving import precompress, serve_file, PRECOMPRESS_MIN_BYTES
+
+
+PAGE = b"<html><body>" + b"<p>lesson text</p>" * 2000 + b"</body></html>"
+
+
+@pytest.fixture
+def page(tmp_path):
+    path = tmp_path / "index.html"
+    path.write_bytes(PAGE)
+    precompress(str(path))
+    return str(path)
+
+
+@pytest.fixture
+def client(page):
+    app = FastAPI()
+
+    @app.get("/file")
+    async def get_file(request: Request):
+        return serve_file(request, page, "text/html", "public, no-cache")
+
+    return TestClient(app)
+
+
+def raw_get(client, headers):
+    """Response without httpx decoding the Content-Encoding"""
+    with client.stream("GET", "/file", headers=headers) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_precompress_skips_small_and_binary_files(tmp_path, page):
+    small = tmp_path / "small.css"
+    small.write_bytes(b"a{}" * (PRECOMPRESS_MIN_BYTES // 10))
+    media = tmp_path / "audio.mp3"
+    media.write_bytes(os.urandom(PRECOMPRESS_MIN_BYTES * 4))
+
+    precompress(str(small))
+    precompress(str(media))
+
+    assert gzip.decompress((tmp_path / "index.html.gz").read_bytes()) == PAGE
+    assert not (tmp_path / "small.css.gz").exists()
+    assert not (tmp_path / "audio.mp3.gz").exists()
+
+
+def test_gzip_variant_is_negotiated(client):
+    response, body = raw_get(client, {"Accept-Encoding": "gzip"})
+    identity, identity_body = raw_get(client, {"Accept-Encoding": "identity"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(body) == PAGE
+    assert "content-encoding" not in identity.headers
+    assert identity_body == PAGE
+    for r in (response, identity):
+        assert r.headers["vary"] == "Accept-Encoding"
+        assert r.headers["cache-control"] == "public, no-cache"
+    # Each representation has its own validator
+    assert response.headers["etag"] != identity.headers["etag"]
+
+
+def test_stale_sibling_is_not_served(client, page):
+    stat = os.stat(page)
+    os.utime(page + ".gz", ns=(stat.st_atime_ns, stat.st_mtime_ns - 10**9))
+
+    response, body = raw_get(client, {"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert body == PAGE
+
+
+def test_matching_etag_gets_304(client):
+    etag = client.get("/file").headers["etag"]
+
+    response = client.get("/file", headers={"If-None-Match": f"W/{etag}"})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_byte_ranges(client):
+    response = client.get("/file", headers={"Range": "bytes=10-19"})
+    assert response.status_code == 206
+    assert response.content == PAGE[10:20]
+    assert response.headers["content-range"] == f"bytes 10-19/{len(PAGE)}"
+
+    suffix = client.get("/file", headers={"Range": "bytes=-5"})
+    assert suffix.status_code == 206
+    assert suffix.content == PAGE[-5:]
+
+    unsatisfiable = client.get("/file", headers={"Range": f"bytes={len(PAGE)}-"})
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["content-range"] == f"bytes */{len(PAGE)}"
+
+
+def test_if_range_mismatch_sends_the_whole_file(client):
+    response = client.get("/file", headers={"Range": "bytes=0-9", "If-Range": '"outdated"'})
+
+    assert response.status_code == 200
+    assert response.content == PAGE
@@ -0,0 +1,231 @@
+"""
+HTML optimizer fidelity tests
+
+Each generated page type (quiz page, chunked deck shell, chapter fragment)
+is optimized and both versions are parsed into element trees with their
+effective inline declarations (hoisted classes expanded back from the
+generated stylesheet). The trees must match, independently of the
+optimizer's own verification.
+
+Usage (from backend/):
+    python -m pytest tests
+"""
+
+import os
+import re
+import sys
+from html.parser import HTMLParser
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course_assembler import CourseAssembler
+from html_optimizer import HOISTED_STYLE_ATTR, optimize_html
+from slide_generator import SlideGenerator
+
+
+_HOISTED_RULE = re.compile(r"\.(hs-[0-9a-f]+):not\(#\1\)\{([^}]*)\}")
+
+DECK_ASSETS = {
+    "stylesheets": ["../_assets/reveal/dist/reveal.css", "../_assets/slides-light.css"],
+    "scripts": ["../_assets/reveal/dist/reveal.js"]
+}
+
+
+class _TreeBuilder(HTMLParser):
+    """Element tree as nested (tag, attrs, declarations, children) tuples"""
+
+    def __init__(self):
+        super().__init__()
+        self.root = ("#document", (), frozenset(), [])
+        self.stack = [self.root]
+        self.hoisted_css = ""
+        self._in_hoisted = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "style" and any(name == HOISTED_STYLE_ATTR for name, _ in attrs):
+            self._in_hoisted = True
+            return
+        node = (tag, attrs, None, [])
+        self.stack[-1][3].append(node)
+        if tag not in ("meta", "link", "br", "img", "input", "hr"):
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        self.stack[-1][3].append((tag, attrs, None, []))
+
+    def handle_endtag(self, tag):
+        if self._in_hoisted and tag == "style":
+            self._in_hoisted = False
+            return
+        if len(self.stack) > 1 and self.stack[-1][0] == tag:
+            self.stack.pop()
+
+    def handle_data(self, data):
+        if self._in_hoisted:
+            self.hoisted_css += data
+            return
+        text = " ".join(data.split())
+        if text:
+            self.stack[-1][3].append(text)
+
+
+def _declarations(style):
+    result = set()
+    for part in (style or "").split(";"):
+        prop, sep, value = part.partition(":")
+        if sep and prop.strip() and value.strip():
+            result.add(f"{prop.strip().lower()}:{' '.join(value.split())}")
+    return result
+
+
+def _normalize(node, classes):
+    """Comparable form: hoisted classes become the declarations they stand for"""
+
+    if isinstance(node, str):
+        return node
+
+    tag, attrs, _, children = node
+    declarations = set()
+    plain_attrs = []
+    for name, value in attrs:
+        if name == "style":
+            declarations |= _declarations(value)
+        elif name == "class":
+            kept = []
+            for class_name in (value or "").split():
+                if class_name in classes:
+                    declarations |= _declarations(classes[class_name])
+                else:
+                    kept.append(class_name)
+            if kept:
+                plain_attrs.append(("class", " ".join(sorted(kept))))
+        else:
+            plain_attrs.append((name, value))
+
+    # Script and style bodies are minified; compare the markup around them
+    if tag in ("script", "style"):
+        children = []
+
+    merged = []
+    for child in children:
+        child = _normalize(child, classes)
+        if isinstance(child, str) and merged and isinstance(merged[-1], str):
+            merged[-1] = f"{merged[-1]} {child}"
+        else:
+            merged.append(child)
+
+    return (tag, tuple(sorted(plain_attrs, key=lambda a: (a[0], a[1] or ""))), frozenset(declarations), tuple(merged))
+
+
+def dom(html):
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    classes = dict(_HOISTED_RULE.findall(builder.hoisted_css))
+    return _normalize(builder.root, classes), builder.hoisted_css
+
+
+def assert_same_rendering(html, hoists=True):
+    optimized, stats = optimize_html(html)
+
+    assert stats["verified"]
+    assert stats["saved_bytes"] > 0, "optimizer fell back to the original page"
+    assert (stats["hoisted_styles"] > 0) == hoists
+
+    original_tree, _ = dom(html)
+    optimized_tree, hoisted_css = dom(optimized)
+    assert optimized_tree == original_tree
+    assert "!important" not in hoisted_css
+    return optimized
+
+
+@pytest.fixture
+def course_data():
+    return {
+        "course": {
+            "title": "Fidelity Course",
+            "description": "Checks that optimized pages render the same",
+            "learning_outcomes": ["Explain A", "Apply B", "Compare C & D"],
+            "chapters": [
+                {
+                    "number": n,
+                    "title": f"Chapter {n}",
+                    "duration": "20",
+                    "learning_objectives": [f"Objective {n}.{i}" for i in range(3)],
+                    "key_points": [f"Point {i} of chapter {n} <with> markup & entities" for i in range(7)],
+                    "content": f"Body text of chapter {n}.   With   extra   spaces."
+                }
+                for n in range(1, 5)
+            ]
+        }
+    }
+
+
+@pytest.fixture
+def quiz_data():
+    return {
+        "quiz": {
+            "title": "Fidelity Quiz",
+            "passing_score": 70,
+            "questions": [
+                {
+                    "id": 1, "type": "multiple_choice", "difficulty": "easy", "points": 1,
+                    "question": "Which option is right?",
+                    "options": ["First", "Second <b>", "Third & fourth"],
+                    "correct_answer": 1, "explanation": "Because."
+                },
+                {
+                    "id": 2, "type": "true_false", "difficulty": "medium", "points": 1,
+                    "question": "Is this true?", "options": ["True", "False"],
+                    "correct_answer": 0, "explanation": "It is."
+                },
+                {
+                    "id": 3, "type": "fill_blank", "difficulty": "hard", "points": 2,
+                    "question": "The answer is _____.", "correct_answer": "blank",
+                    "acceptable_answers": ["blank"], "explanation": "Filled."
+                }
+            ]
+        }
+    }
+
+
+def test_quiz_page(tmp_path, quiz_data):
+    assembler = CourseAssembler(output_dir=str(tmp_path))
+    html = assembler._generate_quiz_html(quiz_data, "Fidelity Course", "en")
+    # Quiz styles live in quiz.css; the page is only minified
+    assert_same_rendering(html, hoists=False)
+
+
+def test_deck_shell_and_chapter_fragments(course_data):
+    shell, chapters = SlideGenerator().render_deck(course_data, language="en", assets=DECK_ASSETS, chunked=True)
+    assert chapters
+
+    assert_same_rendering(shell)
+    for fragment in chapters.values():
+        optimized = assert_same_rendering(fragment)
+        # Fragments have no <head>: their hoisted rules travel with the markup
+        assert optimized.startswith(f"<style {HOISTED_STYLE_ATTR}>")
+
+
+def test_inline_important_and_single_styles_are_kept():
+    html = "<div>" + "".join(
+        f'<p style="color: red !important;   margin: 0">item {i}</p>' for i in range(20)
+    ) + '<p style="padding: 3px">single</p></div>'
+
+    optimized, stats = optimize_html(html)
+
+    assert stats["hoisted_styles"] == 1
+    assert 'style="padding:3px"' in optimized
+    assert "color:red !important" in optimized
+    assert dom(optimized)[0] == dom(html)[0]
+
+
+def test_hoisted_rules_leave_script_overrides_working():
+    html = "".join(f'<div id="s{i}" style="display: block; margin: 0 auto">section {i}</div>' for i in range(20))
+    optimized, _ = optimize_html(html)
+
+    _, hoisted_css = dom(optimized)
+    # ID-level specificity, but no !important: element.style writes still win
+    assert re.fullmatch(r"\.(hs-[0-9a-f]+):not\(#\1\)\{display:block;margin:0 auto\}", hoisted_css)
@@ -0,0 +1,121 @@
+"""
+Question bank tests
+
+Quizzes are sampled from the bank spread across chapters and preferring
+the least used questions; only shortfalls are generated.
+
+Usage (from backend/):
+    python -m pytest tests
+"""
+
+from collections import Counter
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from conftest import distinct_text
+from course_models import BankQuestion
+from models import Base
+from question_bank import QuestionBank
+from quiz_generator import QuizGenerator
+
+
+VIDEO_ID = 1
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def bank_question(n, chapter, difficulty):
+    return {
+        "type": "mcq", "question": distinct_text(n), "options": ["A", "B", "C", "D"],
+        "correct_answer": 0, "chapter": chapter, "difficulty": difficulty
+    }
+
+
+def fill_bank(db, layout):
+    """layout: (chapter, difficulty, number of questions) triples"""
+    questions = []
+    for chapter, difficulty, count in layout:
+        questions += [bank_question(len(questions) + i, chapter, difficulty) for i in range(count)]
+    QuestionBank().add_questions(db, VIDEO_ID, "en", questions)
+
+
+def test_sample_spreads_each_difficulty_across_chapters(db):
+    # Chapter 1 alone could fill the quiz
+    fill_bank(db, [(1, "easy", 6), (1, "medium", 6), (2, "easy", 1), (2, "medium", 1), (3, "easy", 1), (3, "medium", 1)])
+
+    sampled, shortfall = QuestionBank().sample(db, VIDEO_ID, "en", {"easy": 3, "medium": 3})
+
+    assert shortfall == {}
+    assert Counter(q["chapter"] for q in sampled) == {1: 2, 2: 2, 3: 2}
+    assert Counter((q["chapter"], q["difficulty"]) for q in sampled if q["chapter"] != 1) == {
+        (2, "easy"): 1, (2, "medium"): 1, (3, "easy"): 1, (3, "medium"): 1
+    }
+
+
+def test_sample_balances_chapters_across_difficulties(db):
+    fill_bank(db, [(1, "easy", 3), (2, "easy", 3), (1, "hard", 3), (2, "hard", 3)])
+
+    sampled, _ = QuestionBank().sample(db, VIDEO_ID, "en", {"easy": 1, "hard": 1})
+
+    # The hard pick comes from the chapter the easy pick didn't use
+    assert sorted(q["chapter"] for q in sampled) == [1, 2]
+
+
+def test_sample_prefers_least_used_questions(db):
+    fill_bank(db, [(1, "easy", 4)])
+    bank = QuestionBank()
+
+    first, _ = bank.sample(db, VIDEO_ID, "en", {"easy": 2})
+    second, _ = bank.sample(db, VIDEO_ID, "en", {"easy": 2})
+
+    assert {q["bank_id"] for q in first}.isdisjoint(q["bank_id"] for q in second)
+    assert {row.times_used for row in db.query(BankQuestion)} == {1}
+
+
+def test_sample_reports_shortfall(db):
+    fill_bank(db, [(1, "easy", 1), (2, "medium", 2)])
+
+    sampled, shortfall = QuestionBank().sample(db, VIDEO_ID, "en", {"easy": 3, "medium": 2, "hard": 1})
+
+    assert len(sampled) == 3
+    assert shortfall == {"easy": 2, "hard": 1}
+
+
+def test_add_questions_skips_near_duplicates_of_banked_ones(db):
+    bank = QuestionBank()
+    fill_bank(db, [(1, "easy", 2)])
+
+    added = bank.add_questions(db, VIDEO_ID, "en", [bank_question(0, 1, "easy"), bank_question(99, 2, "hard")])
+
+    assert added == 1
+    assert db.query(BankQuestion).count() == 3
+
+
+def test_build_quiz_generates_only_the_shortfall(db, fake_llm, monkeypatch, course_chapters):
+    monkeypatch.setattr(QuizGenerator, "client", property(lambda self: fake_llm))
+    fake_llm.responder = lambda call, prompt: {
+        "question": distinct_text(1000 + call), "options": ["A", "B", "C", "D"], "correct_answer": 0
+    }
+    fill_bank(db, [(1, "easy", 2), (2, "medium", 2)])
+
+    quiz = QuestionBank().build_quiz(
+        db, QuizGenerator(), VIDEO_ID, "en", "Test Course", lambda: course_chapters,
+        num_questions=5, question_types=["mcq"]
+    )
+
+    report = quiz["bank_report"]
+    assert (report["sampled"], report["generated"]) == (4, 1)
+    assert report["shortfall"] == {"hard": 1}
+    assert fake_llm.calls == 1
+    assert len(quiz["quiz"]["questions"]) == 5
+    # The top-up is banked for the next quiz
+    assert db.query(BankQuestion).filter(BankQuestion.difficulty == "hard").count() == 1
@@ -0,0 +1,90 @@
+"""
+Near-duplicate question tests
+
+MinHash/LSH flags reworded questions within a quiz and against the
+question bank, and only the flagged questions are generated again.
+
+Usage (from backend/):
+    python -m pytest tests
+"""
+
+import pytest
+
+from conftest import distinct_text
+from question_dedup import QuestionDeduplicator
+from quiz_generator import QuizGenerator
+
+
+REPEATED = "Which protocol does the browser use to fetch a web page from the server?"
+REWORDED = "Which protocol does a browser use to fetch the web page from a server?"
+
+
+def question(text, answer="HTTP"):
+    return {"type": "mcq", "question": text, "options": [answer, "FTP", "SMTP", "SSH"], "correct_answer": 0}
+
+
+@pytest.fixture
+def generator(fake_llm, monkeypatch):
+    monkeypatch.setattr(QuizGenerator, "client", property(lambda self: fake_llm))
+    generator = QuizGenerator()
+    generator.max_attempts = 2
+    generator.retry_backoff = 0.001
+    return generator
+
+
+def test_reworded_question_is_flagged_and_the_first_kept():
+    questions = [question(REPEATED), question(distinct_text(1)), question(REWORDED)]
+
+    duplicates = QuestionDeduplicator().find_duplicates(questions)
+
+    assert [(d["index"], d["duplicate_of"], d["source"]) for d in duplicates] == [(2, 0, "quiz")]
+    assert duplicates[0]["similarity"] >= 0.6
+
+
+def test_bank_questions_are_not_repeated():
+    bank = [question(distinct_text(1)), question(REPEATED)]
+    questions = [question(distinct_text(2)), question(REWORDED)]
+
+    duplicates = QuestionDeduplicator().find_duplicates(questions, bank)
+
+    assert [(d["index"], d["duplicate_of"], d["source"]) for d in duplicates] == [(1, 1, "bank")]
+
+
+def test_generate_quiz_regenerates_only_the_duplicate(generator, fake_llm, course_chapters):
+    prompts = []
+
+    def respond(call, prompt):
+        prompts.append(prompt)
+        # The first two questions come back the same
+        return question(REPEATED if call <= 2 else distinct_text(call))
+
+    fake_llm.responder = respond
+    quiz = generator.generate_quiz(course_chapters, num_questions=5, question_types=["mcq"])
+
+    texts = [q["question"] for q in quiz["quiz"]["questions"]]
+    assert len(texts) == 5
+    assert texts.count(REPEATED) == 1
+    assert len(quiz["generation_report"]["duplicates"]) == 1
+    assert quiz["generation_report"]["unresolved_duplicates"] == 0
+    # One extra call, told which question to avoid
+    assert fake_llm.calls == 6
+    assert REPEATED in prompts[-1]
+
+
+def test_regenerate_duplicates_replaces_only_flagged_questions(generator, fake_llm, course_chapters):
+    questions = [
+        {**question(REPEATED), "id": 1, "chapter": 1, "difficulty": "easy"},
+        {**question(distinct_text(1)), "id": 2, "chapter": 2, "difficulty": "medium"},
+        {**question(REWORDED), "id": 3, "chapter": 3, "difficulty": "hard"}
+    ]
+    quiz_data = {"quiz": {"questions": list(questions)}}
+    fake_llm.responder = lambda call, prompt: question(distinct_text(100 + call))
+
+    result = generator.regenerate_duplicates(quiz_data, course_chapters)
+
+    updated = result["quiz"]["questions"]
+    assert updated[0] is questions[0] and updated[1] is questions[1]
+    assert updated[2]["question"] == distinct_text(101)
+    assert (updated[2]["id"], updated[2]["chapter"], updated[2]["difficulty"]) == (3, 3, "hard")
+    assert result["regeneration_report"]["regenerated"] == 1
+    assert fake_llm.calls == 1
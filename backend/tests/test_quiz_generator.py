@@ -0,0 +1,88 @@
+"""
+Quiz generation tests
+
+Questions are generated concurrently against a stubbed client, and failed
+questions are retried with backoff until the count is met or attempts run
+out.
+
+Usage (from backend/):
+    python -m pytest tests
+"""
+
+import time
+
+import pytest
+
+from conftest import distinct_text
+from quiz_generator import QuizGenerator
+
+
+@pytest.fixture
+def generator(fake_llm, monkeypatch):
+    monkeypatch.setattr(QuizGenerator, "client", property(lambda self: fake_llm))
+    generator = QuizGenerator()
+    generator.max_workers = 6
+    generator.max_attempts = 3
+    generator.retry_backoff = 0.001
+    return generator
+
+
+def mcq(call, prompt):
+    return {"question": distinct_text(call), "options": ["A", "B", "C", "D"], "correct_answer": 0}
+
+
+def test_questions_are_generated_concurrently(generator, fake_llm, course_chapters):
+    fake_llm.responder = mcq
+    fake_llm.delay = 0.2
+
+    started = time.monotonic()
+    quiz = generator.generate_quiz(course_chapters, num_questions=6, question_types=["mcq"])
+    elapsed = time.monotonic() - started
+
+    questions = quiz["quiz"]["questions"]
+    assert len(questions) == 6
+    assert quiz["generation_report"]["complete"]
+    assert fake_llm.max_concurrent > 1
+    # Six 0.2 s calls in series would take 1.2 s
+    assert elapsed < 0.8
+
+    expected = generator.split_by_difficulty(6, {"easy": 40, "medium": 40, "hard": 20})
+    difficulties = [q["difficulty"] for q in questions]
+    assert {d: difficulties.count(d) for d in expected} == expected
+    assert [q["id"] for q in questions] == list(range(1, 7))
+
+
+def test_failed_questions_are_retried_until_the_count_is_met(generator, fake_llm, course_chapters):
+    seen = set()
+
+    def flaky(call, prompt):
+        # The first attempt of every question fails
+        if prompt not in seen:
+            seen.add(prompt)
+            raise RuntimeError("rate limited")
+        return mcq(call, prompt)
+
+    fake_llm.responder = flaky
+    quiz = generator.generate_quiz(course_chapters, num_questions=4, question_types=["mcq"])
+
+    report = quiz["generation_report"]
+    assert report["complete"]
+    assert len(quiz["quiz"]["questions"]) == 4
+    assert report["total_retries"] == 4
+    assert [(s["status"], s["attempts"]) for s in report["questions"]] == [("ok", 2)] * 4
+    assert fake_llm.calls == 8
+
+
+def test_generation_gives_up_after_max_attempts(generator, fake_llm, course_chapters):
+    def failing(call, prompt):
+        raise RuntimeError("unavailable")
+
+    fake_llm.responder = failing
+    quiz = generator.generate_quiz(course_chapters, num_questions=3, question_types=["mcq"])
+
+    report = quiz["generation_report"]
+    assert quiz["quiz"]["questions"] == []
+    assert not report["complete"]
+    assert [s["status"] for s in report["questions"]] == ["failed"] * 3
+    assert all(s["attempts"] == generator.max_attempts for s in report["questions"])
+    assert fake_llm.calls == 3 * generator.max_attempts
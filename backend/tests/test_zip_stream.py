@@ -0,0 +1,85 @@
+"""
+Streaming ZIP tests
+
+Archives written chunk by chunk must be valid ZIPs with the right content,
+store already-compressed media, deflate text, and start before all entries
+are known.
+
+Usage (from backend/):
+    python -m pytest tests
+"""
+
+import io
+import os
+import zipfile
+
+import pytest
+
+from zip_stream import stream_zip, write_zip
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = {}
+    for name, data in {
+        "index.html": b"<html>" + b"<p>text</p>" * 5000 + b"</html>",
+        "audio.mp3": os.urandom(300 * 1024),
+        "big.json": b'{"key": "value"}' * 400000
+    }.items():
+        path = tmp_path / name
+        path.write_bytes(data)
+        paths[name] = (str(path), data)
+    return paths
+
+
+@pytest.mark.parametrize("read_ahead", [0, 4])
+def test_archive_has_every_entry(files, read_ahead):
+    entries = [(path, f"course/{name}") for name, (path, _) in files.items()]
+    entries.append((b'{"generated": true}', "course/metadata.json"))
+
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(stream_zip(entries, read_ahead=read_ahead))))
+
+    assert archive.testzip() is None
+    assert archive.namelist() == [arcname for _, arcname in entries]
+    for name, (_, data) in files.items():
+        assert archive.read(f"course/{name}") == data
+    assert archive.read("course/metadata.json") == b'{"generated": true}'
+
+
+def test_media_is_stored_and_text_deflated(files):
+    entries = [(path, name) for name, (path, _) in files.items()]
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(stream_zip(entries))))
+
+    assert archive.getinfo("audio.mp3").compress_type == zipfile.ZIP_STORED
+    html = archive.getinfo("index.html")
+    assert html.compress_type == zipfile.ZIP_DEFLATED
+    assert html.compress_size < html.file_size / 10
+
+
+def test_streaming_starts_before_entries_are_exhausted(files):
+    listed = []
+
+    def entries():
+        for name, (path, _) in files.items():
+            listed.append(name)
+            yield path, name
+
+    chunks = stream_zip(entries(), chunk_size=16 * 1024, read_ahead=0)
+    first = next(chunks)
+
+    assert first.startswith(b"PK\x03\x04")
+    assert len(listed) < len(files)
+    # Chunks stay near chunk_size instead of whole files
+    assert max(len(chunk) for chunk in chunks) < 256 * 1024
+
+
+def test_write_zip_matches_stream(files, tmp_path):
+    entries = [(path, name) for name, (path, _) in files.items()]
+    zip_path = tmp_path / "out.zip"
+
+    write_zip(entries, str(zip_path))
+
+    with zipfile.ZipFile(zip_path) as archive:
+        assert {name: archive.read(name) for name in archive.namelist()} == {
+            name: data for name, (_, data) in files.items()
+        }
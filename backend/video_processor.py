@@ -1,22 +1,41 @@
+import contextlib
+import logging
 import os
-from openai import OpenAI
-from moviepy.editor import VideoFileClip
+from typing import Callable, Optional
 from decouple import config
-from mutagen.mp3 import MP3
 from language_config import get_language_name
+from metrics import stage_timer
+from openai_client import get_openai_client
 
-client = OpenAI(
-    api_key=config('OPENAI_API_KEY'),
-    base_url=config('OPENAI_BASE_URL')
-)
+logger = logging.getLogger(__name__)
+
+# moviepy (numpy, imageio, ffmpeg probing) and mutagen are imported where they
+# are used, so API processes that never touch video start quickly
+
+
+def get_client():
+    """OpenAI client for video processing, created on first use"""
+    return get_openai_client(base_url=config('OPENAI_BASE_URL'), caller="video_processor")
 
 
 class VideoProcessor:
-    def __init__(self):
+    def __init__(self, admission=None):
+        """
+        Args:
+            admission: AdmissionController limiting concurrent extraction,
+                transcription and LLM steps (optional)
+        """
+        self.admission = admission
         self.upload_dir = config('UPLOAD_DIR', default='./uploads')
         if not os.path.exists(self.upload_dir):
             os.makedirs(self.upload_dir)
 
+    def _slot(self, workload: str, ticket=None):
+        """Admission slot for a processing step of an accepted job, with its reservation if it has one"""
+        if self.admission is None:
+            return contextlib.nullcontext()
+        return self.admission.slot(workload, admitted=True, ticket=ticket)
+
     def _contains_japanese_chars(self, text: str) -> bool:
         """
         Check if text contains Japanese characters (Hiragana, Katakana, Kanji)
@@ -40,6 +59,8 @@ class VideoProcessor:
 
     def extract_audio_from_video(self, video_path: str) -> str:
         """Extract audio from video file and save as M4A with optimization for API limits"""
+        from moviepy.editor import VideoFileClip
+
         try:
             video = VideoFileClip(video_path)
             audio_path = video_path.rsplit('.', 1)[0] + '.m4a'
@@ -76,20 +97,15 @@ class VideoProcessor:
             transcription_model = config('TRANSCRIPTION_MODEL', default='gpt-4o-transcribe')
             transcription_language = language if language != 'auto' else config('TRANSCRIPTION_LANGUAGE', default='auto')
 
-            print(f"🎤 Starting transcription using {transcription_model}...")
-            if transcription_language != 'auto':
-                print(f"   Language: {get_language_name(transcription_language)}")
-            else:
-                print(f"   Language: Auto-detect")
-
             # Call GPT-4o transcription via Rakuten AI Gateway
             # Check file size (API limit is 25MB)
             file_size_mb = os.path.getsize(audio_path) / (1024*1024)
-            print(f"   API Request Details:")
-            print(f"   - Model: {transcription_model}")
-            print(f"   - Language: {transcription_language if transcription_language != 'auto' else 'auto-detect (parameter omitted)'}")
-            print(f"   - File: {os.path.basename(audio_path)}")
-            print(f"   - File size: {file_size_mb:.2f} MB")
+            logger.info("Transcription started", extra={
+                "model": transcription_model,
+                "language": transcription_language,
+                "audio_file": os.path.basename(audio_path),
+                "file_size_mb": round(file_size_mb, 2)
+            })
 
             if file_size_mb > 25:
                 raise Exception(f"Audio file size ({file_size_mb:.2f} MB) exceeds 25MB API limit. Please use a shorter video.")
@@ -101,27 +117,26 @@ class VideoProcessor:
             try:
                 if transcription_language != 'auto':
                     with open(audio_path, "rb") as audio_file:
-                        transcript = client.audio.transcriptions.create(
+                        transcript = get_client().audio.transcriptions.create(
                             model=transcription_model,
                             file=(Path(audio_path).name, audio_file, "audio/m4a"),
                             language=transcription_language
                         )
                 else:
                     with open(audio_path, "rb") as audio_file:
-                        transcript = client.audio.transcriptions.create(
+                        transcript = get_client().audio.transcriptions.create(
                             model=transcription_model,
                             file=(Path(audio_path).name, audio_file, "audio/m4a")
                         )
             except Exception as api_error:
-                print(f"\n❌ API Error Details:")
-                print(f"   Error Type: {type(api_error).__name__}")
-                print(f"   Error Message: {str(api_error)}")
-                if hasattr(api_error, 'response'):
-                    print(f"   Response: {api_error.response}")
-                if hasattr(api_error, 'status_code'):
-                    print(f"   Status Code: {api_error.status_code}")
-                if hasattr(api_error, 'body'):
-                    print(f"   Response Body: {api_error.body}")
+                # The body can be a whole HTML error page; the formatter truncates it
+                logger.error("Transcription API error", extra={
+                    "model": transcription_model,
+                    "error_type": type(api_error).__name__,
+                    "error": str(api_error),
+                    "status_code": getattr(api_error, 'status_code', None),
+                    "response_body": getattr(api_error, 'body', None)
+                })
                 raise
 
             # GPT-4o returns detected language in response
@@ -133,9 +148,11 @@ class VideoProcessor:
             lang_map = {'english': 'en', 'japanese': 'ja', 'en': 'en', 'ja': 'ja'}
             detected_lang = lang_map.get(detected_lang.lower(), detected_lang[:2].lower())
 
-            print(f"✅ Transcription completed using {transcription_model}")
-            print(f"   Detected language: {get_language_name(detected_lang)}")
-            print(f"   Length: {len(transcript.text)} characters")
+            logger.info("Transcription completed", extra={
+                "model": transcription_model,
+                "detected_language": detected_lang,
+                "characters": len(transcript.text)
+            })
 
             return (transcript.text, detected_lang)
 
@@ -159,11 +176,10 @@ class VideoProcessor:
             tts_voice = config('OPENAI_TTS_VOICE', default='nova')
             tts_speed = float(config('OPENAI_TTS_SPEED', default='1.0'))
 
-            print(f"🔊 Generating audio summary using {tts_model}...")
-            print(f"   Voice: {tts_voice}, Speed: {tts_speed}x")
+            logger.info("Audio summary started", extra={"model": tts_model, "voice": tts_voice, "speed": tts_speed})
 
             # Generate speech using TTS-1-HD
-            response = client.audio.speech.create(
+            response = get_client().audio.speech.create(
                 model=tts_model,
                 voice=tts_voice,
                 input=summary_text,
@@ -179,11 +195,11 @@ class VideoProcessor:
                 audio_file.write(response.content)
 
             # Get audio duration using mutagen
+            from mutagen.mp3 import MP3
             audio = MP3(audio_path)
             duration = audio.info.length
 
-            print(f"✅ Audio summary generated: {audio_filename}")
-            print(f"   Duration: {duration:.2f} seconds")
+            logger.info("Audio summary generated", extra={"audio_file": audio_filename, "duration_seconds": round(duration, 2)})
 
             return (audio_path, duration)
 
@@ -211,8 +227,8 @@ class VideoProcessor:
             language_prefix = 'Please answer in English.\n\n'
 
         try:
-            print(f"📝 Generating summary in {lang_name}...")
-            response = client.chat.completions.create(
+            logger.info("Summary started", extra={"language": language})
+            response = get_client().chat.completions.create(
                 model=config('LLM_MODEL', default='gpt-4o'),
                 messages=[
                     {
@@ -230,7 +246,7 @@ class VideoProcessor:
                 ],
                 max_tokens=500
             )
-            print(f"✅ Summary generated in {lang_name}")
+            logger.info("Summary generated", extra={"language": language})
             return response.choices[0].message.content
         except Exception as e:
             raise Exception(f"Failed to generate summary: {str(e)}")
@@ -250,7 +266,7 @@ class VideoProcessor:
         lang_name = get_language_name(language)
 
         try:
-            response = client.chat.completions.create(
+            response = get_client().chat.completions.create(
                 model=config('LLM_MODEL', default='gpt-4o'),
                 messages=[
                     {
@@ -278,7 +294,15 @@ class VideoProcessor:
         except Exception as e:
             raise Exception(f"Failed to answer question: {str(e)}")
 
-    def process_video(self, video_path: str, user_language: str = None, ui_language: str = 'en', video_id: int = None) -> dict:
+    def process_video(
+        self,
+        video_path: str,
+        user_language: str = None,
+        ui_language: str = 'en',
+        video_id: int = None,
+        on_stage: Optional[Callable[[str], None]] = None,
+        extraction_ticket=None
+    ) -> dict:
         """
         Process video with multi-language support
 
@@ -287,77 +311,80 @@ class VideoProcessor:
             user_language: User-specified language (optional, auto-detect if None or 'auto')
             ui_language: Language for UI responses (summary, Q&A) - 'en' or 'ja'
             video_id: Video ID for generating audio summary filename (required for audio generation)
+            on_stage: Called with "extracting", "transcribing", "summarizing" and "tts" as each step starts
+            extraction_ticket: Extraction queue place reserved when the upload was accepted
 
         Returns:
             Dictionary with transcription, summary, detected_language, transcription_method,
             audio_summary_path, audio_summary_duration
         """
+        def stage(name: str):
+            if on_stage:
+                on_stage(name)
+
         try:
-            print("=" * 70)
-            print("🎬 VIDEO PROCESSING STARTED")
-            print("=" * 70)
+            logger.info("Video processing started", extra={
+                "user_language": user_language,
+                "ui_language": ui_language
+            })
 
             # Extract audio
-            print("\n📹 Step 1: Extracting audio from video...")
-            audio_path = self.extract_audio_from_video(video_path)
-            print(f"✅ Audio extracted: {audio_path}")
+            stage("extracting")
+            with self._slot("extraction", extraction_ticket), stage_timer("extract"):
+                audio_path = self.extract_audio_from_video(video_path)
+            logger.info("Audio extracted", extra={"audio_file": os.path.basename(audio_path)})
 
             # Transcribe audio with GPT-4o (includes language detection)
-            print(f"\n📝 Step 2: Transcribing audio with GPT-4o...")
-            if user_language and user_language != 'auto':
-                print(f"   Using user-specified language: {get_language_name(user_language)}")
-                transcription, detected_language = self.transcribe_with_gpt4o(audio_path, user_language)
-            else:
-                # Smart auto-detection: Use UI language as a hint when auto-detecting
-                # This improves accuracy, especially for Japanese content
-                language_hint = 'auto'
-                if ui_language and ui_language != 'en':
-                    language_hint = ui_language
-                    print(f"   Auto-detecting language with {get_language_name(ui_language)} hint...")
+            stage("transcribing")
+            with self._slot("transcription"), stage_timer("transcribe"):
+                if user_language and user_language != 'auto':
+                    transcription, detected_language = self.transcribe_with_gpt4o(audio_path, user_language)
                 else:
-                    print(f"   Auto-detecting language...")
-                transcription, detected_language = self.transcribe_with_gpt4o(audio_path, language_hint)
+                    # Smart auto-detection: Use UI language as a hint when auto-detecting
+                    # This improves accuracy, especially for Japanese content
+                    language_hint = 'auto'
+                    if ui_language and ui_language != 'en':
+                        language_hint = ui_language
+                    transcription, detected_language = self.transcribe_with_gpt4o(audio_path, language_hint)
 
             # Post-transcription language verification
             # Check if transcription contains Japanese characters but was detected as English
             if detected_language == 'en' and self._contains_japanese_chars(transcription):
-                print(f"   ⚠️  Misdetection corrected: Transcription contains Japanese characters")
                 detected_language = 'ja'
-                print(f"   ✅ Corrected language: {get_language_name(detected_language)}")
-
-            print(f"✅ Transcription completed ({len(transcription)} characters)")
+                logger.warning("Detected language corrected: transcription contains Japanese characters", extra={
+                    "detected_language": detected_language
+                })
 
             # Generate text summary in UI language
-            print(f"\n📋 Step 3: Generating text summary in {get_language_name(ui_language)}...")
-            summary = self.generate_summary(transcription, ui_language)
+            stage("summarizing")
+            with self._slot("llm"), stage_timer("summarize"):
+                summary = self.generate_summary(transcription, ui_language)
 
             # Generate audio summary if video_id provided
             audio_summary_path = None
             audio_summary_duration = None
             if video_id:
-                print(f"\n🔊 Step 4: Generating audio summary in {get_language_name(ui_language)}...")
+                stage("tts")
                 try:
-                    audio_summary_path, audio_summary_duration = self.generate_audio_summary(
-                        summary, video_id, ui_language
-                    )
+                    with self._slot("llm"), stage_timer("tts"):
+                        audio_summary_path, audio_summary_duration = self.generate_audio_summary(
+                            summary, video_id, ui_language
+                        )
                 except Exception as audio_error:
-                    print(f"⚠️  Audio summary generation failed: {audio_error}")
+                    logger.warning("Audio summary generation failed", extra={"error": str(audio_error)})
                     # Continue without audio summary
 
             # Clean up audio file
             if os.path.exists(audio_path):
                 os.remove(audio_path)
-                print(f"\n🗑️  Cleaned up temporary audio file")
-
-            print("\n" + "=" * 70)
-            print("✅ VIDEO PROCESSING COMPLETED SUCCESSFULLY")
-            print("=" * 70)
-            print(f"   Video Language: {get_language_name(detected_language)}")
-            print(f"   UI Language: {get_language_name(ui_language)}")
-            print(f"   Transcription Method: gpt-4o-transcribe")
-            if audio_summary_path:
-                print(f"   Audio Summary: Generated ({audio_summary_duration:.2f}s)")
-            print("=" * 70 + "\n")
+
+            logger.info("Video processing completed", extra={
+                "detected_language": detected_language,
+                "ui_language": ui_language,
+                "transcription_method": "gpt-4o-transcribe",
+                "characters": len(transcription),
+                "audio_summary_seconds": round(audio_summary_duration, 2) if audio_summary_path else None
+            })
 
             return {
                 "transcription": transcription,
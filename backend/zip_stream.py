@@ -0,0 +1,186 @@
+"""
+Streaming ZIP
+Writes ZIP archives incrementally so they can be sent while the source
+files are still being read, in constant memory and without a copy on disk
+"""
+
+import io
+import os
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, Optional, Tuple, Union
+from decouple import config
+
+from metrics import timed_stage
+
+
+# Already compressed formats gain nothing from deflate; store them as-is
+STORED_EXTENSIONS = {
+    ".mp3", ".mp4", ".m4a", ".aac", ".ogg", ".webm", ".mov",
+    ".png", ".jpg", ".jpeg", ".gif", ".webp",
+    ".woff", ".woff2", ".zip", ".gz", ".br"
+}
+
+CHUNK_SIZE = 64 * 1024
+
+# Files read ahead concurrently while earlier entries are compressed
+EXPORT_READ_AHEAD = config('EXPORT_READ_AHEAD', default=8, cast=int)
+# Larger files are streamed from disk, which bounds read-ahead memory
+READ_AHEAD_MAX_BYTES = 4 * 1024 * 1024
+
+# An entry's source is a file path, or the content itself for generated files
+Source = Union[str, bytes]
+
+
+class _StreamBuffer(io.RawIOBase):
+    """
+    Write-only, non-seekable sink for ZipFile
+
+    ZipFile falls back to data descriptors when it can't seek, so every
+    entry is written front to back and the bytes can be handed out as soon
+    as they are produced.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def compress_type_for(filename: str) -> int:
+    """Stored for already-compressed media, deflate for everything else"""
+    if os.path.splitext(filename)[1].lower() in STORED_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _read_ahead(
+    entries: Iterable[Tuple[Source, str]],
+    read_ahead: int
+) -> Iterator[Tuple[Source, str, Optional[bytes]]]:
+    """
+    Yields (source, arcname, content) with up to read_ahead small files
+    already read on a thread pool; content is None for files read while
+    writing (too large, or read-ahead disabled)
+
+    Entries are pulled from the iterable lazily, so it may be a generator.
+    """
+
+    if read_ahead <= 0:
+        for source, arcname in entries:
+            yield source, arcname, source if isinstance(source, bytes) else None
+        return
+
+    iterator = iter(entries)
+    pending = deque()
+
+    with ThreadPoolExecutor(max_workers=read_ahead, thread_name_prefix="zip-read-ahead") as pool:
+        def fill():
+            while len(pending) < read_ahead:
+                try:
+                    source, arcname = next(iterator)
+                except StopIteration:
+                    return
+                future = None
+                if isinstance(source, str) and os.path.getsize(source) <= READ_AHEAD_MAX_BYTES:
+                    future = pool.submit(_read_file, source)
+                pending.append((source, arcname, future))
+
+        fill()
+        while pending:
+            source, arcname, future = pending.popleft()
+            fill()
+            if future is not None:
+                yield source, arcname, future.result()
+            else:
+                yield source, arcname, source if isinstance(source, bytes) else None
+
+
+@timed_stage("zip")
+def stream_zip(
+    entries: Iterable[Tuple[Source, str]],
+    chunk_size: int = CHUNK_SIZE,
+    read_ahead: int = EXPORT_READ_AHEAD
+) -> Iterator[bytes]:
+    """
+    Yields a ZIP archive of the given files chunk by chunk
+
+    Args:
+        entries: (file path or content bytes, name in archive) pairs; may be a generator
+        chunk_size: Bytes read from each file at a time
+        read_ahead: Files read concurrently ahead of the one being compressed
+
+    Returns:
+        Iterator of archive bytes, suitable for StreamingResponse
+    """
+
+    buffer = _StreamBuffer()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for source, arcname, content in _read_ahead(entries, read_ahead):
+            if isinstance(source, bytes):
+                info = zipfile.ZipInfo(arcname, date_time=time.localtime()[:6])
+                info.external_attr = 0o644 << 16
+                size = len(source)
+            else:
+                info = zipfile.ZipInfo.from_file(source, arcname)
+                size = info.file_size
+            info.compress_type = compress_type_for(arcname)
+
+            with archive.open(info, "w", force_zip64=size > zipfile.ZIP64_LIMIT) as target:
+                if content is not None:
+                    view = memoryview(content)
+                    for offset in range(0, len(view), chunk_size):
+                        target.write(view[offset:offset + chunk_size])
+
+                        data = buffer.drain()
+                        if data:
+                            yield data
+                else:
+                    with open(source, "rb") as f:
+                        while True:
+                            chunk = f.read(chunk_size)
+                            if not chunk:
+                                break
+                            target.write(chunk)
+
+                            data = buffer.drain()
+                            if data:
+                                yield data
+
+            data = buffer.drain()
+            if data:
+                yield data
+
+    # Central directory
+    data = buffer.drain()
+    if data:
+        yield data
+
+
+def write_zip(entries: Iterable[Tuple[Source, str]], zip_path: str):
+    """Writes the same archive as stream_zip to a file"""
+    with open(zip_path, "wb") as f:
+        for chunk in stream_zip(entries):
+            f.write(chunk)
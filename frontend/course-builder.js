@@ -6,6 +6,8 @@
 const API_BASE_URL = 'http://localhost:8000';
 let selectedVideoId = null;
 let generatedCourseId = null;
+// Videos already generated on this page: generating again asks for a fresh outline
+const generatedVideoIds = new Set();
 
 // Load videos on page load
 document.addEventListener('DOMContentLoaded', () => {
@@ -109,12 +111,11 @@ async function generateCourse() {
     document.getElementById('generateBtn').disabled = true;
     document.getElementById('progressSection').classList.add('show');
     document.getElementById('resultSection').classList.remove('show');
-
-    // Animate progress steps
-    animateProgressSteps();
+    document.getElementById('chapterPreview').classList.remove('show');
+    setProgressStep(1);
 
     try {
-        const response = await fetch(`${API_BASE_URL}/api/course/generate`, {
+        const response = await fetch(`${API_BASE_URL}/api/course/generate-stream`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -123,7 +124,8 @@ async function generateCourse() {
                 video_id: parseInt(selectedVideoId),
                 language: language,
                 theme: theme,
-                num_questions: numQuestions
+                num_questions: numQuestions,
+                regenerate: generatedVideoIds.has(selectedVideoId)
             })
         });
 
@@ -132,11 +134,8 @@ async function generateCourse() {
             throw new Error(error.detail || 'Failed to generate course');
         }
 
-        const result = await response.json();
-        generatedCourseId = result.course_id;
-
-        // Show results
-        showResults(result);
+        // Render the course as it streams in
+        await readEventStream(response, handleCourseEvent);
 
     } catch (error) {
         console.error('Error generating course:', error);
@@ -148,41 +147,129 @@ async function generateCourse() {
 }
 
 /**
- * Animate progress steps during course generation
+ * Read a newline-delimited JSON stream and pass each event to the handler
  */
-function animateProgressSteps() {
+async function readEventStream(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) {
+            break;
+        }
+
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.filter(line => line.trim()).forEach(line => onEvent(JSON.parse(line)));
+    }
+
+    if (buffer.trim()) {
+        onEvent(JSON.parse(buffer));
+    }
+}
+
+/**
+ * Handle a course generation event from the stream
+ */
+function handleCourseEvent(event) {
+    switch (event.event) {
+        case 'outline':
+            setProgressStep(2);
+            renderOutline(event);
+            break;
+        case 'chapter':
+            setProgressStep(3);
+            renderChapter(event);
+            break;
+        case 'complete':
+            setProgressStep(4);
+            generatedCourseId = event.course_id;
+            generatedVideoIds.add(selectedVideoId);
+            showResults(event);
+            break;
+        case 'error':
+            throw new Error(event.detail);
+    }
+}
+
+/**
+ * Mark progress steps before the current one as completed
+ */
+function setProgressStep(current) {
     const steps = ['step1', 'step2', 'step3', 'step4'];
-    let currentStep = 0;
-
-    const interval = setInterval(() => {
-        if (currentStep < steps.length) {
-            document.getElementById(steps[currentStep]).classList.add('active');
-            if (currentStep > 0) {
-                document.getElementById(steps[currentStep - 1]).classList.remove('active');
-                document.getElementById(steps[currentStep - 1]).classList.add('completed');
-            }
-            currentStep++;
-        } else {
-            clearInterval(interval);
-            // Mark last step as completed
-            document.getElementById(steps[steps.length - 1]).classList.remove('active');
-            document.getElementById(steps[steps.length - 1]).classList.add('completed');
+
+    steps.forEach((stepId, index) => {
+        const step = document.getElementById(stepId);
+        step.classList.remove('active', 'completed');
+        if (index + 1 < current) {
+            step.classList.add('completed');
+        } else if (index + 1 === current) {
+            step.classList.add('active');
         }
-    }, 1500);
+    });
+}
 
-    // Store interval ID to clear if needed
-    window.progressInterval = interval;
+/**
+ * Show the course outline with a placeholder per chapter
+ */
+function renderOutline(outline) {
+    document.getElementById('previewTitle').textContent = `📖 ${outline.title}`;
+    document.getElementById('previewDescription').textContent = outline.description || '';
+
+    const container = document.getElementById('previewChapters');
+    container.innerHTML = '';
+
+    outline.chapters.forEach(chapter => {
+        const item = document.createElement('div');
+        item.className = 'preview-chapter';
+        item.id = `previewChapter${chapter.number}`;
+
+        const title = document.createElement('strong');
+        title.textContent = `Chapter ${chapter.number}: ${chapter.title}`;
+
+        const stats = document.createElement('div');
+        stats.className = 'preview-chapter-stats';
+        stats.textContent = '⏳ Generating slides and questions...';
+
+        item.appendChild(title);
+        item.appendChild(stats);
+        container.appendChild(item);
+    });
+
+    document.getElementById('chapterPreview').classList.add('show');
 }
 
 /**
- * Show course generation results
+ * Fill in a chapter once its slides and questions are ready
  */
-function showResults(result) {
-    // Clear progress interval
-    if (window.progressInterval) {
-        clearInterval(window.progressInterval);
+function renderChapter(chapter) {
+    const item = document.getElementById(`previewChapter${chapter.number}`);
+    if (!item) {
+        return;
     }
 
+    const slideCount = (chapter.slides_html.match(/<section/g) || []).length;
+    item.classList.add('ready');
+    item.querySelector('.preview-chapter-stats').textContent =
+        `✅ ${slideCount} Slides • ${chapter.questions.length} Questions`;
+
+    const list = document.createElement('ul');
+    list.className = 'preview-questions';
+    chapter.questions.forEach(question => {
+        const li = document.createElement('li');
+        li.textContent = question.question;
+        list.appendChild(li);
+    });
+    item.appendChild(list);
+}
+
+/**
+ * Show course generation results
+ */
+function showResults(result) {
     document.getElementById('progressSection').classList.remove('show');
     document.getElementById('resultSection').classList.add('show');
 
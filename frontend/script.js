@@ -6,6 +6,8 @@ let videoAnalyzer = null;
 class VideoAnalyzer {
     constructor() {
         this.progressStages = ['upload', 'extracting', 'transcribing', 'summarizing', 'audio'];
+        // Server processing stages -> progress bar stages
+        this.stageIndex = { extracting: 1, transcribing: 2, summarizing: 3, tts: 4 };
         this.currentStageIndex = 0;
         this.initializeLanguageManager();
         this.initializeEventListeners();
@@ -133,8 +135,8 @@ class VideoAnalyzer {
             // Upload complete, move to extracting stage
             this.advanceToStage(1); // Extracting audio
 
-            // Poll for processing status
-            await this.pollProcessingStatus(currentVideoId);
+            // Follow processing as it happens
+            this.watchProcessingStatus(currentVideoId);
 
         } catch (error) {
             console.error('Error uploading video:', error);
@@ -143,15 +145,51 @@ class VideoAnalyzer {
         }
     }
 
+    watchProcessingStatus(videoId) {
+        // Real stage transitions pushed by the server; polling is the fallback
+        if (!window.EventSource) {
+            this.pollProcessingStatus(videoId);
+            return;
+        }
+
+        const source = new EventSource(`${API_BASE_URL}/video-status/${videoId}/events`);
+        let finished = false;
+
+        source.addEventListener('stage', (message) => {
+            const event = JSON.parse(message.data);
+            console.log('Processing stage:', event.stage);
+
+            if (event.stage in this.stageIndex) {
+                this.advanceToStage(this.stageIndex[event.stage]);
+            } else if (event.stage === 'done' || event.stage === 'failed') {
+                finished = true;
+                source.close();
+                // One request for the results (or the error message)
+                this.pollProcessingStatus(videoId);
+            }
+        });
+
+        source.onerror = () => {
+            if (finished) {
+                return;
+            }
+            // The browser reconnects on its own while the connection is CONNECTING
+            if (source.readyState === EventSource.CLOSED) {
+                console.warn('Status stream unavailable, falling back to polling');
+                this.pollProcessingStatus(videoId);
+            }
+        };
+    }
+
     async pollProcessingStatus(videoId) {
-        const maxAttempts = 60; // Poll for up to 10 minutes (60 * 10 seconds)
+        const maxAttempts = 120; // Poll for up to 10 minutes (120 * 5 seconds)
         let attempts = 0;
-        let lastStage = 1; // Start from extracting (upload is already done)
 
         const poll = async () => {
             try {
                 console.log(`Polling status for video ${videoId}, attempt ${attempts + 1}/${maxAttempts}`);
-                const response = await fetch(`${API_BASE_URL}/video-status/${videoId}`);
+                // Revalidates with the ETag: unchanged status costs a 304
+                const response = await fetch(`${API_BASE_URL}/video-status/${videoId}`, { cache: 'no-cache' });
 
                 if (!response.ok) {
                     throw new Error('Failed to check processing status');
@@ -160,16 +198,8 @@ class VideoAnalyzer {
                 const data = await response.json();
                 console.log('Received status data:', data);
 
-                // Update progress based on attempts (simulate stages)
-                if (attempts === 1) {
-                    this.advanceToStage(2); // Transcribing
-                    lastStage = 2;
-                } else if (attempts === 3 && lastStage < 3) {
-                    this.advanceToStage(3); // Summarizing
-                    lastStage = 3;
-                } else if (attempts === 5 && lastStage < 4) {
-                    this.advanceToStage(4); // Audio generation
-                    lastStage = 4;
+                if (data.stage in this.stageIndex) {
+                    this.advanceToStage(this.stageIndex[data.stage]);
                 }
 
                 if (data.processing_status === 'completed') {
@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
 
+import argparse
+import glob
 import os
+import subprocess
 import sys
+import tempfile
 import uvicorn
+from decouple import config
 from pathlib import Path
 
 # Add the backend directory to the Python path
@@ -10,14 +15,66 @@ backend_dir = Path(__file__).parent / "backend"
 sys.path.insert(0, str(backend_dir))
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the Video Analyzer API")
+    parser.add_argument(
+        "--prod",
+        action="store_true",
+        default=config('BACKEND_MODE', default='dev') == 'prod',
+        help="Production mode: several worker processes, no auto-reload, graceful shutdown"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=config('WEB_CONCURRENCY', default=os.cpu_count() or 1, cast=int),
+        help="Worker processes in production mode (default: WEB_CONCURRENCY or CPU count)"
+    )
+    args = parser.parse_args()
+
+    host = config('BACKEND_HOST', default='0.0.0.0')
+    port = config('BACKEND_PORT', default=8000, cast=int)
+
     # Change to backend directory
     os.chdir(backend_dir)
-    
-    # Run the FastAPI application
-    uvicorn.run(
-        "main:app", 
-        host="0.0.0.0", 
-        port=8000, 
-        reload=True,
-        log_level="info"
-    )
\ No newline at end of file
+
+    # reveal.js and the slide fonts; a no-op once the pinned versions are
+    # installed. Without them the API refuses to start unless
+    # ASSETS_CDN_FALLBACK is on
+    if subprocess.run([sys.executable, "fetch_vendor.py"]).returncode != 0:
+        print(
+            "Could not fetch slide assets: run 'python fetch_vendor.py' in backend/, "
+            "or set ASSETS_CDN_FALLBACK=true to load them from public CDNs",
+            file=sys.stderr
+        )
+
+    if args.prod:
+        # Workers write their metrics here so any of them can report the
+        # totals; values left by a previous run would be added to this one's
+        metrics_dir = os.path.abspath(
+            config('METRICS_MULTIPROC_DIR', default='')
+            or os.path.join(tempfile.gettempdir(), f"video-analyzer-metrics-{port}")
+        )
+        os.makedirs(metrics_dir, exist_ok=True)
+        for stale in glob.glob(os.path.join(glob.escape(metrics_dir), "*.json")):
+            os.remove(stale)
+        os.environ["METRICS_MULTIPROC_DIR"] = metrics_dir
+
+        # Each worker runs the app's lifespan: serialized table creation on
+        # startup, draining of background jobs on SIGTERM
+        uvicorn.run(
+            "main:app",
+            host=host,
+            port=port,
+            workers=args.workers,
+            timeout_graceful_shutdown=config('GRACEFUL_SHUTDOWN_SECONDS', default=30, cast=int),
+            proxy_headers=True,
+            log_level="info"
+        )
+    else:
+        # Run the FastAPI application
+        uvicorn.run(
+            "main:app",
+            host=host,
+            port=port,
+            reload=True,
+            log_level="info"
+        )
@@ -1,33 +1,208 @@
 #!/usr/bin/env python3
 
-import os
+import argparse
+import gzip
+import hashlib
 import http.server
-import socketserver
+import mimetypes
+import os
+import re
+import threading
 import webbrowser
+from decouple import config
 from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip is always available
+    brotli = None
+
+frontend_dir = Path(__file__).parent / "frontend"
+
+# Served under content-hashed names (script.<hash>.js) that HTML pages link to
+FINGERPRINTED_EXTENSIONS = {".js", ".css"}
+COMPRESSIBLE_EXTENSIONS = {".html", ".js", ".css", ".json", ".svg", ".txt"}
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Pages keep their URLs: cache, but revalidate with the ETag on every use
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+_ASSET_REF = re.compile(r'((?:src|href)=["\'])([^"\'?#]+)(["\'])')
+
+
+class StaticSite:
+    """
+    The frontend, held in memory with precompressed variants
+
+    Scripts and stylesheets get fingerprinted names and pages are rewritten
+    to reference them, so assets can be cached forever while a changed file
+    simply gets a new URL.
+    """
+
+    def __init__(self, directory: Path, watch: bool = False):
+        """
+        Args:
+            directory: Frontend directory
+            watch: Reload when files change (development)
+        """
+        self.directory = directory
+        self.watch = watch
+        self.files = {}
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self.load()
+
+    def _scan(self):
+        """(name, mtime, size) of every file, to detect changes"""
+        return tuple(
+            (path.name, path.stat().st_mtime_ns, path.stat().st_size)
+            for path in sorted(self.directory.iterdir())
+            if path.is_file() and not path.name.startswith(".")
+        )
+
+    def load(self):
+        """Reads the directory and builds every served representation"""
+
+        snapshot = self._scan()
+        sources = {name: (self.directory / name).read_bytes() for name, _, _ in snapshot}
+
+        fingerprints = {}
+        for name, data in sources.items():
+            stem, ext = os.path.splitext(name)
+            if ext in FINGERPRINTED_EXTENSIONS:
+                fingerprints[name] = f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+
+        def rewrite(match):
+            target = fingerprints.get(match.group(2))
+            return f"{match.group(1)}{target or match.group(2)}{match.group(3)}"
+
+        files = {}
+        for name, data in sources.items():
+            ext = os.path.splitext(name)[1]
+            if ext == ".html":
+                data = _ASSET_REF.sub(rewrite, data.decode("utf-8")).encode("utf-8")
+
+            entry = self._entry(name, data, REVALIDATE_CACHE_CONTROL)
+            files[name] = entry
+            if name in fingerprints:
+                files[fingerprints[name]] = {**entry, "cache_control": IMMUTABLE_CACHE_CONTROL}
+
+        with self._lock:
+            self.files = files
+            self._snapshot = snapshot
+
+    def _entry(self, name: str, data: bytes, cache_control: str) -> dict:
+        content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type in ("application/javascript", "application/json"):
+            content_type += "; charset=utf-8"
+
+        encodings = {}
+        if os.path.splitext(name)[1] in COMPRESSIBLE_EXTENSIONS:
+            if brotli is not None:
+                encodings["br"] = brotli.compress(data, quality=11)
+            encodings["gzip"] = gzip.compress(data, compresslevel=9, mtime=0)
+
+        return {
+            "data": data,
+            "etag": f'"{hashlib.sha256(data).hexdigest()[:16]}"',
+            "content_type": content_type,
+            "cache_control": cache_control,
+            "encodings": {key: value for key, value in encodings.items() if len(value) < len(data)}
+        }
+
+    def get(self, name: str):
+        if self.watch and self._scan() != self._snapshot:
+            self.load()
+        with self._lock:
+            return self.files.get(name)
+
+
+class FrontendHandler(http.server.BaseHTTPRequestHandler):
+    """Serves a StaticSite with ETags, 304s and gzip/brotli"""
+
+    protocol_version = "HTTP/1.1"
+    site: StaticSite = None
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def _serve(self, send_body: bool):
+        name = unquote(urlsplit(self.path).path).lstrip("/") or "index.html"
+        entry = self.site.get(name)
+        if entry is None:
+            self.send_error(404, "File not found")
+            return
+
+        # Weak comparison, as If-None-Match requires
+        if_none_match = self.headers.get("If-None-Match", "")
+        if entry["etag"] in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+            self.send_response(304)
+            self._common_headers(entry)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        accepted = {part.split(";")[0].strip() for part in self.headers.get("Accept-Encoding", "").split(",")}
+        encoding = next((e for e in ("br", "gzip") if e in accepted and e in entry["encodings"]), None)
+        body = entry["encodings"][encoding] if encoding else entry["data"]
+
+        self.send_response(200)
+        self._common_headers(entry)
+        self.send_header("Content-Type", entry["content_type"])
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _common_headers(self, entry: dict):
+        self.send_header("ETag", entry["etag"])
+        self.send_header("Cache-Control", entry["cache_control"])
+        if entry["encodings"]:
+            self.send_header("Vary", "Accept-Encoding")
+
+
+def run_frontend_server(prod: bool = False, port: int = 3000):
+    """
+    Serves the frontend, one thread per connection
+
+    Args:
+        prod: Load files once (production); otherwise reload on change and open a browser
+        port: Port to listen on
+    """
+
+    FrontendHandler.site = StaticSite(frontend_dir, watch=not prod)
+    server = http.server.ThreadingHTTPServer(("", port), FrontendHandler)
+    server.daemon_threads = True
 
-def run_frontend_server():
-    # Change to frontend directory
-    frontend_dir = Path(__file__).parent / "frontend"
-    os.chdir(frontend_dir)
-    
-    PORT = 3000
-    
-    class Handler(http.server.SimpleHTTPRequestHandler):
-        def __init__(self, *args, **kwargs):
-            super().__init__(*args, directory=str(frontend_dir), **kwargs)
-    
     try:
-        with socketserver.TCPServer(("", PORT), Handler) as httpd:
-            print(f"Frontend server running at http://localhost:{PORT}")
+        with server as httpd:
+            print(f"Frontend server running at http://localhost:{port}")
             print("Press Ctrl+C to stop the server")
-            
-            # Automatically open the browser
-            webbrowser.open(f'http://localhost:{PORT}')
-            
+
+            if not prod:
+                # Automatically open the browser
+                webbrowser.open(f'http://localhost:{port}')
+
             httpd.serve_forever()
     except KeyboardInterrupt:
         print("\nShutting down the frontend server...")
 
+
 if __name__ == "__main__":
-    run_frontend_server()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Serve the Video Analyzer frontend")
+    parser.add_argument(
+        "--prod",
+        action="store_true",
+        default=config('FRONTEND_MODE', default='dev') == 'prod',
+        help="Production mode: files are loaded once and no browser is opened"
+    )
+    parser.add_argument("--port", type=int, default=config('FRONTEND_PORT', default=3000, cast=int))
+    args = parser.parse_args()
+
+    run_frontend_server(prod=args.prod, port=args.port)
@@ -33,6 +33,13 @@ echo "✅ Python 3 found"
 echo "📦 Installing Python dependencies..."
 pip3 install -r requirements.txt
 
+# reveal.js and fonts for course slides, served locally instead of from CDNs
+echo "📦 Fetching slide assets..."
+if ! (cd backend && python3 fetch_vendor.py); then
+    echo "⚠️  Could not fetch slide assets. Run 'python3 fetch_vendor.py' in backend/ later,"
+    echo "   or set ASSETS_CDN_FALLBACK=true to load them from public CDNs"
+fi
+
 # Check if .env file exists and has API key
 if [ ! -f ".env" ]; then
     echo "❌ .env file not found!"